@@ -2,107 +2,561 @@
 Simple HTTP Server to test connectivity
 Run with: python test-python-server.py
 Access at: http://localhost:8000
+
+Options:
+    --port PORT       Port to listen on (default: 8000)
+    --mode MODE       "threaded" (default) or "asyncio"
+    --no-browser      Don't open the test page in a browser on startup
+    --static DIR      Serve a static export of the UI (e.g. `out/` from
+                      `next build` with `output: 'export'`) instead of the
+                      diagnostic page. Threaded mode only.
+
+Both modes speak HTTP/1.1 with keep-alive, so load-test clients can reuse
+connections. GET /health returns a small JSON document for probes.
+
+In static mode every compressible file is gzip (and brotli, when the
+`brotli` package is installed) compressed once at startup. Responses carry
+ETags and honour If-None-Match and single byte ranges; small files are kept
+in an in-memory LRU and large ones are sent with zero-copy sendfile.
 """
 
+import argparse
+import asyncio
+import gzip
 import http.server
-import socketserver
+import json
+import mimetypes
+import os
+import re
 import socket
+import threading
 import time
 import webbrowser
 from datetime import datetime
-import os
+from html import escape
+from collections import OrderedDict
+from email.utils import formatdate
+from string import Template
+from urllib.parse import unquote
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 PORT = 8000
 
-class MyHttpRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate")
-        self.send_header("Pragma", "no-cache")
-        self.end_headers()
-        
-        hostname = socket.gethostname()
-        ip = socket.gethostbyname(hostname)
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        html = f"""
+# Resolved once at startup instead of on every request
+HOSTNAME = socket.gethostname()
+try:
+    LOCAL_IP = socket.gethostbyname(HOSTNAME)
+except socket.error:
+    LOCAL_IP = "127.0.0.1"
+
+STARTED_AT = time.time()
+
+# Static server fields are substituted once at startup so each response only
+# fills in three small per-request values.
+PAGE_TEMPLATE = Template("""
         <!DOCTYPE html>
         <html>
         <head>
             <title>Python Test Server</title>
             <style>
-                body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 0 20px; line-height: 1.6; }}
-                h1 {{ color: #3366cc; }}
-                .success {{ color: green; font-weight: bold; }}
-                .server-info {{ background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+                body { font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 0 20px; line-height: 1.6; }
+                h1 { color: #3366cc; }
+                .success { color: green; font-weight: bold; }
+                .server-info { background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0; }
             </style>
         </head>
         <body>
             <h1>Python HTTP Server Test Page</h1>
-            
+
             <p class="success">✓ CONNECTION SUCCESSFUL! The Python HTTP server is running and responding.</p>
-            
+
             <div class="server-info">
                 <h2>Server Information</h2>
-                <p><strong>Server Time:</strong> {now}</p>
-                <p><strong>Hostname:</strong> {hostname}</p>
-                <p><strong>Local IP:</strong> {ip}</p>
-                <p><strong>Port:</strong> {PORT}</p>
-                <p><strong>Request Path:</strong> {self.path}</p>
-                <p><strong>Your Browser:</strong> {self.headers.get('User-Agent')}</p>
+                <p><strong>Server Time:</strong> $now</p>
+                <p><strong>Hostname:</strong> $hostname</p>
+                <p><strong>Local IP:</strong> $ip</p>
+                <p><strong>Port:</strong> $port</p>
+                <p><strong>Request Path:</strong> $path</p>
+                <p><strong>Your Browser:</strong> $user_agent</p>
             </div>
-            
+
             <p>Since you can view this page, your network connection is working correctly for this server.</p>
             <p>This is a simple Python HTTP server, which is often easier to set up than Node.js or Next.js servers.</p>
-            
+
             <p><strong>To stop this server:</strong> Press Ctrl+C in the terminal window where it's running.</p>
         </body>
         </html>
-        """
-        
-        self.wfile.write(bytes(html, "utf8"))
-        return
+        """)
+
+COMMON_HEADERS = (
+    ("Cache-Control", "no-store, no-cache, must-revalidate"),
+    ("Pragma", "no-cache"),
+)
+
+
+def build_page_template(port):
+    """Fill in the static server fields, leaving the per-request ones open."""
+    return Template(PAGE_TEMPLATE.safe_substitute(hostname=escape(HOSTNAME), ip=escape(LOCAL_IP), port=port))
+
+
+def render_page(template, path, user_agent):
+    """Render the diagnostic page for a single request."""
+    return template.substitute(
+        now=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        path=escape(path),
+        user_agent=escape(user_agent or ""),
+    ).encode("utf8")
+
+
+def render_health():
+    """Render the /health JSON body."""
+    return json.dumps({
+        "status": "ok",
+        "hostname": HOSTNAME,
+        "ip": LOCAL_IP,
+        "uptime_seconds": round(time.time() - STARTED_AT, 3),
+    }).encode("utf8")
+
+
+def route(template, path, user_agent):
+    """Return (content_type, body) for a GET request path."""
+    if path.split("?", 1)[0] == "/health":
+        return "application/json", render_health()
+    return "text/html; charset=utf-8", render_page(template, path, user_agent)
+
+
+# A single "start-end", "start-" or "-suffix" range, ASCII digits only
+BYTE_RANGE = re.compile(r"(\d*)-(\d*)", re.ASCII)
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "application/manifest+json",
+)
+
+
+class StaticAsset:
+    """A file in the static root with its precomputed representations."""
+
+    __slots__ = ("path", "size", "mtime", "content_type", "etag", "encoded")
+
+    def __init__(self, path, size, mtime_ns, content_type):
+        self.path = path
+        self.size = size
+        self.mtime = mtime_ns / 1e9
+        self.content_type = content_type
+        self.etag = f'"{size:x}-{mtime_ns:x}"'
+        # encoding name -> (etag, compressed bytes)
+        self.encoded = {}
+
+
+class StaticSite:
+    """
+    Index of a static export directory.
+
+    Files are scanned and compressed once at startup; requests only do a
+    dictionary lookup plus, for uncompressed small files, an LRU read.
+    """
+
+    def __init__(self, root, cache_bytes=64 * 1024 * 1024, small_file_limit=256 * 1024,
+                 max_precompress_bytes=16 * 1024 * 1024):
+        self.root = os.path.abspath(root)
+        self.cache_bytes = cache_bytes
+        self.small_file_limit = small_file_limit
+        self.max_precompress_bytes = max_precompress_bytes
+        self.assets = {}
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                stat = os.stat(full_path)
+                content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                if content_type.startswith("text/"):
+                    content_type += "; charset=utf-8"
+                asset = StaticAsset(full_path, stat.st_size, stat.st_mtime_ns, content_type)
+                if content_type.startswith(COMPRESSIBLE_TYPES) and 0 < stat.st_size <= self.max_precompress_bytes:
+                    self._precompress(asset)
+                url_path = "/" + os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                self.assets[url_path] = asset
+
+    def _precompress(self, asset):
+        with open(asset.path, "rb") as f:
+            raw = f.read()
+        candidates = [("gzip", gzip.compress(raw, compresslevel=9))]
+        if brotli is not None:
+            candidates.append(("br", brotli.compress(raw)))
+        for encoding, data in candidates:
+            # Only keep representations that actually save bytes
+            if len(data) < len(raw):
+                asset.encoded[encoding] = (f'{asset.etag[:-1]}-{encoding}"', data)
+
+    def lookup(self, url_path):
+        """Resolve a request path the way a static Next.js export expects."""
+        path = unquote(url_path.split("?", 1)[0].split("#", 1)[0])
+        if ".." in path.split("/"):
+            return None
+        for candidate in (path, path.rstrip("/") + "/index.html", path.rstrip("/") + ".html"):
+            asset = self.assets.get(candidate)
+            if asset is not None:
+                return asset
+        return None
+
+    def read(self, asset):
+        """Return the bytes of a small file, going through the LRU cache."""
+        with self._lock:
+            data = self._cache.get(asset.path)
+            if data is not None:
+                self._cache.move_to_end(asset.path)
+                return data
+
+        with open(asset.path, "rb") as f:
+            data = f.read()
+
+        with self._lock:
+            if asset.path not in self._cache:
+                self._cache[asset.path] = data
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self.cache_bytes and self._cache:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(evicted)
+        return data
+
+
+def parse_byte_range(header, size):
+    """
+    Parse a single `bytes=` range header.
+
+    Returns (start, end) inclusive, None when the header should be ignored,
+    or False when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    match = BYTE_RANGE.fullmatch(header[6:].strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    start_text, end_text = match.groups()
+    if start_text == "":
+        # Suffix range: the last N bytes
+        length = int(end_text)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def choose_encoding(accept_encoding, asset):
+    """
+    Pick the best precompressed representation the client accepts.
+
+    Encodings with q=0 are refused, "*" covers encodings not listed, and
+    brotli wins over gzip when both have the same weight.
+    """
+    if not asset.encoded or not accept_encoding:
+        return None
+    weights = {}
+    for token in accept_encoding.lower().split(","):
+        name, _, params = token.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+    best, best_weight = None, 0.0
+    for encoding in ("br", "gzip"):
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if encoding in asset.encoded and weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class MyHttpRequestHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY the body
+    # stalls on delayed ACKs for ~40ms per keep-alive request
+    disable_nagle_algorithm = True
+    page_template = build_page_template(PORT)
+
+    def do_GET(self):
+        content_type, body = route(self.page_template, self.path, self.headers.get("User-Agent"))
+        self._send(content_type, body)
+
+    def do_HEAD(self):
+        content_type, body = route(self.page_template, self.path, self.headers.get("User-Agent"))
+        self._send(content_type, body, include_body=False)
+
+    def _send(self, content_type, body, include_body=True):
+        self.send_response(200)
+        self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in COMMON_HEADERS:
+            self.send_header(name, value)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging to stderr dominates the cost under load
+        pass
+
+
+class StaticRequestHandler(MyHttpRequestHandler):
+    """Serves files from a StaticSite; /health stays available."""
+
+    site = None
+
+    def do_GET(self):
+        self._serve_static(include_body=True)
+
+    def do_HEAD(self):
+        self._serve_static(include_body=False)
+
+    def _serve_static(self, include_body):
+        if self.path.split("?", 1)[0] == "/health":
+            self._send("application/json", render_health(), include_body)
+            return
+
+        asset = self.site.lookup(self.path)
+        if asset is None:
+            self._send_empty(404)
+            return
+
+        encoding = None
+        byte_range = parse_byte_range(self.headers.get("Range"), asset.size)
+        if byte_range is None:
+            encoding = choose_encoding(self.headers.get("Accept-Encoding"), asset)
+        etag = asset.encoded[encoding][0] if encoding else asset.etag
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                self._send_empty(304, etag)
+                return
+
+        if byte_range is False:
+            self._send_empty(416, extra_headers=(("Content-Range", f"bytes */{asset.size}"),))
+            return
+
+        status = 200
+        start, end = 0, asset.size - 1
+        headers = [("ETag", etag)]
+        if encoding:
+            length = len(asset.encoded[encoding][1])
+            headers.append(("Content-Encoding", encoding))
+        elif byte_range:
+            status = 206
+            start, end = byte_range
+            length = end - start + 1
+            headers.append(("Content-Range", f"bytes {start}-{end}/{asset.size}"))
+        else:
+            length = asset.size
+
+        self.send_response(status)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Last-Modified", formatdate(asset.mtime, usegmt=True))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "no-cache")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+
+        if not include_body or length == 0:
+            return
+        if encoding:
+            self.wfile.write(asset.encoded[encoding][1])
+        elif asset.size <= self.site.small_file_limit:
+            self.wfile.write(self.site.read(asset)[start:end + 1])
+        else:
+            # Headers are already flushed (wbufsize is 0), so the socket can
+            # take the file directly via os.sendfile
+            with open(asset.path, "rb") as f:
+                self.connection.sendfile(f, offset=start, count=length)
+
+    def _send_empty(self, status, etag=None, extra_headers=()):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        if etag:
+            self.send_header("ETag", etag)
+        for name, value in extra_headers:
+            self.send_header(name, value)
+        self.end_headers()
+
+
+class ThreadedServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+
+async def handle_asyncio_client(reader, writer, template):
+    """Serve requests on one keep-alive connection in asyncio mode."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                break
+            method, path, version = parts
+
+            # Drain any request body so the next request parses cleanly
+            length = int(headers.get("content-length", 0) or 0)
+            if length:
+                await reader.readexactly(length)
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            if method not in ("GET", "HEAD"):
+                writer.write(b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\nAllow: GET, HEAD\r\n\r\n")
+            else:
+                content_type, body = route(template, path, headers.get("user-agent"))
+                head = [
+                    "HTTP/1.1 200 OK",
+                    f"Content-Type: {content_type}",
+                    f"Content-Length: {len(body)}",
+                    "Connection: keep-alive" if keep_alive else "Connection: close",
+                ]
+                head.extend(f"{name}: {value}" for name, value in COMMON_HEADERS)
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method == "GET":
+                    writer.write(body)
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_asyncio(port, on_listening=None):
+    """Run the asyncio server until cancelled; on_listening is called once the socket is bound."""
+    template = build_page_template(port)
+    server = await asyncio.start_server(
+        lambda r, w: handle_asyncio_client(r, w, template),
+        host="",
+        port=port,
+        backlog=1024,
+        reuse_address=True,
+    )
+    async with server:
+        if on_listening:
+            on_listening()
+        await server.serve_forever()
+
+
+def announce_started(port, open_browser=True):
+    """Print the access URLs; only called once the server socket is listening."""
+    print(f"Server started at http://localhost:{port}")
+    print("You can access it in your browser at:")
+    print(f"  → http://localhost:{port}")
+    print(f"  → http://127.0.0.1:{port}")
+    print(f"Health check: http://localhost:{port}/health")
+
+    # Try to open the browser automatically
+    if open_browser:
+        try:
+            webbrowser.open(f"http://localhost:{port}")
+        except Exception:
+            pass
+
+    print("\nPress Ctrl+C to stop the server")
+
 
 def check_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Python HTTP connectivity test server")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument("--mode", choices=["threaded", "asyncio"], default="threaded",
+                        help="Server implementation (default: threaded)")
+    parser.add_argument("--no-browser", action="store_true", help="Don't open a browser on startup")
+    parser.add_argument("--static", metavar="DIR", help="Serve a static UI export from DIR (threaded mode only)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    port = args.port
+
+    if args.static and args.mode != "threaded":
+        print("Static serving is only available in threaded mode.")
+        exit(1)
+
     # Check if port is already in use
-    if check_port_in_use(PORT):
-        print(f"WARNING: Port {PORT} is already in use!")
-        print("Try changing the PORT variable in the script or close the application using this port.")
+    if check_port_in_use(port):
+        print(f"WARNING: Port {port} is already in use!")
+        print("Try passing a different --port or close the application using this port.")
         time.sleep(5)
         exit(1)
-    
-    print(f"Starting Python HTTP server on port {PORT}...")
-    
-    # Create the server
-    Handler = MyHttpRequestHandler
-    
+
+    print(f"Starting Python HTTP server ({args.mode}) on port {port}...")
+
+    open_browser = not args.no_browser
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
-            print(f"Server started at http://localhost:{PORT}")
-            print("You can access it in your browser at:")
-            print(f"  → http://localhost:{PORT}")
-            print(f"  → http://127.0.0.1:{PORT}")
-            
-            # Try to open the browser automatically
-            try:
-                webbrowser.open(f"http://localhost:{PORT}")
-            except:
-                pass
-                
-            print("\nPress Ctrl+C to stop the server")
-            httpd.serve_forever()
+        # The server is constructed (bound and listening) before anything is announced
+        if args.static:
+            site = StaticSite(args.static)
+            compressed = sum(1 for asset in site.assets.values() if asset.encoded)
+            print(f"Serving {len(site.assets)} files from {site.root} ({compressed} precompressed)")
+            StaticRequestHandler.site = site
+            with ThreadedServer(("", port), StaticRequestHandler) as httpd:
+                announce_started(port, open_browser)
+                httpd.serve_forever()
+        elif args.mode == "asyncio":
+            asyncio.run(serve_asyncio(port, lambda: announce_started(port, open_browser)))
+        else:
+            MyHttpRequestHandler.page_template = build_page_template(port)
+            with ThreadedServer(("", port), MyHttpRequestHandler) as httpd:
+                announce_started(port, open_browser)
+                httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped.")
     except Exception as e:
         print(f"Error starting server: {e}")
-        
+
         # If permission denied, suggest running as admin
         if "permission" in str(e).lower():
             print("\nTIP: Try running this script as administrator if you're getting permission errors.")
-        
-        time.sleep(5) 
\ No newline at end of file
+
+        time.sleep(5)
+        exit(1)
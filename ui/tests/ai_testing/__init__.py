@@ -3,6 +3,20 @@ OpenAI Assistants API test framework for UI testing.
 
 This package provides tools for automating UI testing using OpenAI's Assistants API
 and Playwright for browser automation.
+
+AssistantTestAgent is imported on first access, so importing the package (for
+example to list scenarios or during pytest collection) doesn't load openai or
+playwright.
 """
 
-from .assistant_test_agent import AssistantTestAgent 
\ No newline at end of file
+from .scenario_catalog import Scenario, ScenarioCatalog, load_catalog
+
+
+def __getattr__(name):
+    if name == "AssistantTestAgent":
+        from .assistant_test_agent import AssistantTestAgent
+        return AssistantTestAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AssistantTestAgent", "Scenario", "ScenarioCatalog", "load_catalog"]
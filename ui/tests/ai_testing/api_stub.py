@@ -0,0 +1,203 @@
+"""
+Record and replay of the app's API traffic inside the browser.
+
+ApiStub routes API requests of a Playwright browser context. In "record" mode
+requests go to the real backend and each response is stored; in "replay" mode
+responses come straight from the store, so scenario timings no longer include
+backend or Supabase latency and runs are deterministic. An optional injected
+latency delays replayed responses to exercise loading states.
+
+Responses are keyed by method, path (with sorted query) and a normalized body:
+JSON bodies are re-serialized with sorted keys and without volatile fields such
+as timestamps, so requests that only differ in those still match. Several
+responses recorded for the same key are replayed in order, repeating the last.
+"""
+
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Recordings are run artifacts and live next to the other results, not in the
+# source tree; run_tests.py puts them in its --output-dir
+DEFAULT_RECORDINGS_PATH = os.path.join("test_results", "api_recordings.json")
+
+# Next.js API routes and Supabase REST/auth/storage endpoints
+DEFAULT_ROUTE_PATTERNS = ("**/api/**", "**/rest/v1/**", "**/auth/v1/**", "**/storage/v1/**")
+
+# JSON body fields that change on every request and are left out of the key
+VOLATILE_BODY_KEYS = {"timestamp", "created_at", "updated_at", "requestId", "request_id", "nonce"}
+
+# Headers that no longer apply once the body has been decoded and stored
+DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "date"}
+
+STUB_MODES = ("record", "replay")
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_BODY_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def normalize_body(body: Optional[bytes]) -> str:
+    """Return a stable digest of a request body; JSON is canonicalized first."""
+    if not body:
+        return ""
+    try:
+        canonical = json.dumps(_strip_volatile(json.loads(body)), sort_keys=True, separators=(",", ":")).encode()
+    except (ValueError, UnicodeDecodeError):
+        canonical = body
+    return hashlib.sha256(canonical).hexdigest()[:16]
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """Build the store key for a request."""
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.query:
+        path += "?" + urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {path} {normalize_body(body)}".rstrip()
+
+
+class ApiStub:
+    """
+    Records API responses to a JSON store or replays them from it.
+    """
+
+    def __init__(
+        self,
+        mode: str = "replay",
+        path: str = DEFAULT_RECORDINGS_PATH,
+        latency_ms: float = 0,
+        patterns: Iterable[str] = DEFAULT_ROUTE_PATTERNS,
+        passthrough_misses: bool = False
+    ):
+        """
+        Args:
+            mode: "record" to capture real responses, "replay" to serve stored ones
+            path: JSON file holding the recorded responses
+            latency_ms: Delay added before each replayed response
+            patterns: Playwright URL globs of the requests to stub
+            passthrough_misses: In replay mode, send unrecorded requests to the real
+                backend instead of answering 501
+        """
+        if mode not in STUB_MODES:
+            raise ValueError(f"Unknown API stub mode '{mode}', expected one of {', '.join(STUB_MODES)}")
+        self.mode = mode
+        self.path = path
+        self.latency_ms = latency_ms
+        self.patterns = tuple(patterns)
+        self.passthrough_misses = passthrough_misses
+        self.entries = self._load()
+        self._recorded_keys = set()
+        self.reset_stats()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if not os.path.exists(self.path):
+            if self.mode == "replay":
+                raise FileNotFoundError(f"No API recordings at {self.path}; run once with mode='record'")
+            return {}
+        with open(self.path) as f:
+            return json.load(f)["entries"]
+
+    def reset_stats(self):
+        """Clear per-test counters and restart replay sequences."""
+        self.stats = {"hits": 0, "misses": [], "recorded": 0}
+        self._replay_positions = {}
+
+    def fork(self) -> "ApiStub":
+        """
+        Return a stub serving the same recordings with its own counters and replay positions.
+
+        Used for browsers that run concurrently with this stub's, so resetting one
+        does not restart the other's replay sequences. Responses the fork records
+        are not saved.
+        """
+        forked = copy.copy(self)
+        forked.entries = dict(self.entries)
+        forked._recorded_keys = set()
+        forked.reset_stats()
+        return forked
+
+    async def attach(self, context):
+        """Route the stubbed URL patterns of a browser context through this stub."""
+        for pattern in self.patterns:
+            await context.route(pattern, self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        # Page navigations to /api/... are left alone; only fetch/XHR traffic is stubbed
+        if request.resource_type not in ("fetch", "xhr"):
+            await route.continue_()
+            return
+        key = request_key(request.method, request.url, request.post_data_buffer)
+        if self.mode == "record":
+            await self._record(route, key)
+        else:
+            await self._replay(route, key)
+
+    async def _record(self, route, key: str):
+        response = await route.fetch()
+        body = await response.body()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_RESPONSE_HEADERS}
+        if key not in self._recorded_keys:
+            # A new recording replaces responses stored by earlier sessions
+            self._recorded_keys.add(key)
+            self.entries[key] = []
+        self.entries[key].append({
+            "status": response.status,
+            "headers": headers,
+            "body_b64": base64.b64encode(body).decode("ascii"),
+        })
+        self.stats["recorded"] += 1
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    async def _replay(self, route, key: str):
+        responses = self.entries.get(key)
+        if not responses:
+            self.stats["misses"].append(key)
+            if self.passthrough_misses:
+                await route.continue_()
+            else:
+                await route.fulfill(
+                    status=501,
+                    content_type="application/json",
+                    body=json.dumps({"error": f"No recorded response for {key}"})
+                )
+            return
+
+        position = self._replay_positions.get(key, 0)
+        self._replay_positions[key] = position + 1
+        response = responses[min(position, len(responses) - 1)]
+        self.stats["hits"] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        await route.fulfill(
+            status=response["status"],
+            headers=response["headers"],
+            body=base64.b64decode(response["body_b64"])
+        )
+
+    def save(self):
+        """Write recorded responses to the store (record mode only)."""
+        if self.mode != "record":
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=1, sort_keys=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-test counters for the test result."""
+        return {
+            "mode": self.mode,
+            "hits": self.stats["hits"],
+            "recorded": self.stats["recorded"],
+            "misses": list(self.stats["misses"]),
+        }
@@ -11,10 +11,221 @@ import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncio
+import copy
 
 from openai import OpenAI
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
+from .api_stub import DEFAULT_RECORDINGS_PATH, ApiStub
+from .browser_daemon import acquire_warm_browser
+from .cross_browser import DEFAULT_ENGINES, divergence_prompt, find_divergence
+from .dom_delta import INIT_SCRIPT as DOM_DELTA_INIT_SCRIPT
+from .dom_delta import MUTATING_TOOLS, begin_dom_delta, collect_dom_delta
+from .emulation import EmulationController
+from .failure_capture import FailureRecorder
+from .leak_detector import LeakSampler, analyze_samples
+from .model_router import ModelRouter
+from .output_budget import OutputCompactor
+from .web_vitals import (
+    INIT_SCRIPT as WEB_VITALS_INIT_SCRIPT,
+    PerformanceBudgets,
+    PerformanceHistory,
+    collect_web_vitals,
+    route_of,
+    summarize_navigations
+)
+
+ASSISTANT_INSTRUCTIONS = """
+You are a specialized UI testing assistant for the PineScript MCP web application.
+Your purpose is to execute UI tests by controlling a web browser through Playwright.
+
+When given a test instruction, you should:
+1. Plan the test steps needed to verify the functionality
+2. Call the appropriate functions to execute these steps
+3. Validate the results and report success or failure
+4. Suggest improvements or additional tests if appropriate
+
+Be thorough but efficient in your testing approach. Focus on validating that
+the functionality works correctly from a user's perspective.
+"""
+
+# Appended to the instructions only when the feature is enabled
+COMPACT_OUTPUTS_INSTRUCTIONS = """
+Function results are compact: arguments you passed are not echoed back, and
+long page text is returned as an excerpt around the searched text. A result
+with "truncated": true has had text cut to fit its size budget.
+"""
+
+DOM_DELTA_INSTRUCTIONS = """
+click_element, fill_input, select_option and upload_file also return a
+"dom_delta" describing what changed on the page: elements that appeared or
+disappeared, elements whose text changed, and URL changes. Use it to verify the
+effect of an action directly instead of making extra check calls when it
+already shows what you need.
+"""
+
+
+def build_assistant_instructions(compact_outputs: bool = True, dom_deltas: bool = True) -> str:
+    """Assemble the assistant instructions for the enabled result features."""
+    instructions = ASSISTANT_INSTRUCTIONS
+    if compact_outputs:
+        instructions += COMPACT_OUTPUTS_INSTRUCTIONS
+    if dom_deltas:
+        instructions += DOM_DELTA_INSTRUCTIONS
+    return instructions
+
+
+ASSISTANT_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "navigate_to_url",
+            "description": "Navigate to a specific URL in the browser",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "url": {"type": "string", "description": "Full URL or path relative to base URL"}
+                },
+                "required": ["url"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "click_element",
+            "description": "Click on an element in the UI",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the element to click"},
+                    "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds to wait for element"}
+                },
+                "required": ["selector"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "fill_input",
+            "description": "Fill text into an input field",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the input field"},
+                    "text": {"type": "string", "description": "Text to enter into the field"}
+                },
+                "required": ["selector", "text"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "select_option",
+            "description": "Select an option from a dropdown",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the select element"},
+                    "value": {"type": "string", "description": "Value of the option to select"}
+                },
+                "required": ["selector", "value"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "upload_file",
+            "description": "Upload a file to a file input",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the file input"},
+                    "file_path": {"type": "string", "description": "Path to the file to upload"}
+                },
+                "required": ["selector", "file_path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_element_visible",
+            "description": "Check if an element is visible on the page",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the element"},
+                    "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds to wait for element"}
+                },
+                "required": ["selector"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_element_contains_text",
+            "description": "Check if an element contains specific text",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "selector": {"type": "string", "description": "CSS selector for the element"},
+                    "text": {"type": "string", "description": "Text to check for"}
+                },
+                "required": ["selector", "text"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "wait_for_navigation",
+            "description": "Wait for navigation to complete",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds"}
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "take_screenshot",
+            "description": "Take a screenshot of the current page",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "filename": {"type": "string", "description": "Filename to save the screenshot"}
+                },
+                "required": ["filename"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "verify_backtest_metrics",
+            "description": "Compare the metrics shown on the backtest results page with values computed from the uploaded trades/history CSV files",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "trades_path": {"type": "string", "description": "Path to the uploaded trades CSV"},
+                    "history_path": {"type": "string", "description": "Path to the uploaded history CSV (optional)"},
+                    "initial_capital": {"type": "number", "description": "Starting equity used by the page (default 10000)"}
+                },
+                "required": ["trades_path"]
+            }
+        }
+    }
+]
+
+
 class AssistantTestAgent:
     """
     A test agent powered by OpenAI's Assistants API that can execute UI tests
@@ -26,7 +237,21 @@ class AssistantTestAgent:
         api_key: Optional[str] = None,
         model: str = "gpt-4o", 
         assistant_name: str = "UI Test Assistant",
-        base_url: str = "http://localhost:5001"
+        base_url: str = "http://localhost:5001",
+        failure_capture: bool = False,
+        capture_buffer_size: int = 50,
+        failure_trace: bool = False,
+        web_vitals: bool = True,
+        performance_budgets: Optional[Any] = None,
+        performance_history_path: Optional[str] = "test_results/performance_history.jsonl",
+        compact_outputs: bool = True,
+        output_budgets: Optional[Dict[str, int]] = None,
+        browser_daemon: Optional[str] = None,
+        emulation_profile: Optional[str] = None,
+        api_stub: Optional[str] = None,
+        api_recordings_path: str = DEFAULT_RECORDINGS_PATH,
+        api_latency_ms: float = 0,
+        dom_deltas: bool = True
     ):
         """
         Initialize the Assistant Test Agent.
@@ -36,6 +261,29 @@ class AssistantTestAgent:
             model: Model to use for the assistant
             assistant_name: Name for the test assistant
             base_url: Base URL of the application to test
+            failure_capture: Keep a rolling in-memory buffer of recent actions, network
+                and console activity, written to failures/ only when a test fails
+            capture_buffer_size: Number of recent actions kept in the failure buffer
+            failure_trace: Also record a Playwright trace chunk per test, saved only
+                on failure (implies failure_capture; slower than the buffer alone)
+            web_vitals: Collect TTFB, FCP, LCP, CLS and transfer size after each navigation
+            performance_budgets: Per-route budget dict or JSON file path (defaults to
+                web_vitals.DEFAULT_BUDGETS); exceeding a budget fails the test
+            performance_history_path: JSONL file for cross-run trends (None to disable)
+            compact_outputs: Trim tool results to per-tool byte budgets before sending
+                them to the assistant (False sends the full results)
+            output_budgets: Per-tool byte budgets overriding
+                output_budget.DEFAULT_OUTPUT_BUDGETS
+            browser_daemon: "host:port" of a running browser_daemon to lease a warm
+                browser from; falls back to launching one when it is not reachable
+            emulation_profile: Network/CPU/device profile applied in setup, e.g. "3g",
+                "slow-cpu-4x", "mobile" or "3g+slow-cpu-4x" (see emulation.PROFILES)
+            api_stub: "record" to capture the app's API responses, "replay" to serve
+                them from api_recordings_path instead of the backend (None to disable)
+            api_recordings_path: JSON store of recorded API responses
+            api_latency_ms: Delay added to each replayed API response
+            dom_deltas: Return a summary of DOM and URL changes with each mutating
+                tool call made by the assistant
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
@@ -50,7 +298,33 @@ class AssistantTestAgent:
         self.browser = None
         self.context = None
         self.page = None
+        self.playwright = None
+        self.browser_daemon = browser_daemon
+        self.browser_lease = None
+        self.emulation_profile = emulation_profile
+        self.emulation = None
+        self.api_stub = ApiStub(api_stub, api_recordings_path, api_latency_ms) if api_stub else None
+        self.dom_deltas = dom_deltas
         self.log_file = f"test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.failure_trace = failure_trace
+        self.failure_recorder = None
+        if failure_capture or failure_trace:
+            self.failure_recorder = FailureRecorder(
+                max_actions=capture_buffer_size,
+                max_network=capture_buffer_size * 4,
+                max_console=capture_buffer_size * 4
+            )
+        # Cleared while running an attempt that a later one replaces on failure
+        self.save_failure_artifacts = True
+        self.current_test = None
+        self.current_model = model
+        self.web_vitals = web_vitals
+        self.performance_budgets = PerformanceBudgets(performance_budgets)
+        self.performance_history = PerformanceHistory(performance_history_path) if performance_history_path else None
+        self.navigations = []
+        self.output_compactor = OutputCompactor(output_budgets, model) if compact_outputs else None
+        # Set to a list to record executed tool calls for replay
+        self.recorded_calls = None
         
         self.test_results = {
             "passed": 0,
@@ -73,35 +347,106 @@ class AssistantTestAgent:
         await self._log(f"Created thread with ID: {self.thread_id}")
         
         # Initialize Playwright
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=False)
-        self.context = await self.browser.new_context()
-        self.page = await self.context.new_page()
-        await self._log("Browser initialized")
+        playwright = self.playwright = await async_playwright().start()
+        started = time.perf_counter()
+        if self.browser_daemon:
+            self.browser_lease = await acquire_warm_browser(self.browser_daemon)
+        if self.browser_lease:
+            self.browser = await playwright.chromium.connect_over_cdp(self.browser_lease.endpoint)
+            # The daemon's browsers are fresh per lease; use the default context and its warm page
+            self.context = self.browser.contexts[0]
+            await self._log(f"Leased warm browser {self.browser_lease.browser_id} from {self.browser_daemon}")
+        else:
+            if self.browser_daemon:
+                await self._log(f"No browser daemon at {self.browser_daemon}, launching a browser")
+            self.browser = await playwright.chromium.launch(headless=False)
+            self.context = await self.browser.new_context()
+        if self.web_vitals:
+            await self.context.add_init_script(WEB_VITALS_INIT_SCRIPT)
+        if self.dom_deltas:
+            await self.context.add_init_script(DOM_DELTA_INIT_SCRIPT)
+        if self.api_stub:
+            await self.api_stub.attach(self.context)
+        if self.browser_lease and self.context.pages:
+            self.page = self.context.pages[0]
+        else:
+            self.page = await self.context.new_page()
+        if self.failure_recorder:
+            self.failure_recorder.attach(self.page)
+        if self.failure_trace:
+            await self.context.tracing.start(screenshots=True, snapshots=True)
+        if self.emulation_profile:
+            await self.set_emulation_profile(self.emulation_profile)
+        await self._log(f"Browser initialized in {(time.perf_counter() - started) * 1000:.0f} ms")
     
     async def teardown(self):
         """Clean up resources."""
-        if self.context:
+        if self.api_stub:
+            self.api_stub.save()
+        if self.context and not self.browser_lease:
             await self.context.close()
         if self.browser:
+            # Disconnects from a leased browser without closing it
             await self.browser.close()
+        if self.browser_lease:
+            # The daemon replaces the browser once the lease is closed
+            self.browser_lease.close()
+            self.browser_lease = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
         await self._log("Test agent teardown complete")
         
         # Print test summary
         print(f"\nTest Results: {self.test_results['passed']} passed, {self.test_results['failed']} failed")
+        if self.output_compactor and self.output_compactor.stats["calls"]:
+            savings = self.output_compactor.report()
+            self.test_results["output_budget"] = savings
+            print(
+                f"Tool outputs: {savings['sent_bytes']} of {savings['raw_bytes']} bytes sent "
+                f"({savings['bytes_saved']} bytes, ~{savings['tokens_saved']} tokens saved; "
+                f"{savings['truncated_calls']} of {savings['calls']} calls truncated)"
+            )
         
-    async def run_test(self, test_instruction: str, wait_time: int = 120):
+    async def set_emulation_profile(self, profile: Optional[str]):
+        """
+        Throttle network and CPU and/or emulate a device for the following tests.
+        
+        Args:
+            profile: Name from emulation.PROFILES, several joined with "+", or
+                None to go back to full speed
+        """
+        if not self.emulation:
+            if not profile:
+                return
+            self.emulation = EmulationController()
+            await self.emulation.attach(self.context, self.page)
+        settings = await self.emulation.apply(profile)
+        self.emulation_profile = profile
+        await self._log(f"Emulation profile: {profile or 'none'} {settings}")
+    
+    async def run_test(self, test_instruction: str, wait_time: int = 120, model: Optional[str] = None):
         """
         Run a test based on a natural language instruction.
         
         Args:
             test_instruction: Natural language description of the test to run
             wait_time: Maximum time to wait for test completion in seconds
+            model: Model for this run (defaults to the assistant's model)
         
         Returns:
             Dict containing test results
         """
         await self._log(f"Running test: {test_instruction}")
+        self.current_test = test_instruction
+        self.current_model = model or self.model
+        self.navigations = []
+        if self.failure_recorder:
+            self.failure_recorder.reset()
+        if self.api_stub:
+            self.api_stub.reset_stats()
+        if self.failure_trace:
+            await self.context.tracing.start_chunk(title=test_instruction[:80])
         
         # Add test request to thread
         self.client.beta.threads.messages.create(
@@ -113,7 +458,8 @@ class AssistantTestAgent:
         # Create and monitor run
         run = self.client.beta.threads.runs.create(
             thread_id=self.thread_id,
-            assistant_id=self.assistant_id
+            assistant_id=self.assistant_id,
+            model=self.current_model
         )
         
         # Poll for completions and required actions
@@ -133,7 +479,7 @@ class AssistantTestAgent:
                     if message.role == "assistant":
                         latest_message = message.content[0].text.value
                         await self._log(f"Test completed: {latest_message}")
-                        return self._process_test_result(latest_message, True)
+                        return await self._complete_test(latest_message, True)
                 break
                 
             elif run.status == "requires_action":
@@ -143,13 +489,278 @@ class AssistantTestAgent:
                 
             elif run.status in ["failed", "cancelled", "expired"]:
                 await self._log(f"Run failed with status: {run.status}")
-                return self._process_test_result(f"Test failed: {run.status}", False)
+                return await self._complete_test(f"Test failed: {run.status}", False, "assistant")
                 
             await asyncio.sleep(1)
         
         await self._log("Test timed out")
-        return self._process_test_result("Test timed out", False)
+        try:
+            # An active run blocks new messages on the thread
+            self.client.beta.threads.runs.cancel(thread_id=self.thread_id, run_id=run.id)
+        except Exception as e:
+            await self._log(f"Could not cancel timed out run: {str(e)}")
+        return await self._complete_test("Test timed out", False, "timeout")
+    
+    async def run_routed_test(
+        self,
+        test_instruction: str,
+        router: ModelRouter,
+        scenario: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        wait_time: int = 120
+    ) -> Dict[str, Any]:
+        """
+        Run a test on the model chosen by a router, escalating after a failure or timeout.
+        
+        Only the assistant's own failures and timeouts escalate and count
+        against a model; a run that only exceeded a performance budget is
+        reported as failed but not retried. Each escalated attempt starts on a fresh thread so the larger model is
+        not steered by the failed conversation. Only the final attempt counts
+        towards the pass/fail totals and saves failure artifacts; every attempt
+        is recorded in the router's history and listed under "routing" in the
+        result.
+        
+        Args:
+            test_instruction: Natural language description of the test to run
+            router: Router that picks the models and records attempts
+            scenario: Stable scenario name used for routing history (defaults to the instruction)
+            tags: Scenario tags consulted by the router
+            wait_time: Maximum time per attempt in seconds
+        
+        Returns:
+            The final attempt's test result, with "model" and "routing" entries
+        """
+        scenario = scenario or test_instruction
+        route = router.route(scenario, tags)
+        models = route["models"]
+        await self._log(f"Routing {scenario} to {' -> '.join(models)} ({route['reason']})")
+        
+        attempts = []
+        for index, model in enumerate(models):
+            if index > 0:
+                self.thread_id = self.client.beta.threads.create().id
+                await self._log(f"Escalating {scenario} to {model}")
+            started = time.time()
+            # A failed attempt that will be escalated leaves no failure artifacts
+            self.save_failure_artifacts = index == len(models) - 1
+            try:
+                result = await self.run_test(test_instruction, wait_time, model=model)
+            finally:
+                self.save_failure_artifacts = True
+            duration = time.time() - started
+            model_failed = router.record_result(scenario, model, result, duration)
+            attempts.append({
+                "model": model,
+                "success": result["success"],
+                "failure_kind": result.get("failure_kind"),
+                "duration_s": round(duration, 2),
+            })
+            # A larger model cannot fix a page that only missed its performance budget
+            if not model_failed or index == len(models) - 1:
+                break
+            # Superseded by the escalated attempt
+            self.test_results["total"] -= 1
+            self.test_results["failed"] -= 1
+            self.test_results["details"].pop()
+        
+        result["routing"] = {"reason": route["reason"], "escalated": len(attempts) > 1, "attempts": attempts}
+        return result
+            
+    async def run_leak_test(
+        self,
+        test_instruction: str,
+        iterations: int = 10,
+        wait_time: int = 120,
+        thresholds: Optional[Dict[str, float]] = None,
+        fail_on_leak: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Repeat a scenario in the same page and check for steady memory growth.
+        
+        The first iteration runs through the assistant and its tool calls are
+        recorded; the remaining iterations replay those calls directly, so the
+        model is consulted only once. Navigations to the page that is already
+        open are skipped during replay, so the document (and any leak in it)
+        survives across iterations. After every iteration the JS heap, DOM node,
+        event-listener and document counts are sampled via CDP after forced GC.
+        
+        Args:
+            test_instruction: Natural language description of the scenario
+            iterations: Total number of scenario runs, including the first
+            wait_time: Maximum time for the assistant-driven iteration in seconds
+            thresholds: Per-metric growth per iteration that counts as a leak
+            fail_on_leak: Mark the test as failed when a leak is suspected
+        
+        Returns:
+            The first iteration's test result with a "leak_analysis" entry
+        """
+        sampler = LeakSampler()
+        await sampler.attach(self.context, self.page)
+        
+        try:
+            self.recorded_calls = []
+            result = await self.run_test(test_instruction, wait_time)
+            plan = self.recorded_calls
+            self.recorded_calls = None
+            if not result["success"]:
+                return result
             
+            samples = [await self._sample_leak_counters(sampler)]
+            for iteration in range(1, iterations):
+                for call in plan:
+                    if call["name"] == "navigate_to_url" and self._is_current_url(call["args"]["url"]):
+                        continue
+                    step = await self._execute_function(call["name"], call["args"])
+                    if not step.get("success", False):
+                        await self._log(f"Replay step {call['name']} failed in iteration {iteration + 1}: {step}")
+                samples.append(await self._sample_leak_counters(sampler))
+                await self._log(f"Leak test iteration {iteration + 1}/{iterations}: {samples[-1]}")
+        finally:
+            self.recorded_calls = None
+            await sampler.detach()
+        
+        analysis = analyze_samples(samples, thresholds)
+        result["leak_analysis"] = analysis
+        if analysis["leak_suspected"]:
+            leaking = [name for name, metric in analysis["metrics"].items() if metric["leak"]]
+            await self._log(f"Possible leak in: {', '.join(leaking)}")
+            if fail_on_leak:
+                result["success"] = False
+                result["message"] += f"\n\nPossible memory leak: steady growth in {', '.join(leaking)}"
+                self.test_results["passed"] -= 1
+                self.test_results["failed"] += 1
+        return result
+    
+    async def _sample_leak_counters(self, sampler: LeakSampler) -> Dict[str, float]:
+        """Sample memory counters with the DOM-delta buffers emptied first."""
+        if self.dom_deltas:
+            # Replayed steps bypass _handle_tool_calls, so nothing else drains them
+            await begin_dom_delta(self.page)
+        return await sampler.sample()
+    
+    async def run_cross_browser_test(
+        self,
+        test_instruction: str,
+        engines=DEFAULT_ENGINES,
+        wait_time: int = 120
+    ) -> Dict[str, Any]:
+        """
+        Run a test through the assistant once, then replay its plan on other engines.
+        
+        The assistant drives the test on this agent's Chromium page while its
+        tool calls are recorded. Each engine in engines then replays the plan
+        concurrently through _execute_function in its own browser. The assistant
+        is consulted for an engine only when a step diverges from the Chromium
+        run, and continues the test from that step. Web vitals and budgets apply
+        to the Chromium run only.
+        
+        Args:
+            test_instruction: Natural language description of the test to run
+            engines: Playwright browser types to replay on
+            wait_time: Maximum time for each assistant-driven run in seconds
+        
+        Returns:
+            The Chromium test result with a per-engine "engines" entry; it only
+            succeeds when every engine does
+        """
+        self.recorded_calls = []
+        try:
+            result = await self.run_test(test_instruction, wait_time)
+            plan = self.recorded_calls
+        finally:
+            self.recorded_calls = None
+        
+        engine_results = {"chromium": {"success": result["success"], "mode": "assistant", "steps": len(plan)}}
+        if result["success"]:
+            outcomes = await asyncio.gather(
+                *(self._replay_on_engine(engine, plan, test_instruction, wait_time) for engine in engines),
+                return_exceptions=True
+            )
+            for engine, outcome in zip(engines, outcomes):
+                if isinstance(outcome, Exception):
+                    outcome = {"success": False, "mode": "error", "message": str(outcome)}
+                engine_results[engine] = outcome
+        result["engines"] = engine_results
+        
+        failed = [engine for engine, outcome in engine_results.items() if not outcome["success"]]
+        if result["success"] and failed:
+            result["success"] = False
+            result["message"] += f"\n\nFailed on: {', '.join(failed)}"
+            self.test_results["passed"] -= 1
+            self.test_results["failed"] += 1
+        return result
+    
+    async def _replay_on_engine(
+        self,
+        engine: str,
+        plan: List[Dict[str, Any]],
+        test_instruction: str,
+        wait_time: int
+    ) -> Dict[str, Any]:
+        """Replay a recorded plan in a new browser of the given engine."""
+        started = time.time()
+        browser = await getattr(self.playwright, engine).launch(headless=False)
+        try:
+            context = await browser.new_context()
+            if self.dom_deltas:
+                await context.add_init_script(DOM_DELTA_INIT_SCRIPT)
+            # A shallow copy reuses the client, assistant and tools but drives its own page
+            replayer = copy.copy(self)
+            if self.api_stub:
+                # Engines replay concurrently; each needs its own replay positions
+                replayer.api_stub = self.api_stub.fork()
+                await replayer.api_stub.attach(context)
+            replayer.browser = browser
+            replayer.context = context
+            replayer.page = await context.new_page()
+            replayer.navigations = []
+            replayer.web_vitals = False
+            replayer.failure_recorder = None
+            replayer.failure_trace = False
+            replayer.recorded_calls = None
+            replayer.test_results = {"passed": 0, "failed": 0, "total": 0, "details": []}
+            
+            for index, step in enumerate(plan):
+                args = step["args"]
+                if step["name"] == "take_screenshot":
+                    # Keep the Chromium screenshot
+                    args = {**args, "filename": f"{engine}_{args['filename']}"}
+                actual = await replayer._execute_function(step["name"], args)
+                divergence = find_divergence(step, actual)
+                if divergence:
+                    break
+            else:
+                await self._log(f"{engine}: replayed {len(plan)} steps without divergence")
+                return {
+                    "success": True,
+                    "mode": "replay",
+                    "steps": len(plan),
+                    "duration_s": round(time.time() - started, 2),
+                }
+            
+            await self._log(f"{engine}: step {index + 1} ({step['name']}) diverged: {divergence}; consulting assistant")
+            replayer.thread_id = self.client.beta.threads.create().id
+            outcome = await replayer.run_test(
+                divergence_prompt(engine, test_instruction, plan, index, divergence), wait_time
+            )
+            return {
+                "success": outcome["success"],
+                "mode": "assistant",
+                "steps": index,
+                "diverged_at": index + 1,
+                "divergence": divergence,
+                "message": outcome["message"],
+                "duration_s": round(time.time() - started, 2),
+            }
+        finally:
+            await browser.close()
+    
+    def _is_current_url(self, url: str) -> bool:
+        """Check whether a navigate_to_url target is the page already open."""
+        if not url.startswith("http"):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        return self.page.url.rstrip("/") == url.rstrip("/")
+    
     async def _create_assistant(self) -> str:
         """
         Create or retrieve the UI test assistant with the necessary tools.
@@ -157,162 +768,30 @@ class AssistantTestAgent:
         Returns:
             The assistant ID
         """
+        instructions = build_assistant_instructions(
+            compact_outputs=self.output_compactor is not None,
+            dom_deltas=self.dom_deltas
+        )
+        
         # Check for existing assistants with the same name
         assistants = self.client.beta.assistants.list()
         for assistant in assistants.data:
             if assistant.name == self.assistant_name:
+                # Keep a previously created assistant in sync with the current tool set
+                self.client.beta.assistants.update(
+                    assistant.id,
+                    instructions=instructions,
+                    model=self.model,
+                    tools=ASSISTANT_TOOLS
+                )
                 return assistant.id
                 
         # Create a new assistant
         assistant = self.client.beta.assistants.create(
             name=self.assistant_name,
-            instructions="""
-            You are a specialized UI testing assistant for the PineScript MCP web application.
-            Your purpose is to execute UI tests by controlling a web browser through Playwright.
-            
-            When given a test instruction, you should:
-            1. Plan the test steps needed to verify the functionality
-            2. Call the appropriate functions to execute these steps
-            3. Validate the results and report success or failure
-            4. Suggest improvements or additional tests if appropriate
-            
-            Be thorough but efficient in your testing approach. Focus on validating that
-            the functionality works correctly from a user's perspective.
-            """,
+            instructions=instructions,
             model=self.model,
-            tools=[
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "navigate_to_url",
-                        "description": "Navigate to a specific URL in the browser",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "url": {"type": "string", "description": "Full URL or path relative to base URL"}
-                            },
-                            "required": ["url"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "click_element",
-                        "description": "Click on an element in the UI",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the element to click"},
-                                "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds to wait for element"}
-                            },
-                            "required": ["selector"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "fill_input",
-                        "description": "Fill text into an input field",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the input field"},
-                                "text": {"type": "string", "description": "Text to enter into the field"}
-                            },
-                            "required": ["selector", "text"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "select_option",
-                        "description": "Select an option from a dropdown",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the select element"},
-                                "value": {"type": "string", "description": "Value of the option to select"}
-                            },
-                            "required": ["selector", "value"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "upload_file",
-                        "description": "Upload a file to a file input",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the file input"},
-                                "file_path": {"type": "string", "description": "Path to the file to upload"}
-                            },
-                            "required": ["selector", "file_path"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "check_element_visible",
-                        "description": "Check if an element is visible on the page",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the element"},
-                                "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds to wait for element"}
-                            },
-                            "required": ["selector"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "check_element_contains_text",
-                        "description": "Check if an element contains specific text",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "selector": {"type": "string", "description": "CSS selector for the element"},
-                                "text": {"type": "string", "description": "Text to check for"}
-                            },
-                            "required": ["selector", "text"]
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "wait_for_navigation",
-                        "description": "Wait for navigation to complete",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "timeout_ms": {"type": "integer", "description": "Timeout in milliseconds"}
-                            }
-                        }
-                    }
-                },
-                {
-                    "type": "function",
-                    "function": {
-                        "name": "take_screenshot",
-                        "description": "Take a screenshot of the current page",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "filename": {"type": "string", "description": "Filename to save the screenshot"}
-                            },
-                            "required": ["filename"]
-                        }
-                    }
-                }
-            ]
+            tools=ASSISTANT_TOOLS
         )
         
         return assistant.id
@@ -328,10 +807,25 @@ class AssistantTestAgent:
             await self._log(f"Executing function: {function_name} with args: {function_args}")
             
             try:
+                started = time.perf_counter()
+                track_delta = self.dom_deltas and function_name in MUTATING_TOOLS
+                marker = await begin_dom_delta(self.page) if track_delta else None
                 result = await self._execute_function(function_name, function_args)
+                if track_delta and result.get("success"):
+                    result["dom_delta"] = await collect_dom_delta(self.page, marker)
+                if self.failure_recorder:
+                    self.failure_recorder.record_action(
+                        function_name, function_args, result, (time.perf_counter() - started) * 1000
+                    )
+                if self.recorded_calls is not None:
+                    self.recorded_calls.append({"name": function_name, "args": function_args, "result": result})
+                if self.output_compactor:
+                    output = self.output_compactor.compact(function_name, function_args, result)
+                else:
+                    output = json.dumps(result)
                 tool_outputs.append({
                     "tool_call_id": tool_call.id,
-                    "output": json.dumps(result)
+                    "output": output
                 })
                 await self._log(f"Function result: {result}")
             except Exception as e:
@@ -358,7 +852,17 @@ class AssistantTestAgent:
                 if not url.startswith("http"):
                     url = f"{self.base_url}/{url.lstrip('/')}"
                 await self.page.goto(url)
-                return {"success": True, "url": url}
+                result = {"success": True, "url": url}
+                if self.web_vitals:
+                    metrics = await collect_web_vitals(self.page)
+                    self.navigations.append({
+                        "url": url,
+                        "route": route_of(url),
+                        "profile": self.emulation_profile,
+                        "metrics": metrics,
+                    })
+                    result["web_vitals"] = metrics
+                return result
                 
             elif function_name == "click_element":
                 selector = args["selector"]
@@ -416,12 +920,71 @@ class AssistantTestAgent:
                 await self.page.screenshot(path=screenshot_path)
                 return {"success": True, "path": screenshot_path}
                 
+            elif function_name == "verify_backtest_metrics":
+                # NumPy is only needed when this tool is actually used
+                from .metrics_oracle import verify_backtest_page
+                comparison = await verify_backtest_page(
+                    self.page,
+                    args["trades_path"],
+                    args.get("history_path"),
+                    initial_capital=args.get("initial_capital", 10000.0)
+                )
+                return {"success": True, **comparison}
+                
             else:
                 return {"success": False, "error": f"Unknown function: {function_name}"}
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _complete_test(self, message: str, success: bool, failure_kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Record the result, enforce performance budgets and close the per-test trace chunk.
+        
+        The result's "assistant_success" is the assistant's own outcome, while
+        "success" also reflects the budgets. "failure_kind" says why a test
+        failed: "assistant", "timeout" or "budget" (None when it passed).
+        """
+        assistant_success = success
+        if not success:
+            failure_kind = failure_kind or "assistant"
+        performance = None
+        if self.navigations:
+            performance = summarize_navigations(
+                self.navigations, self.performance_budgets, self.performance_history, self.current_test
+            )
+            if performance["budget_violations"]:
+                details = "; ".join(
+                    f"{v['route']} {v['metric']}={v['value']} exceeds {v['budget']}"
+                    for v in performance["budget_violations"]
+                )
+                await self._log(f"Performance budget exceeded: {details}")
+                if success:
+                    failure_kind = "budget"
+                success = False
+                message = f"{message}\n\nPerformance budget exceeded: {details}"
+        
+        result = self._process_test_result(message, success)
+        result["assistant_success"] = assistant_success
+        result["failure_kind"] = failure_kind
+        result["model"] = self.current_model
+        if self.emulation_profile:
+            result["emulation_profile"] = self.emulation_profile
+        if self.api_stub:
+            result["api_stub"] = self.api_stub.summary()
+        if performance:
+            result["performance"] = performance
+        if self.failure_trace and self.context:
+            if success or "artifacts" not in result:
+                # Discard the chunk without writing it
+                await self.context.tracing.stop_chunk()
+            else:
+                trace_path = f"{result['artifacts']['base']}.zip"
+                await self.context.tracing.stop_chunk(path=trace_path)
+                result["artifacts"]["playwright_trace"] = trace_path
+                await self._log(f"Playwright trace saved to {trace_path}")
+        return result
+    
     def _process_test_result(self, message: str, success: bool) -> Dict[str, Any]:
         """Process and record the result of a test."""
         result = {
@@ -435,6 +998,8 @@ class AssistantTestAgent:
             self.test_results["passed"] += 1
         else:
             self.test_results["failed"] += 1
+            if self.failure_recorder and self.save_failure_artifacts:
+                result["artifacts"] = self.failure_recorder.dump(self.current_test or message, message)
             
         self.test_results["details"].append(result)
         return result
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+Persistent warm-browser daemon for the AI test runner.
+
+Launching Chromium dominates the startup of short test runs. The daemon keeps a
+pool of already-running Chromium instances, each with a blank page open so its
+renderer process is warm, and hands them out over a local control socket:
+
+    python -m ui.tests.ai_testing.browser_daemon --pool-size 2
+
+A runner leases a browser with acquire_warm_browser() and attaches to it over
+CDP, which takes milliseconds instead of seconds. The lease lasts as long as
+the control connection stays open. When it closes, the daemon discards that
+browser and launches a fresh one in the background, so every lease starts from
+a clean profile. When no daemon is listening, acquire_warm_browser() returns
+None and the runner launches its own browser as before.
+
+Playwright for Python has no launch_server(), so browsers are shared through
+Chromium's remote-debugging port (Chromium only).
+
+Control protocol: one JSON object per line.
+    {"op": "acquire"} -> {"endpoint": "http://127.0.0.1:<port>", "id": <n>}
+    {"op": "status"}  -> {"ready": <n>, "leased": <n>, "launching": <n>, "pool_size": <n>}
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_DAEMON_ADDRESS = "127.0.0.1:9323"
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split "host:port" (or just "port") into a tuple."""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class WarmBrowserPool:
+    """
+    Pool of running Chromium instances reachable over CDP, owned by the daemon.
+    """
+
+    def __init__(self, playwright, pool_size: int = 2, headless: bool = False, warm_url: str = "about:blank"):
+        """
+        Args:
+            playwright: Started Playwright instance
+            pool_size: Number of browsers kept ready
+            headless: Launch browsers headless
+            warm_url: URL opened in each browser's first page while it waits
+        """
+        self.playwright = playwright
+        self.pool_size = pool_size
+        self.headless = headless
+        self.warm_url = warm_url
+        self.ready = asyncio.Queue()
+        self.leased = 0
+        # Launches in flight; concurrent fill() calls count them so they don't over-launch
+        self.launching = 0
+        self.next_id = 1
+
+    async def _launch(self) -> Dict[str, Any]:
+        port = _free_port()
+        started = time.perf_counter()
+        browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=[f"--remote-debugging-port={port}"]
+        )
+        # Open a page in the default context, which is the one CDP clients attach to
+        session = await browser.new_browser_cdp_session()
+        await session.send("Target.createTarget", {"url": self.warm_url})
+        await session.detach()
+        entry = {"id": self.next_id, "browser": browser, "endpoint": f"http://127.0.0.1:{port}"}
+        self.next_id += 1
+        print(f"Browser {entry['id']} ready on {entry['endpoint']} in {time.perf_counter() - started:.2f}s")
+        return entry
+
+    async def fill(self):
+        """Launch browsers until the pool is full."""
+        while self.ready.qsize() + self.leased + self.launching < self.pool_size:
+            self.launching += 1
+            try:
+                entry = await self._launch()
+            finally:
+                self.launching -= 1
+            self.ready.put_nowait(entry)
+
+    async def acquire(self) -> Dict[str, Any]:
+        """Take a ready browser, skipping any that died while waiting."""
+        while True:
+            entry = await self.ready.get()
+            if entry["browser"].is_connected():
+                self.leased += 1
+                return entry
+            asyncio.create_task(self.fill())
+
+    async def release(self, entry: Dict[str, Any]):
+        """Discard a leased browser and replace it with a fresh one."""
+        self.leased -= 1
+        try:
+            await entry["browser"].close()
+        finally:
+            await self.fill()
+
+    async def close(self):
+        while not self.ready.empty():
+            entry = self.ready.get_nowait()
+            await entry["browser"].close()
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "ready": self.ready.qsize(),
+            "leased": self.leased,
+            "launching": self.launching,
+            "pool_size": self.pool_size,
+        }
+
+
+async def _handle_client(pool: WarmBrowserPool, reader, writer):
+    entry = None
+    try:
+        line = await reader.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        if request.get("op") == "status":
+            writer.write((json.dumps(pool.status()) + "\n").encode())
+            await writer.drain()
+            return
+        if request.get("op") != "acquire":
+            writer.write((json.dumps({"error": f"unknown op {request.get('op')}"}) + "\n").encode())
+            await writer.drain()
+            return
+
+        entry = await pool.acquire()
+        writer.write((json.dumps({"endpoint": entry["endpoint"], "id": entry["id"]}) + "\n").encode())
+        await writer.drain()
+        # The lease lasts until the client closes the connection
+        while await reader.read(1024):
+            pass
+    except (ConnectionError, json.JSONDecodeError) as e:
+        print(f"Control connection error: {e}")
+    finally:
+        writer.close()
+        if entry:
+            print(f"Browser {entry['id']} released")
+            await pool.release(entry)
+
+
+async def serve(address: str = DEFAULT_DAEMON_ADDRESS, pool_size: int = 2, headless: bool = False,
+                warm_url: str = "about:blank"):
+    """Run the daemon until cancelled."""
+    from playwright.async_api import async_playwright
+
+    host, port = parse_address(address)
+    async with async_playwright() as playwright:
+        pool = WarmBrowserPool(playwright, pool_size, headless, warm_url)
+        await pool.fill()
+        server = await asyncio.start_server(lambda r, w: _handle_client(pool, r, w), host, port)
+        print(f"Warm browser daemon listening on {host}:{port} with {pool_size} browsers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await pool.close()
+
+
+class BrowserLease:
+    """
+    A browser leased from the daemon; close() hands it back for recycling.
+    """
+
+    def __init__(self, endpoint: str, browser_id: int, writer):
+        self.endpoint = endpoint
+        self.browser_id = browser_id
+        self._writer = writer
+
+    def close(self):
+        self._writer.close()
+
+
+async def acquire_warm_browser(
+    address: str = DEFAULT_DAEMON_ADDRESS,
+    connect_timeout: float = 0.2,
+    acquire_timeout: float = 30.0
+) -> Optional[BrowserLease]:
+    """
+    Lease a warm browser from the daemon.
+
+    Args:
+        address: Daemon control address as "host:port"
+        connect_timeout: Seconds to wait for the daemon to accept the connection
+        acquire_timeout: Seconds to wait for a browser when the pool is busy
+
+    Returns:
+        A BrowserLease, or None when no daemon is reachable
+    """
+    host, port = parse_address(address)
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), connect_timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(b'{"op": "acquire"}\n')
+        await writer.drain()
+        response = json.loads(await asyncio.wait_for(reader.readline(), acquire_timeout))
+    except (OSError, asyncio.TimeoutError, json.JSONDecodeError):
+        writer.close()
+        return None
+    if "endpoint" not in response:
+        writer.close()
+        return None
+    return BrowserLease(response["endpoint"], response["id"], writer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep warm Chromium instances for AI UI test runs")
+    parser.add_argument("--address", default=DEFAULT_DAEMON_ADDRESS,
+                        help=f"Control socket address (default: {DEFAULT_DAEMON_ADDRESS})")
+    parser.add_argument("--pool-size", type=int, default=2, help="Browsers kept ready (default: 2)")
+    parser.add_argument("--headless", action="store_true", help="Launch browsers headless")
+    parser.add_argument("--warm-url", default="about:blank",
+                        help="URL preloaded in each waiting browser, e.g. the app's base URL")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.address, args.pool_size, args.headless, args.warm_url))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
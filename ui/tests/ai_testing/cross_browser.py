@@ -0,0 +1,59 @@
+"""
+Helpers for planning a test once and replaying it on other browser engines.
+
+The assistant drives the test on the primary engine while its tool calls and
+results are recorded. Each other engine replays that plan directly, and a step
+counts as diverging when its outcome differs from the primary run: the call
+fails, or a verification result such as "visible", "contains_text" or
+"matches" comes out differently. Only then is the assistant asked to continue
+the test on that engine, starting from the diverging step.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+DEFAULT_ENGINES = ("firefox", "webkit")
+
+# Result fields that carry a verification outcome and must agree across engines
+OUTCOME_KEYS = ("visible", "contains_text", "matches")
+
+
+def find_divergence(step: Dict[str, Any], actual: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compare a replayed step's result with the recorded one.
+
+    Args:
+        step: Recorded call with "name", "args" and "result"
+        actual: Result of the same call on another engine
+
+    Returns:
+        None when the outcomes agree, otherwise a dict describing the difference
+    """
+    expected = step.get("result") or {}
+    if expected.get("success", True) and not actual.get("success", False):
+        return {"reason": "step failed", "error": actual.get("error")}
+    for key in OUTCOME_KEYS:
+        if key in expected and expected[key] != actual.get(key):
+            return {"reason": f"{key} differs", "expected": expected[key], "actual": actual.get(key)}
+    return None
+
+
+def divergence_prompt(
+    engine: str,
+    test_instruction: str,
+    plan: List[Dict[str, Any]],
+    index: int,
+    divergence: Dict[str, Any]
+) -> str:
+    """Build the message asking the assistant to finish a diverged replay."""
+    step = plan[index]
+    remaining = [{"name": s["name"], "args": s["args"]} for s in plan[index + 1:]]
+    return (
+        f"This test passed on Chromium. Its recorded steps were replayed on {engine}, and step "
+        f"{index + 1} of {len(plan)} diverged: {step['name']}({json.dumps(step['args'])}) "
+        f"{divergence['reason']} ({json.dumps({k: v for k, v in divergence.items() if k != 'reason'})}).\n"
+        f"The {engine} browser is in the state after the steps before it. Continue the test from here, "
+        f"adapting the remaining steps to {engine} if needed, and report whether the test passes.\n\n"
+        f"Original test:\n{test_instruction}\n\n"
+        f"Remaining recorded steps:\n{json.dumps(remaining)}"
+    )
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+"""
+Streaming generator for large synthetic trades and history CSVs.
+
+The files use the same columns as tests/data/trades.csv and
+tests/data/history.csv, so they can be dropped into the Analyze page upload
+areas. Rows are produced lazily and written in fixed-size blocks, so memory
+use stays constant whether the output is 10 rows or tens of millions. The
+same seed always produces the same file.
+
+Usage:
+    python -m ui.tests.ai_testing.data_generator history history_1m.csv --size 100MB --interval 1m
+    python -m ui.tests.ai_testing.data_generator trades trades.csv --rows 1000000 --seed 7
+    python -m ui.tests.ai_testing.data_generator samples
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+HISTORY_HEADER = "date,open,high,low,close,volume"
+TRADES_HEADER = "date,symbol,side,quantity,price,profit_loss"
+
+INTERVALS = {
+    "1s": 1,
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+DEFAULT_SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "XAUUSD", "BTCUSD", "SPY"]
+
+# Paths referenced by SAMPLE_TEST_DATA["filepath_samples"], relative to ui/
+SAMPLE_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+
+
+def parse_size(size: str) -> int:
+    """Parse a human size such as "10MB" or "1.5GB" into bytes."""
+    text = size.strip().upper().replace(" ", "")
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def _timestamps(start: datetime, interval_s: int) -> Iterator[str]:
+    """
+    Yield formatted timestamps at a fixed interval.
+
+    Daily bars use the plain date format of tests/data/history.csv. Intraday
+    bars format the date part once per day and only the clock per row.
+    """
+    if interval_s >= 86400:
+        day = start.date()
+        step = timedelta(days=interval_s // 86400)
+        while True:
+            yield day.isoformat()
+            day += step
+
+    day = start.date()
+    seconds = start.hour * 3600 + start.minute * 60 + start.second
+    prefix = day.isoformat()
+    while True:
+        hours, remainder = divmod(seconds, 3600)
+        minutes, secs = divmod(remainder, 60)
+        yield f"{prefix} {hours:02d}:{minutes:02d}:{secs:02d}"
+        seconds += interval_s
+        if seconds >= 86400:
+            day += timedelta(days=seconds // 86400)
+            seconds %= 86400
+            prefix = day.isoformat()
+
+
+def generate_history_rows(
+    seed: int = 42,
+    start: datetime = datetime(2020, 1, 1),
+    interval: str = "1m",
+    start_price: float = 40000.0,
+    volatility: float = 0.001
+) -> Iterator[str]:
+    """
+    Yield OHLCV CSV rows (without header) from a seeded random walk.
+
+    Args:
+        seed: Random seed; identical seeds produce identical output
+        start: Timestamp of the first bar
+        interval: Bar interval, one of INTERVALS
+        start_price: Opening price of the first bar
+        volatility: Standard deviation of the per-bar log return
+
+    Yields:
+        One CSV line per bar, ending with a newline
+    """
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    close = start_price
+    for timestamp in _timestamps(start, INTERVALS[interval]):
+        open_ = close
+        close = open_ * math.exp(gauss(0.0, volatility))
+        high = max(open_, close) * (1.0 + abs(gauss(0.0, volatility)) / 2)
+        low = min(open_, close) * (1.0 - abs(gauss(0.0, volatility)) / 2)
+        volume = int(rng.lognormvariate(7.0, 0.5))
+        yield f"{timestamp},{open_:.2f},{high:.2f},{low:.2f},{close:.2f},{volume}\n"
+
+
+def generate_trade_rows(
+    seed: int = 42,
+    start: datetime = datetime(2020, 1, 1, 9, 30),
+    interval: str = "1m",
+    symbols: Optional[list] = None,
+    volatility: float = 0.01
+) -> Iterator[str]:
+    """
+    Yield round-trip trade CSV rows (without header).
+
+    Each trade is a BUY row with zero profit_loss followed by a SELL row
+    carrying the realised profit, matching tests/data/trades.csv.
+
+    Args:
+        seed: Random seed; identical seeds produce identical output
+        start: Timestamp of the first fill
+        interval: Spacing between consecutive fills, one of INTERVALS
+        symbols: Symbols to trade (defaults to DEFAULT_SYMBOLS)
+        volatility: Standard deviation of the entry-to-exit log return
+
+    Yields:
+        One CSV line per fill, ending with a newline
+    """
+    rng = random.Random(seed)
+    gauss = rng.gauss
+    symbols = symbols or DEFAULT_SYMBOLS
+    prices = {symbol: rng.uniform(20.0, 3000.0) for symbol in symbols}
+    timestamps = _timestamps(start, INTERVALS[interval])
+    while True:
+        symbol = rng.choice(symbols)
+        quantity = rng.randint(1, 100)
+        entry = prices[symbol]
+        exit_ = entry * math.exp(gauss(0.0005, volatility))
+        # Drift the symbol's reference price so later trades don't repeat levels
+        prices[symbol] = exit_ * math.exp(gauss(0.0, volatility))
+        profit = (round(exit_, 2) - round(entry, 2)) * quantity
+        yield f"{next(timestamps)},{symbol},BUY,{quantity},{entry:.2f},0\n"
+        yield f"{next(timestamps)},{symbol},SELL,{quantity},{exit_:.2f},{profit:.2f}\n"
+
+
+def write_csv(
+    path: str,
+    header: str,
+    rows: Iterator[str],
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    block_bytes: int = 1 << 20
+) -> Dict[str, Any]:
+    """
+    Stream rows into a CSV file until a row or byte limit is reached.
+
+    Rows are joined into blocks of about `block_bytes` before being written,
+    so memory use is bounded by the block size.
+
+    Args:
+        path: Output file path
+        header: Header line (without newline)
+        rows: Iterator of newline-terminated CSV rows
+        max_rows: Stop after this many data rows
+        max_bytes: Stop once the file reaches this size
+        block_bytes: Size of each buffered write
+
+    Returns:
+        Dict with the number of rows and bytes written
+    """
+    if max_rows is None and max_bytes is None:
+        raise ValueError("Either max_rows or max_bytes must be given")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    written_rows = 0
+    written_bytes = len(header) + 1
+    block = []
+    block_size = 0
+
+    with open(path, "w", newline="", encoding="ascii") as f:
+        f.write(header + "\n")
+        for row in rows:
+            if max_rows is not None and written_rows >= max_rows:
+                break
+            if max_bytes is not None and written_bytes + len(row) > max_bytes:
+                break
+            block.append(row)
+            block_size += len(row)
+            written_rows += 1
+            written_bytes += len(row)
+            if block_size >= block_bytes:
+                f.write("".join(block))
+                block.clear()
+                block_size = 0
+        f.write("".join(block))
+
+    return {"path": path, "rows": written_rows, "bytes": written_bytes}
+
+
+def write_history_csv(path: str, max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                      **kwargs) -> Dict[str, Any]:
+    """Write a synthetic OHLCV history file. Extra kwargs go to generate_history_rows."""
+    return write_csv(path, HISTORY_HEADER, generate_history_rows(**kwargs), max_rows, max_bytes)
+
+
+def write_trades_csv(path: str, max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                     **kwargs) -> Dict[str, Any]:
+    """Write a synthetic trades file. Extra kwargs go to generate_trade_rows."""
+    return write_csv(path, TRADES_HEADER, generate_trade_rows(**kwargs), max_rows, max_bytes)
+
+
+def summarize_trades_csv(path: str) -> Dict[str, Any]:
+    """
+    Compute simple backtest totals from a trades CSV in one streaming pass.
+
+    Only SELL rows close a trade; BUY rows carry no profit.
+    """
+    total_trades = winning = losing = 0
+    gross_profit = gross_loss = 0.0
+    with open(path, encoding="ascii") as f:
+        next(f)
+        for line in f:
+            fields = line.rstrip("\n").split(",")
+            if fields[2] != "SELL":
+                continue
+            profit = float(fields[5])
+            total_trades += 1
+            if profit > 0:
+                winning += 1
+                gross_profit += profit
+            elif profit < 0:
+                losing += 1
+                gross_loss -= profit
+    return {
+        "totalTrades": total_trades,
+        "winningTrades": winning,
+        "losingTrades": losing,
+        "netProfit": round(gross_profit - gross_loss, 2),
+        "profitFactor": round(gross_profit / gross_loss, 2) if gross_loss else None,
+        "winRate": round(100.0 * winning / total_trades, 1) if total_trades else 0.0,
+    }
+
+
+def write_sample_files(directory: str = SAMPLE_DATA_DIR, seed: int = 42) -> Dict[str, str]:
+    """
+    (Re)create the files referenced by SAMPLE_TEST_DATA["filepath_samples"].
+    """
+    csv_path = os.path.join(directory, "sample_trades.csv")
+    json_path = os.path.join(directory, "sample_results.json")
+    write_trades_csv(csv_path, max_rows=200, seed=seed, interval="1h")
+    with open(json_path, "w") as f:
+        json.dump({"source": "sample_trades.csv", "seed": seed, **summarize_trades_csv(csv_path)}, f, indent=2)
+        f.write("\n")
+    return {"csv": csv_path, "json": json_path}
+
+
+def main():
+    """Parse arguments and generate the requested file."""
+    parser = argparse.ArgumentParser(description="Generate large synthetic trades/history CSV files")
+    parser.add_argument("kind", choices=["history", "trades", "samples"], help="What to generate")
+    parser.add_argument("output", nargs="?", help="Output path (not used for 'samples')")
+    parser.add_argument("--rows", type=int, help="Number of data rows to write")
+    parser.add_argument("--size", help="Target file size, e.g. 10MB, 1GB")
+    parser.add_argument("--interval", choices=list(INTERVALS), default="1m", help="Bar/fill interval (default: 1m)")
+    parser.add_argument("--start", default="2020-01-01", help="Start date (default: 2020-01-01)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+
+    args = parser.parse_args()
+
+    if args.kind == "samples":
+        paths = write_sample_files(seed=args.seed)
+        print(f"Wrote {paths['csv']} and {paths['json']}")
+        return
+
+    if not args.output or (args.rows is None and args.size is None):
+        parser.error("an output path and --rows or --size are required")
+
+    writer = write_history_csv if args.kind == "history" else write_trades_csv
+    result = writer(
+        args.output,
+        max_rows=args.rows,
+        max_bytes=parse_size(args.size) if args.size else None,
+        seed=args.seed,
+        start=datetime.fromisoformat(args.start),
+        interval=args.interval
+    )
+    print(f"Wrote {result['rows']:,} rows ({result['bytes'] / 1024 ** 2:.1f} MB) to {result['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Compact DOM-change summaries for mutating tool calls.
+
+An init script installs one MutationObserver per document that records a short
+description of each element that was added, removed or had its text changed
+(capped at MAX_TRACKED per category). Only descriptions are stored, never the
+nodes, so the observer doesn't keep detached subtrees alive. Before a mutating
+action the agent marks the start; after it, once the page has been quiet for a
+moment, collect_dom_delta summarizes the changes within a small budget:
+
+    {"url_changed": {"from": ..., "to": ...}, "navigated": true,
+     "appeared": ["div.toast: Saved"], "disappeared": ["div.spinner"],
+     "text_changed": ["span#counter-value: 1"], "more": {"appeared": 3}}
+
+so the assistant can usually verify an action's effect without follow-up
+check calls. Elements are described as tag#id.class[data-testid] plus a short
+text excerpt.
+"""
+
+from typing import Any, Dict, Optional
+
+MAX_TRACKED = 500
+
+# Text kept per recorded element; collect_dom_delta shortens it further
+MAX_TEXT_CHARS = 200
+
+INIT_SCRIPT = """
+(() => {
+    if (window.__domDelta) return;
+    // Changes are kept as descriptions keyed by a per-node serial number, never
+    // as node references, so detached subtrees can still be garbage collected.
+    // Nodes only carry small expando markers for the current epoch.
+    const state = window.__domDelta = {
+        id: Math.random().toString(36).slice(2),
+        epoch: 1, serial: 0,
+        added: new Map(), removed: new Map(), text: new Map(),
+        overflow: false, last: 0, url: location.href
+    };
+    const squash = (s) => (s || '').slice(0, 2000).replace(/\\s+/g, ' ').trim().slice(0, %d);
+    const keyOf = (el) => el.__domDeltaKey || (el.__domDeltaKey = ++state.serial);
+    const describe = (el, withText) => {
+        let d = el.tagName.toLowerCase();
+        if (el.id) d += '#' + el.id;
+        const classes = typeof el.className === 'string' ? el.className.split(/\\s+/).filter(Boolean) : [];
+        if (classes.length) d += '.' + classes.slice(0, 2).join('.');
+        const testId = el.getAttribute && el.getAttribute('data-testid');
+        if (testId) d += `[data-testid=${testId}]`;
+        return { d, text: withText ? squash(el.textContent) : '' };
+    };
+    const put = (map, el, withText) => {
+        const key = keyOf(el);
+        if (map.has(key) || map.size < %d) map.set(key, describe(el, withText)); else state.overflow = true;
+    };
+    const addedAncestor = (el) => {
+        for (let p = el; p; p = p.parentElement) if (p.__domDeltaAdded === state.epoch) return p;
+        return null;
+    };
+    const textChanged = (el) => {
+        // Changes inside a newly added element only refresh that element's text
+        const owner = addedAncestor(el);
+        if (owner) put(state.added, owner, true); else put(state.text, el, true);
+    };
+    const start = () => new MutationObserver((records) => {
+        state.last = performance.now();
+        for (const r of records) {
+            if (r.type === 'characterData') {
+                if (r.target.parentElement) textChanged(r.target.parentElement);
+                continue;
+            }
+            const parent = r.target.nodeType === 1 ? r.target : null;
+            for (const n of r.addedNodes) {
+                if (n.nodeType === 1) {
+                    if (n.__domDeltaRemoved === state.epoch) state.removed.delete(keyOf(n));
+                    if (parent && addedAncestor(parent)) { textChanged(parent); continue; }
+                    n.__domDeltaAdded = state.epoch;
+                    state.text.delete(keyOf(n));
+                    put(state.added, n, true);
+                } else if (n.nodeType === 3 && parent) {
+                    textChanged(parent);
+                }
+            }
+            for (const n of r.removedNodes) {
+                if (n.nodeType === 1) {
+                    const key = keyOf(n);
+                    state.text.delete(key);
+                    if (n.__domDeltaAdded === state.epoch) {
+                        n.__domDeltaAdded = 0;
+                        state.added.delete(key);
+                    } else if (parent && addedAncestor(parent)) {
+                        textChanged(parent);
+                    } else {
+                        n.__domDeltaRemoved = state.epoch;
+                        put(state.removed, n, false);
+                    }
+                } else if (n.nodeType === 3 && parent) {
+                    textChanged(parent);
+                }
+            }
+        }
+    }).observe(document, { subtree: true, childList: true, characterData: true });
+    if (document.documentElement) start(); else document.addEventListener('DOMContentLoaded', start);
+})();
+""" % (MAX_TEXT_CHARS, MAX_TRACKED)
+
+BEGIN_JS = """
+() => {
+    const state = window.__domDelta;
+    if (!state) return null;
+    state.epoch += 1;
+    state.added.clear(); state.removed.clear(); state.text.clear();
+    state.overflow = false;
+    state.url = location.href;
+    return { id: state.id, url: location.href };
+}
+"""
+
+COLLECT_JS = """
+async ([maxItems, textChars, quietMs, maxWaitMs]) => {
+    const state = window.__domDelta;
+    if (!state) return null;
+    const started = performance.now();
+    while (performance.now() - state.last < quietMs && performance.now() - started < maxWaitMs) {
+        await new Promise((resolve) => setTimeout(resolve, 25));
+    }
+    const format = ({ d, text }) =>
+        text ? d + ': ' + (text.length > textChars ? text.slice(0, textChars - 1) + '…' : text) : d;
+
+    const delta = {};
+    const more = {};
+    const put = (key, map) => {
+        const items = [...map.values()];
+        if (!items.length) return;
+        delta[key] = items.slice(0, maxItems).map(format);
+        if (items.length > maxItems) more[key] = items.length - maxItems;
+    };
+    put('appeared', state.added);
+    put('disappeared', state.removed);
+    put('text_changed', state.text);
+    if (Object.keys(more).length) delta.more = more;
+    if (state.overflow) delta.overflow = true;
+    if (location.href !== state.url) delta.url_changed = { from: state.url, to: location.href };
+    return delta;
+}
+"""
+
+# Tools whose effect on the page is reported
+MUTATING_TOOLS = {"click_element", "fill_input", "select_option", "upload_file"}
+
+
+async def begin_dom_delta(page) -> Optional[Dict[str, str]]:
+    """Reset the change buffer before an action; returns a marker for collect_dom_delta."""
+    try:
+        return await page.evaluate(BEGIN_JS)
+    except Exception:
+        return None
+
+
+async def collect_dom_delta(
+    page,
+    marker: Optional[Dict[str, str]],
+    max_items: int = 6,
+    text_chars: int = 80,
+    quiet_ms: int = 100,
+    max_wait_ms: int = 1000
+) -> Dict[str, Any]:
+    """
+    Summarize DOM and URL changes since begin_dom_delta.
+
+    Args:
+        page: Playwright page the action ran on
+        marker: Value returned by begin_dom_delta
+        max_items: Maximum elements listed per category
+        text_chars: Maximum text excerpt per element
+        quiet_ms: Wait until no mutation happened for this long...
+        max_wait_ms: ...but no longer than this
+
+    Returns:
+        Dict of the non-empty change categories, {"unchanged": True} when
+        nothing changed
+    """
+    if marker is None:
+        return {"unavailable": True}
+    for attempt in range(2):
+        try:
+            state_id = await page.evaluate("() => window.__domDelta && window.__domDelta.id")
+            if state_id != marker["id"]:
+                # A new document was loaded by the action
+                await page.wait_for_load_state("domcontentloaded")
+                return {
+                    "navigated": True,
+                    "url_changed": {"from": marker["url"], "to": page.url},
+                    "title": await page.title(),
+                }
+            delta = await page.evaluate(COLLECT_JS, [max_items, text_chars, quiet_ms, max_wait_ms])
+            return delta or {"unchanged": True}
+        except Exception:
+            # The execution context was destroyed mid-navigation; wait and look again
+            if attempt:
+                break
+            await page.wait_for_load_state("domcontentloaded")
+    return {"url_changed": {"from": marker["url"], "to": page.url}}
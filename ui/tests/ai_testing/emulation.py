@@ -0,0 +1,124 @@
+"""
+Network, CPU and device emulation profiles for slow-client testing.
+
+Profiles are applied to a Chromium page through the Chrome DevTools Protocol
+and can be switched between scenarios without recreating the page. Names can
+be combined with "+", e.g. "3g+slow-cpu-4x+mobile"; later parts override
+earlier ones where they overlap.
+
+Network values follow the Chrome DevTools throttling presets (throughput in
+bytes per second, latency in milliseconds).
+"""
+
+from typing import Any, Dict, Optional
+
+NETWORK_PRESETS = {
+    "3g": {"latency": 562.5, "download": 1.6 * 1024 * 1024 / 8 * 0.9, "upload": 750 * 1024 / 8 * 0.9},
+    "slow-3g": {"latency": 2000, "download": 500 * 1024 / 8 * 0.9, "upload": 500 * 1024 / 8 * 0.9},
+    "4g": {"latency": 170, "download": 9 * 1024 * 1024 / 8 * 0.9, "upload": 9 * 1024 * 1024 / 8 * 0.9},
+}
+
+DEVICE_PRESETS = {
+    "mobile": {
+        "width": 390,
+        "height": 844,
+        "device_scale_factor": 3,
+        "mobile": True,
+        "user_agent": (
+            "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+    },
+}
+
+# Profile name -> settings; a profile sets any of "network", "cpu_rate" and "device"
+PROFILES = {
+    "3g": {"network": "3g"},
+    "slow-3g": {"network": "slow-3g"},
+    "4g": {"network": "4g"},
+    "slow-cpu-4x": {"cpu_rate": 4},
+    "slow-cpu-6x": {"cpu_rate": 6},
+    "mobile": {"device": "mobile"},
+    # A mid-range phone on a poor connection
+    "mobile-3g": {"device": "mobile", "network": "3g", "cpu_rate": 4},
+}
+
+
+def resolve_profile(name: str) -> Dict[str, Any]:
+    """
+    Merge the parts of a "+"-separated profile name.
+
+    Raises:
+        ValueError: If a part is not a known profile
+    """
+    settings = {}
+    for part in name.lower().split("+"):
+        part = part.strip()
+        if part not in PROFILES:
+            raise ValueError(f"Unknown emulation profile '{part}'. Available: {', '.join(PROFILES)}")
+        settings.update(PROFILES[part])
+    return settings
+
+
+class EmulationController:
+    """
+    Applies and resets emulation profiles on one page through a CDP session.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.profile = None
+        self._viewport = None
+        self._user_agent = None
+
+    async def attach(self, context, page):
+        """Open a CDP session for the page (Chromium only)."""
+        self.session = await context.new_cdp_session(page)
+        await self.session.send("Network.enable")
+        # Restored when switching away from a device profile
+        self._viewport = page.viewport_size
+        self._user_agent = await page.evaluate("navigator.userAgent")
+
+    async def apply(self, profile: Optional[str]) -> Dict[str, Any]:
+        """
+        Switch to a profile, or back to full speed with None.
+
+        Returns:
+            The resolved settings
+        """
+        settings = resolve_profile(profile) if profile else {}
+
+        network = NETWORK_PRESETS.get(settings.get("network"))
+        await self.session.send("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": network["latency"] if network else 0,
+            "downloadThroughput": network["download"] if network else -1,
+            "uploadThroughput": network["upload"] if network else -1,
+        })
+        await self.session.send("Emulation.setCPUThrottlingRate", {"rate": settings.get("cpu_rate", 1)})
+
+        device = DEVICE_PRESETS.get(settings.get("device"))
+        if device:
+            await self.session.send("Emulation.setDeviceMetricsOverride", {
+                "width": device["width"],
+                "height": device["height"],
+                "deviceScaleFactor": device["device_scale_factor"],
+                "mobile": device["mobile"],
+            })
+            await self.session.send("Emulation.setTouchEmulationEnabled", {"enabled": True, "maxTouchPoints": 5})
+            await self.session.send("Emulation.setUserAgentOverride", {"userAgent": device["user_agent"]})
+        elif self.profile and resolve_profile(self.profile).get("device"):
+            if self._viewport:
+                await self.session.send("Emulation.setDeviceMetricsOverride", {
+                    "width": self._viewport["width"],
+                    "height": self._viewport["height"],
+                    "deviceScaleFactor": 0,
+                    "mobile": False,
+                })
+            else:
+                await self.session.send("Emulation.clearDeviceMetricsOverride")
+            await self.session.send("Emulation.setTouchEmulationEnabled", {"enabled": False})
+            await self.session.send("Emulation.setUserAgentOverride", {"userAgent": self._user_agent})
+
+        self.profile = profile
+        return settings
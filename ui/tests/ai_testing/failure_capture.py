@@ -0,0 +1,192 @@
+"""
+Failure-only capture of browser activity for the AI test agent.
+
+FailureRecorder keeps bounded in-memory ring buffers of the most recent tool
+actions, network exchanges and console messages. Nothing is written to disk
+while tests pass; when a test fails the buffers are dumped as a JSON trace and
+a HAR 1.2 file so the failure can be inspected in any HAR viewer.
+
+Recording only appends small dicts to deques from Playwright event callbacks,
+so passing runs pay almost nothing for it.
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+
+def _slugify(text: str, max_length: int = 40) -> str:
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", text).strip("-").lower()
+    return slug[:max_length] or "test"
+
+
+def _header_list(headers: Dict[str, str]):
+    return [{"name": name, "value": value} for name, value in headers.items()]
+
+
+class FailureRecorder:
+    """
+    Rolling buffer of recent actions, network and console activity.
+    """
+
+    def __init__(
+        self,
+        max_actions: int = 50,
+        max_network: int = 200,
+        max_console: int = 200,
+        output_dir: str = "failures"
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            max_actions: Number of most recent tool actions to keep
+            max_network: Number of most recent network exchanges to keep
+            max_console: Number of most recent console messages and page errors to keep
+            output_dir: Directory where failure artifacts are written
+        """
+        self.actions = deque(maxlen=max_actions)
+        self.network = deque(maxlen=max_network)
+        self.console = deque(maxlen=max_console)
+        self.output_dir = output_dir
+
+    def attach(self, page):
+        """Register Playwright event listeners on a page."""
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_page_error)
+        page.on("response", self._on_response)
+        page.on("requestfailed", self._on_request_failed)
+
+    def reset(self):
+        """Clear the buffers at the start of a test."""
+        self.actions.clear()
+        self.network.clear()
+        self.console.clear()
+
+    def record_action(self, name: str, args: Dict[str, Any], result: Dict[str, Any], duration_ms: float):
+        """Record a tool call made by the assistant."""
+        self.actions.append({
+            "time": datetime.now().isoformat(),
+            "name": name,
+            "args": args,
+            "result": result,
+            "duration_ms": round(duration_ms, 1),
+        })
+
+    def _on_console(self, message):
+        self.console.append({
+            "time": datetime.now().isoformat(),
+            "type": message.type,
+            "text": message.text,
+        })
+
+    def _on_page_error(self, error):
+        self.console.append({
+            "time": datetime.now().isoformat(),
+            "type": "pageerror",
+            "text": str(error),
+        })
+
+    def _on_response(self, response):
+        request = response.request
+        self.network.append({
+            "started": time.time(),
+            "method": request.method,
+            "url": request.url,
+            "request_headers": request.headers,
+            "post_data_size": len(request.post_data_buffer or b"") if request.method != "GET" else 0,
+            "status": response.status,
+            "status_text": response.status_text,
+            "response_headers": response.headers,
+            "timing": request.timing,
+        })
+
+    def _on_request_failed(self, request):
+        self.network.append({
+            "started": time.time(),
+            "method": request.method,
+            "url": request.url,
+            "request_headers": request.headers,
+            "post_data_size": 0,
+            "status": 0,
+            "status_text": request.failure or "failed",
+            "response_headers": {},
+            "timing": request.timing,
+        })
+
+    def to_har(self) -> Dict[str, Any]:
+        """Convert the network buffer to a HAR 1.2 document."""
+        entries = []
+        for item in self.network:
+            timing = item["timing"] or {}
+            request_start = timing.get("requestStart", -1)
+            response_start = timing.get("responseStart", -1)
+            response_end = timing.get("responseEnd", -1)
+            wait = response_start - request_start if request_start >= 0 and response_start >= 0 else -1
+            receive = response_end - response_start if response_start >= 0 and response_end >= 0 else -1
+            started = timing.get("startTime") or item["started"] * 1000
+            entries.append({
+                "startedDateTime": datetime.fromtimestamp(started / 1000, tz=timezone.utc).isoformat(),
+                "time": max(response_end, 0),
+                "request": {
+                    "method": item["method"],
+                    "url": item["url"],
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _header_list(item["request_headers"]),
+                    "queryString": [],
+                    "cookies": [],
+                    "headersSize": -1,
+                    "bodySize": item["post_data_size"],
+                },
+                "response": {
+                    "status": item["status"],
+                    "statusText": item["status_text"],
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _header_list(item["response_headers"]),
+                    "cookies": [],
+                    "content": {"size": -1, "mimeType": item["response_headers"].get("content-type", "")},
+                    "redirectURL": item["response_headers"].get("location", ""),
+                    "headersSize": -1,
+                    "bodySize": -1,
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": wait, "receive": receive},
+            })
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "ai_testing.FailureRecorder", "version": "1.0"},
+                "pages": [],
+                "entries": entries,
+            }
+        }
+
+    def dump(self, test_name: str, message: str) -> Dict[str, str]:
+        """
+        Write the buffers for a failed test.
+
+        Returns:
+            Paths of the written trace and HAR files
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{_slugify(test_name)}"
+        )
+        trace_path = f"{base}.trace.json"
+        har_path = f"{base}.har"
+
+        with open(trace_path, "w") as f:
+            json.dump({
+                "test": test_name,
+                "message": message,
+                "actions": list(self.actions),
+                "console": list(self.console),
+            }, f, indent=2, default=str)
+        with open(har_path, "w") as f:
+            json.dump(self.to_har(), f, indent=2)
+
+        return {"trace": trace_path, "har": har_path, "base": base}
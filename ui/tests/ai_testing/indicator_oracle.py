@@ -0,0 +1,360 @@
+"""
+Vectorized reference engine for the ta.* indicators used by the fixture strategies.
+
+SAMPLE_TEST_DATA["strategies"] and DETAILED_TEST_SCENARIOS["strategy_creation"]
+use ta.sma, ta.rsi, ta.crossover and ta.crossunder. This module computes those
+with Pine Script semantics in O(n) NumPy passes and evaluates the small
+entry/close rule subset the fixtures use, so scenarios can check the exact
+bars a strategy should signal on history.csv.
+
+Pine semantics reproduced here:
+    - ta.sma is na until `length` bars are available.
+    - ta.rsi uses Wilder's RMA of gains/losses, seeded with the SMA of the
+      first `length` changes, and is 100 when there are no losses.
+    - ta.crossover(a, b) is a > b on this bar and a <= b on the previous one;
+      any na operand makes the result false.
+    - strategy.entry opens a long only when flat (no pyramiding) and
+      strategy.close only closes an open position. Orders fill on the next
+      bar's open. If both fire on the same bar the later statement wins.
+
+Anything outside the supported subset (short entries, strategy.exit, order
+arguments that change fills, assignments inside if blocks, else branches)
+raises ValueError instead of producing a plausible but wrong expectation.
+"""
+
+import ast
+import math
+import textwrap
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+HISTORY_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def load_history(path: str) -> Dict[str, np.ndarray]:
+    """Load an OHLCV history CSV (date,open,high,low,close,volume) into column arrays."""
+    data = np.loadtxt(path, delimiter=",", skiprows=1, usecols=(1, 2, 3, 4, 5), dtype="f8", ndmin=2)
+    return {name: data[:, i] for i, name in enumerate(HISTORY_COLUMNS)}
+
+
+def sma(source: np.ndarray, length: int) -> np.ndarray:
+    """Simple moving average; na (NaN) for the first length - 1 bars."""
+    source = np.asarray(source, dtype="f8")
+    out = np.full(source.shape, np.nan)
+    if length <= 0 or source.size < length:
+        return out
+    # Offsetting by the first value keeps the running sum small, which keeps
+    # cumsum rounding error negligible over millions of bars
+    offset = source[0]
+    sums = np.cumsum(np.concatenate(([0.0], source - offset)))
+    out[length - 1:] = (sums[length:] - sums[:-length]) / length + offset
+    return out
+
+
+def rma(source: np.ndarray, length: int) -> np.ndarray:
+    """
+    Wilder's moving average (ta.rma), seeded with the SMA of the first
+    `length` non-na values.
+
+    The recursion y[t] = a * x[t] + (1 - a) * y[t - 1] is evaluated in blocks:
+    within a block each value is a scaled cumulative sum, and only the block
+    boundaries are carried sequentially, so the cost is O(n) array work plus
+    one Python step per block.
+    """
+    source = np.asarray(source, dtype="f8")
+    out = np.full(source.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(source))
+    if length <= 0 or valid.size < length:
+        return out
+
+    start = valid[0] + length - 1
+    out[start] = source[valid[0]:start + 1].mean()
+    values = source[start + 1:]
+    if not values.size:
+        return out
+
+    alpha = 1.0 / length
+    decay = 1.0 - alpha
+    if decay == 0.0:
+        out[start + 1:] = values
+        return out
+
+    # Keep decay**-block well inside float64 range
+    block = max(1, min(4096, int(50.0 / -math.log(decay))))
+    padded_size = -(-values.size // block) * block
+    blocks = np.zeros(padded_size)
+    blocks[:values.size] = values
+    blocks = blocks.reshape(-1, block)
+
+    powers = decay ** np.arange(block)
+    partial = alpha * powers * np.cumsum(blocks / powers, axis=1)
+    carry_scale = decay * powers
+
+    carries = np.empty(blocks.shape[0])
+    previous = out[start]
+    for i in range(blocks.shape[0]):
+        carries[i] = previous
+        previous = carry_scale[-1] * previous + partial[i, -1]
+
+    result = carry_scale * carries[:, None] + partial
+    out[start + 1:] = result.ravel()[:values.size]
+    return out
+
+
+def change(source: np.ndarray) -> np.ndarray:
+    """ta.change: difference from the previous bar, na on the first bar."""
+    source = np.asarray(source, dtype="f8")
+    out = np.full(source.shape, np.nan)
+    out[1:] = np.diff(source)
+    return out
+
+
+def rsi(source: np.ndarray, length: int) -> np.ndarray:
+    """Relative strength index matching ta.rsi."""
+    delta = change(source)
+    gains = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    losses = np.where(np.isnan(delta), np.nan, -np.minimum(delta, 0.0))
+    up = rma(gains, length)
+    down = rma(losses, length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + up / down)
+    out = np.where(down == 0, 100.0, np.where(up == 0, 0.0, out))
+    out[np.isnan(up) | np.isnan(down)] = np.nan
+    return out
+
+
+def _as_series(value, size: int) -> np.ndarray:
+    if np.isscalar(value):
+        return np.full(size, float(value))
+    return np.asarray(value, dtype="f8")
+
+
+def crossover(a, b) -> np.ndarray:
+    """True on bars where a crosses above b."""
+    size = np.size(a) if not np.isscalar(a) else np.size(b)
+    a, b = _as_series(a, size), _as_series(b, size)
+    out = np.zeros(size, dtype=bool)
+    out[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return out
+
+
+def crossunder(a, b) -> np.ndarray:
+    """True on bars where a crosses below b."""
+    size = np.size(a) if not np.isscalar(a) else np.size(b)
+    a, b = _as_series(a, size), _as_series(b, size)
+    out = np.zeros(size, dtype=bool)
+    out[1:] = (a[1:] < b[1:]) & (a[:-1] >= b[:-1])
+    return out
+
+
+TA_FUNCTIONS = {
+    "sma": sma,
+    "rma": rma,
+    "rsi": rsi,
+    "change": change,
+    "crossover": crossover,
+    "crossunder": crossunder,
+}
+
+_COMPARISONS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+# Order keyword arguments that don't affect which bars signal or how orders fill
+_NEUTRAL_ORDER_KEYWORDS = {"id", "comment", "alert_message"}
+
+_ARITHMETIC = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+
+class StrategyEvaluator:
+    """
+    Evaluates the Pine Script subset used by the fixture strategies:
+    top-level `name = <expr>` assignments, (nested) `if (<cond>)` blocks whose
+    statements are long strategy.entry / strategy.close orders, ta.* calls from
+    TA_FUNCTIONS, comparisons, arithmetic and and/or/not.
+    """
+
+    def __init__(self, history: Dict[str, np.ndarray]):
+        """
+        Args:
+            history: Column arrays as returned by load_history
+        """
+        self.history = history
+        self.size = history["close"].size
+
+    def _eval(self, node: ast.AST, variables: Dict[str, Any]):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id in variables:
+                return variables[node.id]
+            if node.id in self.history:
+                return self.history[node.id]
+            if node.id in ("true", "false"):
+                return node.id == "true"
+            raise ValueError(f"Unknown identifier: {node.id}")
+        if isinstance(node, ast.Call):
+            func = node.func
+            if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                    and func.value.id == "ta" and func.attr in TA_FUNCTIONS):
+                raise ValueError(f"Unsupported call: {ast.unparse(func)}")
+            args = [self._eval(arg, variables) for arg in node.args]
+            if func.attr in ("sma", "rma", "rsi"):
+                args[1] = int(args[1])
+            return TA_FUNCTIONS[func.attr](*args)
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in _COMPARISONS:
+            # Comparisons with na are false, which NumPy's NaN semantics already give
+            with np.errstate(invalid="ignore"):
+                return _COMPARISONS[type(node.ops[0])](
+                    self._eval(node.left, variables), self._eval(node.comparators[0], variables)
+                )
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _ARITHMETIC[type(node.op)](self._eval(node.left, variables), self._eval(node.right, variables))
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = self._eval(node.values[0], variables)
+            for value in node.values[1:]:
+                result = combine(result, self._eval(value, variables))
+            return result
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return np.logical_not(self._eval(node.operand, variables))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -self._eval(node.operand, variables)
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)}")
+
+    def evaluate_expression(self, expression: str, variables: Optional[Dict[str, Any]] = None):
+        """Evaluate a single Pine expression over the whole history."""
+        return self._eval(ast.parse(expression.strip(), mode="eval").body, variables or {})
+
+    def _order_target(self, line: str) -> int:
+        """Return 1 for a long strategy.entry and 0 for strategy.close."""
+        try:
+            call = ast.parse(line, mode="eval").body
+        except SyntaxError:
+            raise ValueError(f"Unsupported statement: {line}") from None
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                and isinstance(call.func.value, ast.Name) and call.func.value.id == "strategy"
+                and call.func.attr in ("entry", "close")):
+            raise ValueError(f"Unsupported statement: {line}")
+        keywords = {kw.arg: kw.value for kw in call.keywords}
+        unsupported = set(keywords) - _NEUTRAL_ORDER_KEYWORDS - ({"direction"} if call.func.attr == "entry" else set())
+        if unsupported:
+            raise ValueError(f"Unsupported order arguments {', '.join(sorted(unsupported))}: {line}")
+        if call.func.attr == "close":
+            if len(call.args) > 1:
+                raise ValueError(f"Unsupported order arguments: {line}")
+            return 0
+
+        direction = call.args[1] if len(call.args) > 1 else keywords.get("direction")
+        if len(call.args) > 2 or direction is None:
+            raise ValueError(f"strategy.entry needs exactly an id and a direction: {line}")
+        direction_name = ast.unparse(direction)
+        if direction_name == "strategy.long":
+            return 1
+        if direction_name == "strategy.short":
+            raise ValueError(f"Short entries are not supported (the simulation is long-only): {line}")
+        raise ValueError(f"Unsupported entry direction {direction_name}: {line}")
+
+    def run(self, code: str) -> Dict[str, Any]:
+        """
+        Evaluate a fixture strategy.
+
+        Args:
+            code: Pine Script source in the supported subset
+
+        Returns:
+            Dict with the raw "entry_signals" / "close_signals" bar indices and
+            the simulated "trades" as (entry_fill_bar, exit_fill_bar) pairs,
+            where an exit of -1 means the position is still open
+        """
+        variables: Dict[str, Any] = {}
+        # Each order is (bar mask, 1 for entry / 0 for close), in script order
+        orders = []
+        # Enclosing if statements as (indent, combined condition mask)
+        blocks = []
+
+        for raw_line in textwrap.dedent(code).strip().splitlines():
+            line = raw_line.split("//", 1)[0].strip()
+            if not line or line.startswith(("strategy(", "indicator(", "//@version")):
+                continue
+            indent = len(raw_line) - len(raw_line.lstrip())
+            while blocks and indent <= blocks[-1][0]:
+                blocks.pop()
+            mask = blocks[-1][1] if blocks else np.ones(self.size, dtype=bool)
+
+            if line.startswith(("if ", "if(")):
+                condition = np.broadcast_to(np.asarray(self.evaluate_expression(line[2:], variables), dtype=bool), mask.shape)
+                blocks.append((indent, mask & condition))
+                continue
+            if line.startswith("strategy."):
+                orders.append((mask, self._order_target(line)))
+                continue
+            if blocks:
+                raise ValueError(f"Unsupported statement inside an if block: {line}")
+            name, sep, expression = line.partition("=")
+            if not sep or not name.strip().isidentifier():
+                raise ValueError(f"Unsupported statement: {line}")
+            variables[name.strip()] = self.evaluate_expression(expression, variables)
+
+        entry_mask = np.zeros(self.size, dtype=bool)
+        close_mask = np.zeros(self.size, dtype=bool)
+        # Desired position per bar: NaN where no order fires, later orders overwrite earlier ones
+        desired = np.full(self.size, np.nan)
+        for mask, target in orders:
+            desired[mask] = target
+            (entry_mask if target else close_mask)[mask] |= True
+
+        return {
+            "entry_signals": np.flatnonzero(entry_mask),
+            "close_signals": np.flatnonzero(close_mask),
+            "trades": simulate_long_positions(desired),
+        }
+
+
+def simulate_long_positions(desired: np.ndarray) -> np.ndarray:
+    """
+    Turn per-bar order targets (1 = long, 0 = flat, NaN = no order) into trades.
+
+    Orders placed on bar i fill at the open of bar i + 1.
+
+    Returns:
+        Array of shape (n_trades, 2) with entry and exit fill bars; the exit is
+        -1 for a position still open on the last bar
+    """
+    size = desired.size
+    # Forward-fill the last order target; bars before the first order are flat
+    has_order = ~np.isnan(desired)
+    last_order = np.maximum.accumulate(np.where(has_order, np.arange(size), -1))
+    position = np.where(last_order >= 0, desired[np.maximum(last_order, 0)], 0.0)
+
+    # Position after bar i's orders is held from bar i + 1
+    held = np.concatenate(([0.0], position))[:size]
+    steps = np.diff(np.concatenate(([0.0], held, [0.0])))
+    entries = np.flatnonzero(steps > 0)
+    exits = np.flatnonzero(steps < 0)
+    exits = np.where(exits >= size, -1, exits)
+    return np.stack([entries, exits], axis=1) if entries.size else np.empty((0, 2), dtype=int)
+
+
+def expected_signals(code: str, history_path: str) -> Dict[str, Any]:
+    """Evaluate a fixture strategy on a history CSV and return JSON-friendly signals."""
+    history = load_history(history_path)
+    result = StrategyEvaluator(history).run(code)
+    return {
+        "bars": int(history["close"].size),
+        "entry_signals": result["entry_signals"].tolist(),
+        "close_signals": result["close_signals"].tolist(),
+        "trades": result["trades"].tolist(),
+    }
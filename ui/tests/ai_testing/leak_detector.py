@@ -0,0 +1,135 @@
+"""
+Browser memory and DOM leak detection for repeated scenario runs.
+
+LeakSampler reads the JS heap size, DOM node count, event-listener count and
+document count of a page through the Chrome DevTools Protocol after forcing
+garbage collection. analyze_samples fits a least-squares line through the
+per-iteration samples and flags metrics that grow steadily: a slope above the
+metric's threshold with a good linear fit (high r²), which separates real
+leaks from one-off allocations and GC noise. The first samples are left out of
+the fit as warm-up, since the first replays still load lazy chunks and fill
+caches.
+
+CDP is only available on Chromium.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# CDP Performance.getMetrics names mapped to result keys
+CDP_METRICS = {
+    "JSHeapUsedSize": "js_heap_bytes",
+    "Nodes": "dom_nodes",
+    "JSEventListeners": "event_listeners",
+    "Documents": "documents",
+}
+
+# Minimum growth per iteration that counts as a leak when the fit is steady
+DEFAULT_THRESHOLDS = {
+    "js_heap_bytes": 100 * 1024,
+    "dom_nodes": 10,
+    "event_listeners": 5,
+    "documents": 0.5,
+}
+
+MIN_R_SQUARED = 0.8
+MIN_SAMPLES = 4
+
+# Leading samples excluded from the fit
+DEFAULT_WARMUP = 1
+
+
+class LeakSampler:
+    """
+    Samples memory counters of a Playwright page through a CDP session.
+    """
+
+    def __init__(self, gc_passes: int = 2):
+        """
+        Args:
+            gc_passes: Number of forced garbage collections before each sample
+        """
+        self.gc_passes = gc_passes
+        self.session = None
+
+    async def attach(self, context, page):
+        """Open a CDP session for the page and enable the Performance domain."""
+        self.session = await context.new_cdp_session(page)
+        await self.session.send("Performance.enable")
+
+    async def detach(self):
+        """Close the CDP session."""
+        if self.session:
+            await self.session.detach()
+            self.session = None
+
+    async def sample(self) -> Dict[str, float]:
+        """Force GC and return the current counters."""
+        for _ in range(self.gc_passes):
+            await self.session.send("HeapProfiler.collectGarbage")
+        response = await self.session.send("Performance.getMetrics")
+        metrics = {item["name"]: item["value"] for item in response["metrics"]}
+        return {key: metrics.get(name) for name, key in CDP_METRICS.items()}
+
+
+def fit_slope(values: List[float]) -> Tuple[float, float]:
+    """
+    Least-squares fit of values against their index.
+
+    Returns:
+        Tuple of (slope per step, r²); r² is 0 when the values are constant
+    """
+    n = len(values)
+    if n < 2:
+        return 0.0, 0.0
+    mean_x = (n - 1) / 2.0
+    mean_y = sum(values) / n
+    sxx = sum((x - mean_x) ** 2 for x in range(n))
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    syy = sum((y - mean_y) ** 2 for y in values)
+    slope = sxy / sxx
+    r_squared = (sxy * sxy) / (sxx * syy) if syy else 0.0
+    return slope, r_squared
+
+
+def analyze_samples(
+    samples: List[Dict[str, float]],
+    thresholds: Optional[Dict[str, float]] = None,
+    min_r_squared: float = MIN_R_SQUARED,
+    warmup: int = DEFAULT_WARMUP
+) -> Dict[str, Any]:
+    """
+    Fit growth slopes for each counter and flag steady growth.
+
+    Args:
+        samples: One dict of counters per iteration, in order
+        thresholds: Per-metric minimum slope that counts as a leak
+        min_r_squared: Minimum linear fit quality for growth to count as steady
+        warmup: Number of leading samples left out of the fit
+
+    Returns:
+        Dict with per-metric slope, r², growth over the fitted samples and leak
+        flag, plus an overall "leak_suspected"
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    metrics = {}
+    for key, threshold in thresholds.items():
+        values = [s[key] for s in samples[warmup:] if s.get(key) is not None]
+        if len(values) < 2:
+            continue
+        slope, r_squared = fit_slope(values)
+        metrics[key] = {
+            "first": values[0],
+            "last": values[-1],
+            "total_growth": values[-1] - values[0],
+            "slope_per_iteration": round(slope, 2),
+            "r_squared": round(r_squared, 3),
+            "threshold": threshold,
+            "leak": len(values) >= MIN_SAMPLES and slope > threshold and r_squared >= min_r_squared,
+        }
+    return {
+        "iterations": len(samples),
+        "warmup": warmup,
+        "samples": samples,
+        "metrics": metrics,
+        "leak_suspected": any(m["leak"] for m in metrics.values()),
+    }
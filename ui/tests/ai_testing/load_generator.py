@@ -0,0 +1,547 @@
+#!/usr/bin/env python
+"""
+Asyncio load generator for the UI pages and API routes.
+
+This module drives the same routes the AI tests touch (/analyze, /strategies,
+/templates and POST /api/uploads/log) with either a closed-loop workload
+(a fixed number of workers, each waiting for its response before sending the
+next request) or an open-loop workload (requests scheduled at a fixed arrival
+rate regardless of how fast the server answers). Latencies are recorded in an
+HDR-style log-linear histogram and reported as percentiles per route.
+
+It only uses the standard library and runs fully locally against the Next.js
+dev server or ui/test-python-server.py.
+
+Usage:
+    python -m ui.tests.ai_testing.load_generator --url http://localhost:3001 --duration 30
+    python -m ui.tests.ai_testing.load_generator --mode open --rate 500 --mix analyze=1,upload-log=3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Values below 2**sub_bucket_bits are
+    stored exactly; above that every power-of-two range is split into
+    2**(sub_bucket_bits - 1) linear buckets, which bounds the relative error
+    at about 2 / 2**sub_bucket_bits (0.1% with the default of 11 bits) while
+    keeping memory proportional to the number of distinct buckets hit.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 11):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value: Optional[int] = None
+        self.max_value = 0
+        self.sum_value = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return shift * self.half_count + (value >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.half_count - 1
+        sub_bucket = index - shift * self.half_count
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value_us: int):
+        """Record a single latency in microseconds."""
+        value = max(int(value_us), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_count += 1
+        self.sum_value += value
+        self.max_value = max(self.max_value, value)
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts into this one."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.sum_value += other.sum_value
+        self.max_value = max(self.max_value, other.max_value)
+        if other.min_value is not None and (self.min_value is None or other.min_value < self.min_value):
+            self.min_value = other.min_value
+
+    def percentile(self, percentile: float) -> int:
+        """Return the value at the given percentile (0-100) in microseconds."""
+        if not self.total_count:
+            return 0
+        target = max(1, int(round(percentile / 100.0 * self.total_count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_value)
+        return self.max_value
+
+    def summary(self, percentiles: Tuple[float, ...] = (50, 90, 99, 99.9)) -> Dict[str, Any]:
+        """Summarise the histogram in milliseconds."""
+        result = {
+            "count": self.total_count,
+            "min_ms": (self.min_value or 0) / 1000.0,
+            "mean_ms": (self.sum_value / self.total_count / 1000.0) if self.total_count else 0.0,
+            "max_ms": self.max_value / 1000.0,
+        }
+        for p in percentiles:
+            result[f"p{p:g}_ms"] = self.percentile(p) / 1000.0
+        return result
+
+
+def build_upload_log_payload(rng: random.Random) -> Dict[str, Any]:
+    """
+    Build a request body matching the UploadLogRequest interface in
+    src/app/api/uploads/log/route.ts.
+    """
+    upload_type = rng.choice(["trade_results", "historical_data", "strategy_code"])
+    extension, file_type = {
+        "trade_results": ("csv", "text/csv"),
+        "historical_data": ("csv", "text/csv"),
+        "strategy_code": ("pine", "text/plain"),
+    }[upload_type]
+    return {
+        "fileName": f"{upload_type}_{rng.randrange(1_000_000):06d}.{extension}",
+        "fileSize": rng.randint(1_024, 50 * 1024 * 1024),
+        "fileType": file_type,
+        "userId": f"loadtest-{rng.randrange(100)}",
+        "uploadType": upload_type,
+        "metadata": {"source": "load_generator", "rows": rng.randint(10, 1_000_000)},
+    }
+
+
+@dataclass
+class RequestSpec:
+    """A single entry in the request mix."""
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    body_factory: Optional[Callable[[random.Random], Dict[str, Any]]] = None
+
+
+# Routes exercised by the AI test scenarios
+DEFAULT_REQUESTS = {
+    "analyze": RequestSpec("analyze", "GET", "/analyze"),
+    "strategies": RequestSpec("strategies", "GET", "/strategies"),
+    "templates": RequestSpec("templates", "GET", "/templates"),
+    "upload-log": RequestSpec("upload-log", "POST", "/api/uploads/log", body_factory=build_upload_log_payload),
+    "health": RequestSpec("health", "GET", "/health"),
+}
+
+DEFAULT_MIX = "analyze=1,strategies=1,templates=1,upload-log=2"
+
+# Default mix per target; ui/test-python-server.py only answers GET
+TARGET_MIXES = {
+    "next": DEFAULT_MIX,
+    "test-server": "analyze=1,strategies=1,templates=1,health=1",
+}
+
+
+def parse_mix(mix: str) -> List[RequestSpec]:
+    """
+    Parse a request mix such as "analyze=1,upload-log=3".
+
+    Entries that are not predefined names are treated as GET paths, so
+    "/test=2" adds GET /test with weight 2.
+    """
+    specs = []
+    for entry in mix.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, weight = entry.partition("=")
+        weight_value = float(weight) if weight else 1.0
+        if name in DEFAULT_REQUESTS:
+            base = DEFAULT_REQUESTS[name]
+            specs.append(RequestSpec(base.name, base.method, base.path, weight_value, base.body_factory))
+        elif name.startswith("/"):
+            specs.append(RequestSpec(name, "GET", name, weight_value))
+        else:
+            raise ValueError(f"Unknown request '{name}'. Available: {', '.join(DEFAULT_REQUESTS)} or a /path")
+    if not specs:
+        raise ValueError("Request mix is empty")
+    return specs
+
+
+class HttpConnection:
+    """A minimal keep-alive HTTP/1.1 client connection on asyncio streams."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Requests resent after the server had closed an idle keep-alive connection
+        self.reconnects = 0
+
+    async def _ensure_open(self):
+        if self.writer is None or self.writer.is_closing():
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, int]:
+        """
+        Send a request and read the full response.
+
+        A request on a reused connection that fails before any response byte
+        arrives (the server closed the idle connection) is sent once more on a
+        new connection.
+
+        Returns:
+            Tuple of (status code, response body size in bytes)
+        """
+        reused = self.writer is not None and not self.writer.is_closing()
+        await self._ensure_open()
+        try:
+            status_line = await self._send(method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+            self.close()
+            self.reconnects += 1
+            await self._ensure_open()
+            status_line = await self._send(method, path, body)
+        return await self._read_response(method, status_line)
+
+    async def _send(self, method: str, path: str, body: Optional[bytes]) -> bytes:
+        """Write the request and return the response status line."""
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "User-Agent: pinescript-mcp-load-generator",
+            "Accept: */*",
+            "Connection: keep-alive",
+        ]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+            lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        return status_line
+
+    async def _read_response(self, method: str, status_line: bytes) -> Tuple[int, int]:
+        """Read headers and body after the status line."""
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        size = 0
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b";", 1)[0], 16)
+                if chunk_size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+        elif "content-length" in headers:
+            size = int(headers["content-length"])
+            await self.reader.readexactly(size)
+        else:
+            # Body delimited by connection close
+            size = len(await self.reader.read())
+            self.close()
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, size
+
+
+@dataclass
+class RouteStats:
+    """Per-route counters and latency histogram."""
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status_counts: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    reconnects: int = 0
+    bytes_received: int = 0
+
+
+class LoadGenerator:
+    """
+    Generates HTTP load against a base URL with a weighted request mix.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:3001",
+        requests: Optional[List[RequestSpec]] = None,
+        concurrency: int = 16,
+        seed: int = 42,
+        timeout_s: float = 30.0
+    ):
+        """
+        Initialize the load generator.
+
+        Args:
+            base_url: Base URL of the application under load
+            requests: Weighted request mix (defaults to DEFAULT_MIX)
+            concurrency: Number of connections (and closed-loop workers)
+            seed: Seed for the request mix and payload randomness
+            timeout_s: Per-request timeout in seconds
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only plain http:// targets are supported")
+        self.base_url = base_url.rstrip("/")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self.requests = requests or parse_mix(DEFAULT_MIX)
+        self.concurrency = concurrency
+        self.timeout_s = timeout_s
+        self.rng = random.Random(seed)
+        self._weights = [spec.weight for spec in self.requests]
+        self.stats: Dict[str, RouteStats] = {spec.name: RouteStats() for spec in self.requests}
+        self._pool: Optional[asyncio.Queue] = None
+
+    def _pick(self) -> Tuple[RequestSpec, Optional[bytes]]:
+        spec = self.rng.choices(self.requests, weights=self._weights)[0]
+        body = None
+        if spec.body_factory is not None:
+            body = json.dumps(spec.body_factory(self.rng)).encode("utf8")
+        return spec, body
+
+    async def _issue(self, spec: RequestSpec, body: Optional[bytes], scheduled_at: float):
+        """Send one request on a pooled connection and record its latency."""
+        connection = await self._pool.get()
+        stats = self.stats[spec.name]
+        reconnects = connection.reconnects
+        try:
+            status, size = await asyncio.wait_for(
+                connection.request(spec.method, self.base_path + spec.path, body),
+                timeout=self.timeout_s
+            )
+            stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+            stats.bytes_received += size
+            if status >= 400:
+                stats.errors += 1
+        except (asyncio.TimeoutError, OSError, ValueError, asyncio.IncompleteReadError):
+            connection.close()
+            stats.errors += 1
+        finally:
+            stats.reconnects += connection.reconnects - reconnects
+            self._pool.put_nowait(connection)
+        # Measured from the scheduled time so queueing delay is not hidden
+        stats.histogram.record((time.perf_counter() - scheduled_at) * 1_000_000)
+
+    def _reset_pool(self):
+        self._pool = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self._pool.put_nowait(HttpConnection(self.host, self.port))
+
+    def _close_pool(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    async def run_closed_loop(self, duration_s: float, think_time_s: float = 0.0) -> Dict[str, Any]:
+        """
+        Run a closed-loop workload: each worker waits for its response
+        (and an optional think time) before sending the next request.
+        """
+        self._reset_pool()
+        deadline = time.perf_counter() + duration_s
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                spec, body = self._pick()
+                await self._issue(spec, body, time.perf_counter())
+                if think_time_s:
+                    await asyncio.sleep(think_time_s)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - started
+        self._close_pool()
+        return self.report("closed", elapsed)
+
+    async def run_open_loop(self, duration_s: float, rate: float, poisson: bool = True) -> Dict[str, Any]:
+        """
+        Run an open-loop workload: requests arrive at `rate` per second
+        whether or not earlier requests have completed. Latency includes
+        time spent waiting for a free connection, which avoids the
+        coordinated-omission bias of closed-loop measurements.
+        """
+        self._reset_pool()
+        started = time.perf_counter()
+        next_at = started
+        tasks = set()
+
+        while next_at < started + duration_s:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            spec, body = self._pick()
+            task = asyncio.ensure_future(self._issue(spec, body, next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_at += self.rng.expovariate(rate) if poisson else 1.0 / rate
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        self._close_pool()
+        return self.report("open", elapsed, target_rate=rate)
+
+    def report(self, mode: str, elapsed_s: float, target_rate: Optional[float] = None) -> Dict[str, Any]:
+        """Build the results dictionary for a finished run."""
+        overall = LatencyHistogram()
+        routes = {}
+        total_errors = 0
+        for name, stats in self.stats.items():
+            overall.merge(stats.histogram)
+            total_errors += stats.errors
+            routes[name] = {
+                **stats.histogram.summary(),
+                "errors": stats.errors,
+                "reconnects": stats.reconnects,
+                "status_counts": {str(k): v for k, v in sorted(stats.status_counts.items())},
+                "bytes_received": stats.bytes_received,
+                "throughput_rps": stats.histogram.total_count / elapsed_s if elapsed_s else 0.0,
+            }
+        return {
+            "base_url": self.base_url,
+            "mode": mode,
+            "concurrency": self.concurrency,
+            "target_rate_rps": target_rate,
+            "duration_s": elapsed_s,
+            "timestamp": datetime.now().isoformat(),
+            "overall": {
+                **overall.summary(),
+                "errors": total_errors,
+                "throughput_rps": overall.total_count / elapsed_s if elapsed_s else 0.0,
+            },
+            "routes": routes,
+        }
+
+
+async def detect_target(base_url: str, timeout_s: float = 5.0) -> str:
+    """
+    Guess which server runs at base_url.
+
+    ui/test-python-server.py answers GET /health; the Next.js app has no such
+    route.
+
+    Returns:
+        "test-server" or "next"
+    """
+    parts = urlsplit(base_url)
+    connection = HttpConnection(parts.hostname or "localhost", parts.port or 80)
+    try:
+        status, _ = await asyncio.wait_for(
+            connection.request("GET", parts.path.rstrip("/") + "/health"), timeout=timeout_s
+        )
+    except (asyncio.TimeoutError, OSError, ValueError, asyncio.IncompleteReadError):
+        return "next"
+    finally:
+        connection.close()
+    return "test-server" if status == 200 else "next"
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a run report as a plain-text table."""
+    print(f"\n===== Load test: {report['mode']} loop against {report['base_url']} =====")
+    print(f"Duration: {report['duration_s']:.1f}s, concurrency: {report['concurrency']}"
+          + (f", target rate: {report['target_rate_rps']:g} req/s" if report["target_rate_rps"] else ""))
+    header = f"{'route':<14}{'count':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'p99.9':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["routes"].items()) + [("TOTAL", report["overall"])]
+    for name, r in rows:
+        print(f"{name:<14}{r['count']:>8}{r['errors']:>6}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p90_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['p99.9_ms']:>9.2f}{r['max_ms']:>9.2f}")
+    print("(latencies in ms)")
+
+
+def main():
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="Generate HTTP load against the UI pages and API routes")
+    parser.add_argument("--url", default="http://localhost:3001", help="Base URL (default: http://localhost:3001)")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed", help="Workload model (default: closed)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections / closed-loop workers (default: 16)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run time in seconds (default: 30)")
+    parser.add_argument("--rate", type=float, default=100.0, help="Open-loop arrival rate in req/s (default: 100)")
+    parser.add_argument("--uniform", action="store_true", help="Use uniform instead of Poisson arrivals in open loop")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Closed-loop pause between requests in seconds")
+    parser.add_argument("--target", choices=["auto", *TARGET_MIXES], default="auto",
+                        help="Server type that selects the default mix; auto probes GET /health (default: auto)")
+    parser.add_argument("--mix", help=f"Weighted request mix (default: {DEFAULT_MIX}, or "
+                                      f"{TARGET_MIXES['test-server']} for test-server)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+
+    args = parser.parse_args()
+
+    mix = args.mix
+    if mix is None:
+        target = args.target if args.target != "auto" else asyncio.run(detect_target(args.url))
+        mix = TARGET_MIXES[target]
+        print(f"Target: {target}, request mix: {mix}")
+
+    try:
+        generator = LoadGenerator(
+            base_url=args.url,
+            requests=parse_mix(mix),
+            concurrency=args.concurrency,
+            seed=args.seed
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.mode == "open":
+        report = asyncio.run(generator.run_open_loop(args.duration, args.rate, poisson=not args.uniform))
+    else:
+        report = asyncio.run(generator.run_closed_loop(args.duration, args.think_time))
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to {args.output}")
+
+    sys.exit(0 if report["overall"]["errors"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Vectorized backtest metrics oracle.
+
+Computes the numbers shown by BacktestResultsVisualization (net profit,
+profit factor, win rate, max drawdown, Sharpe/Sortino, recovery factor and
+trade counts) directly from an uploaded trades.csv, and buy-and-hold figures
+from history.csv, so scenarios can check the displayed values instead of
+only checking that the page rendered.
+
+Every metric is a single NumPy pass over the closed trades, so files with
+millions of rows are dominated by CSV parsing time.
+
+Conventions:
+    - A trade is closed by each SELL row; its profit_loss is the realised P&L.
+    - The equity curve starts at `initial_capital` and adds each closed P&L.
+    - Sharpe and Sortino use day-over-day returns of the end-of-day equity on
+      days that close at least one trade, annualised with sqrt(252).
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+TRADES_DTYPE = [
+    ("date", "U19"),
+    ("side", "U4"),
+    ("quantity", "f8"),
+    ("price", "f8"),
+    ("profit_loss", "f8"),
+]
+
+# Labels rendered by BacktestResultsVisualization mapped to metric keys
+PAGE_LABELS = {
+    "Net Profit": "netProfit",
+    "Profit Factor": "profitFactor",
+    "Win Rate": "winRate",
+    "Max Drawdown": "maxDrawdown",
+    "Sharpe Ratio": "sharpeRatio",
+    "Sortino Ratio": "sortinoRatio",
+    "Recovery Factor": "recoveryFactor",
+    "Total Trades": "totalTrades",
+    "Winning Trades": "winningTrades",
+    "Losing Trades": "losingTrades",
+    "Average Trade": "averageTrade",
+}
+
+# Allowed absolute difference per metric, matching the page's display precision
+DEFAULT_TOLERANCES = {
+    "netProfit": 0.01,
+    "profitFactor": 0.01,
+    "winRate": 0.1,
+    "maxDrawdown": 0.01,
+    "sharpeRatio": 0.01,
+    "sortinoRatio": 0.01,
+    "recoveryFactor": 0.01,
+    "totalTrades": 0,
+    "winningTrades": 0,
+    "losingTrades": 0,
+    "averageTrade": 0.01,
+}
+
+# Metrics the page shows as a signed value (drawdown as "-7.43%") although the
+# metric itself is a magnitude; only these are compared unsigned
+MAGNITUDE_METRICS = {"maxDrawdown"}
+
+# Reads each "Label:" span and the value span next to it
+SCRAPE_METRICS_JS = """
+() => {
+    const values = {};
+    for (const label of document.querySelectorAll('span')) {
+        const text = label.textContent.trim();
+        if (!text.endsWith(':') || !label.nextElementSibling) continue;
+        values[text.slice(0, -1)] = label.nextElementSibling.textContent.trim();
+    }
+    return values;
+}
+"""
+
+
+def load_trades(path: str) -> np.ndarray:
+    """Load a trades CSV (date,symbol,side,quantity,price,profit_loss) into a structured array."""
+    return np.loadtxt(path, delimiter=",", skiprows=1, usecols=(0, 2, 3, 4, 5), dtype=TRADES_DTYPE, ndmin=1)
+
+
+def load_closes(path: str) -> np.ndarray:
+    """Load the close column of a history CSV (date,open,high,low,close,volume)."""
+    return np.loadtxt(path, delimiter=",", skiprows=1, usecols=(4,), dtype="f8", ndmin=1)
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return float(numerator / denominator) if denominator else None
+
+
+def compute_trade_metrics(
+    trades: np.ndarray,
+    initial_capital: float = 10000.0,
+    periods_per_year: int = 252
+) -> Dict[str, Any]:
+    """
+    Compute backtest metrics from a structured trades array.
+
+    Args:
+        trades: Array as returned by load_trades
+        initial_capital: Starting equity for drawdown and return calculations
+        periods_per_year: Annualisation factor for Sharpe and Sortino
+
+    Returns:
+        Dict keyed like the BacktestResultsVisualization data object
+    """
+    closed = trades[trades["side"] == "SELL"]
+    pnl = closed["profit_loss"]
+    total = int(pnl.size)
+
+    wins = pnl > 0
+    losses = pnl < 0
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(np.abs(pnl[losses]).sum())
+    net_profit = float(pnl.sum())
+
+    equity = initial_capital + np.cumsum(pnl)
+    curve = np.concatenate(([initial_capital], equity))
+    peaks = np.maximum.accumulate(curve)
+    drawdowns = peaks - curve
+    max_drawdown_pct = float((drawdowns / peaks).max() * 100.0) if total else 0.0
+    max_drawdown_abs = float(drawdowns.max()) if total else 0.0
+
+    sharpe = sortino = None
+    if total:
+        # Rows are chronological, so the last row of each day is a run boundary
+        days = closed["date"].astype("U10")
+        day_ends = np.append(np.flatnonzero(days[1:] != days[:-1]), total - 1)
+        daily_equity = np.concatenate(([initial_capital], equity[day_ends]))
+        returns = np.diff(daily_equity) / daily_equity[:-1]
+        if returns.size > 1:
+            scale = np.sqrt(periods_per_year)
+            std = returns.std(ddof=1)
+            downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+            sharpe = float(returns.mean() / std * scale) if std else None
+            sortino = float(returns.mean() / downside * scale) if downside else None
+
+    return {
+        "netProfit": net_profit,
+        "profitFactor": _ratio(gross_profit, gross_loss),
+        "winRate": 100.0 * int(wins.sum()) / total if total else 0.0,
+        "maxDrawdown": max_drawdown_pct,
+        "sharpeRatio": sharpe,
+        "sortinoRatio": sortino,
+        "recoveryFactor": _ratio(net_profit, max_drawdown_abs),
+        "averageTrade": net_profit / total if total else 0.0,
+        "totalTrades": total,
+        "winningTrades": int(wins.sum()),
+        "losingTrades": int(losses.sum()),
+        "grossProfit": gross_profit,
+        "grossLoss": gross_loss,
+        "finalEquity": float(curve[-1]),
+    }
+
+
+def compute_history_metrics(closes: np.ndarray, periods_per_year: int = 252) -> Dict[str, Any]:
+    """
+    Compute buy-and-hold reference figures from a close price series.
+
+    Returns:
+        Dict with bar count, buy-and-hold return, max drawdown and Sharpe
+    """
+    if closes.size < 2:
+        return {"bars": int(closes.size), "buyHoldReturn": 0.0, "maxDrawdown": 0.0, "sharpeRatio": None}
+    returns = np.diff(closes) / closes[:-1]
+    peaks = np.maximum.accumulate(closes)
+    std = returns.std(ddof=1) if returns.size > 1 else 0.0
+    return {
+        "bars": int(closes.size),
+        "buyHoldReturn": float((closes[-1] / closes[0] - 1.0) * 100.0),
+        "maxDrawdown": float(((peaks - closes) / peaks).max() * 100.0),
+        "sharpeRatio": float(returns.mean() / std * np.sqrt(periods_per_year)) if std else None,
+    }
+
+
+def compute_backtest_metrics(
+    trades_path: str,
+    history_path: Optional[str] = None,
+    initial_capital: float = 10000.0
+) -> Dict[str, Any]:
+    """
+    Compute expected metrics for an uploaded trades file and optional history file.
+
+    Returns:
+        Trade metrics, plus a "history" entry when history_path is given
+    """
+    metrics = compute_trade_metrics(load_trades(trades_path), initial_capital=initial_capital)
+    if history_path:
+        metrics["history"] = compute_history_metrics(load_closes(history_path))
+    return metrics
+
+
+def parse_displayed_number(text: str) -> Optional[float]:
+    """
+    Parse a displayed value such as "$3,876.24", "-7.43%" or "40 (67.8%)".
+
+    Parenthesised suffixes are ignored. The sign is kept, including for
+    "-$12.50" and a Unicode minus; see MAGNITUDE_METRICS for drawdown.
+    """
+    value = text.split("(", 1)[0].replace("\u2212", "-")
+    value = value.replace("$", "").replace(",", "").replace("%", "").replace(" ", "").strip()
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+async def scrape_backtest_metrics(page) -> Dict[str, float]:
+    """Read the metric values currently rendered on the backtest results page."""
+    raw = await page.evaluate(SCRAPE_METRICS_JS)
+    metrics = {}
+    for label, key in PAGE_LABELS.items():
+        if label in raw:
+            value = parse_displayed_number(raw[label])
+            if value is not None:
+                metrics[key] = value
+    return metrics
+
+
+def compare_metrics(
+    expected: Dict[str, Any],
+    actual: Dict[str, float],
+    tolerances: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Compare oracle metrics with displayed metrics.
+
+    Only keys present in both dicts and in the tolerance table are compared.
+
+    Returns:
+        Dict with "matches", the per-metric comparison and the mismatches
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    compared = {}
+    mismatches = []
+    for key, tolerance in tolerances.items():
+        if key not in actual or key not in expected or expected[key] is None:
+            continue
+        expected_value = float(expected[key])
+        actual_value = actual[key]
+        if key in MAGNITUDE_METRICS:
+            expected_value, actual_value = abs(expected_value), abs(actual_value)
+        difference = abs(expected_value - actual_value)
+        ok = difference <= tolerance + 1e-9
+        compared[key] = {"expected": round(expected_value, 4), "actual": actual_value, "ok": ok}
+        if not ok:
+            mismatches.append(key)
+    return {"matches": not mismatches and bool(compared), "compared": compared, "mismatches": mismatches}
+
+
+async def verify_backtest_page(
+    page,
+    trades_path: str,
+    history_path: Optional[str] = None,
+    initial_capital: float = 10000.0,
+    tolerances: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """Scrape the backtest page and compare it with the oracle's metrics."""
+    expected = compute_backtest_metrics(trades_path, history_path, initial_capital)
+    actual = await scrape_backtest_metrics(page)
+    return compare_metrics(expected, actual, tolerances)
+
+
+async def assert_backtest_metrics_match(page, trades_path: str, history_path: Optional[str] = None, **kwargs):
+    """Pytest helper: fail with a readable diff when the page disagrees with the oracle."""
+    result = await verify_backtest_page(page, trades_path, history_path, **kwargs)
+    details = ", ".join(
+        f"{key}: expected {result['compared'][key]['expected']}, displayed {result['compared'][key]['actual']}"
+        for key in result["mismatches"]
+    )
+    assert result["compared"], "No backtest metrics found on the page"
+    assert result["matches"], f"Backtest metrics differ from trades data: {details}"
+    return result
@@ -0,0 +1,155 @@
+"""
+Cost- and latency-aware model routing for AI test scenarios.
+
+Most scenarios are simple enough for a small, fast model. ModelRouter starts
+each scenario on the small model and escalates to the large model only after a
+failure or timeout. Scenarios tagged as hard, or whose recent pass rate on the
+small model is too low, start on the large model directly. Every attempt is
+appended to a JSONL history, which is also what the pass rates are computed
+from.
+"""
+
+import json
+import os
+import statistics
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_SMALL_MODEL = "gpt-4o-mini"
+DEFAULT_LARGE_MODEL = "gpt-4o"
+
+# Scenarios with any of these tags always start on the large model
+DEFAULT_LARGE_TAGS = {"complex", "critical"}
+
+# Failure kinds reported by the agent that escalate and count against a model
+MODEL_FAILURE_KINDS = {"assistant", "timeout"}
+
+
+class ModelRouter:
+    """
+    Chooses the model sequence for a scenario and records each attempt.
+    """
+
+    def __init__(
+        self,
+        small_model: str = DEFAULT_SMALL_MODEL,
+        large_model: str = DEFAULT_LARGE_MODEL,
+        history_path: Optional[str] = "test_results/model_routing.jsonl",
+        large_tags: Optional[Iterable[str]] = None,
+        min_pass_rate: float = 0.8,
+        min_runs: int = 3,
+        window: int = 20,
+        probe_every: int = 10
+    ):
+        """
+        Args:
+            small_model: Model tried first
+            large_model: Model used for escalation and for hard scenarios
+            history_path: JSONL file of past attempts (None keeps history in memory only)
+            large_tags: Tags that route a scenario straight to the large model
+            min_pass_rate: Small-model pass rate below which a scenario starts on the large model
+            min_runs: Number of small-model runs needed before the pass rate is trusted
+            window: Number of most recent attempts per scenario and model considered
+            probe_every: Retry the small model after this many consecutive large-model
+                runs of a low-pass-rate scenario, so its pass rate can recover
+        """
+        self.small_model = small_model
+        self.large_model = large_model
+        self.history_path = history_path
+        self.large_tags = set(DEFAULT_LARGE_TAGS if large_tags is None else large_tags)
+        self.min_pass_rate = min_pass_rate
+        self.min_runs = min_runs
+        self.window = window
+        self.probe_every = probe_every
+        self._history = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not self.history_path or not os.path.exists(self.history_path):
+            return []
+        with open(self.history_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _attempts(self, scenario: str, model: str) -> List[Dict[str, Any]]:
+        attempts = [a for a in self._history if a["scenario"] == scenario and a["model"] == model]
+        return attempts[-self.window:]
+
+    def pass_rate(self, scenario: str, model: str) -> Optional[float]:
+        """Return the recent pass rate of a scenario on a model, or None without enough runs."""
+        attempts = self._attempts(scenario, model)
+        if len(attempts) < self.min_runs:
+            return None
+        return sum(1 for a in attempts if a["success"]) / len(attempts)
+
+    def _due_for_probe(self, scenario: str) -> bool:
+        since_small = 0
+        for attempt in reversed(self._history):
+            if attempt["scenario"] != scenario:
+                continue
+            if attempt["model"] == self.small_model:
+                break
+            since_small += 1
+        return since_small >= self.probe_every
+
+    def route(self, scenario: str, tags: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Choose the models to try for a scenario, in order.
+
+        Returns:
+            Dict with "models" (escalation order) and the "reason" for the choice
+        """
+        matched = self.large_tags.intersection(tags or [])
+        if matched:
+            return {"models": [self.large_model], "reason": f"tagged {', '.join(sorted(matched))}"}
+        if self.small_model == self.large_model:
+            return {"models": [self.large_model], "reason": "single model"}
+
+        rate = self.pass_rate(scenario, self.small_model)
+        if rate is not None and rate < self.min_pass_rate:
+            if self._due_for_probe(scenario):
+                return {"models": [self.small_model, self.large_model], "reason": f"probing {self.small_model}"}
+            return {
+                "models": [self.large_model],
+                "reason": f"{self.small_model} pass rate {rate:.0%} below {self.min_pass_rate:.0%}",
+            }
+        return {"models": [self.small_model, self.large_model], "reason": "default"}
+
+    def record(self, scenario: str, model: str, success: bool, duration_s: float, timed_out: bool = False):
+        """Append an attempt to the history."""
+        attempt = {
+            "timestamp": datetime.now().isoformat(),
+            "scenario": scenario,
+            "model": model,
+            "success": success,
+            "timed_out": timed_out,
+            "duration_s": round(duration_s, 2),
+        }
+        self._history.append(attempt)
+        if self.history_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.history_path)), exist_ok=True)
+            with open(self.history_path, "a") as f:
+                f.write(json.dumps(attempt) + "\n")
+
+    def record_result(self, scenario: str, model: str, result: Dict[str, Any], duration_s: float) -> bool:
+        """
+        Record an attempt from a test result and return whether the model failed it.
+
+        Only assistant failures and timeouts count against the model. A run
+        that failed solely on a performance budget is recorded as a pass, since
+        a different model would not make the page faster.
+        """
+        failure_kind = result.get("failure_kind", "assistant")
+        model_failed = not result["success"] and failure_kind in MODEL_FAILURE_KINDS
+        self.record(scenario, model, not model_failed, duration_s, failure_kind == "timeout")
+        return model_failed
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model attempt count, pass rate and median latency over the whole history."""
+        summary = {}
+        for model in sorted({a["model"] for a in self._history}):
+            attempts = [a for a in self._history if a["model"] == model]
+            summary[model] = {
+                "attempts": len(attempts),
+                "pass_rate": round(sum(1 for a in attempts if a["success"]) / len(attempts), 3),
+                "median_duration_s": statistics.median(a["duration_s"] for a in attempts),
+            }
+        return summary
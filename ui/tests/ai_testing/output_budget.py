@@ -0,0 +1,182 @@
+"""
+Token-budgeted, compact tool outputs for the test assistant.
+
+Tool results are sent back to the model on every turn, so their size drives
+both latency and cost. OutputCompactor shrinks each result before it is
+submitted:
+
+    - fields that only echo the call's arguments are dropped
+    - long page text is cut to an excerpt centred on the searched text
+    - any remaining long strings are truncated to the tool's byte budget
+    - truncation is reported in the output so the model knows text is missing
+
+It also tracks how many bytes and tokens were saved compared with sending
+json.dumps(result) as-is. Token counts use tiktoken when it is installed and
+fall back to an estimate of four bytes per token.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Maximum serialized size in bytes per tool; "default" covers the rest
+DEFAULT_OUTPUT_BUDGETS = {
+    "default": 600,
+    "check_element_contains_text": 400,
+    # Mutating tools carry a dom_delta summary
+    "click_element": 1000,
+    "fill_input": 800,
+    "select_option": 800,
+    "upload_file": 800,
+    "navigate_to_url": 800,
+    "verify_backtest_metrics": 1500,
+}
+
+# Excerpt length when the searched text was found; the model only needs context
+MATCH_EXCERPT_CHARS = 160
+
+ELLIPSIS = "…"
+
+
+def excerpt_around(text: str, needle: str, max_chars: int) -> str:
+    """
+    Return at most max_chars of text, centred on the first occurrence of needle.
+
+    Falls back to a case-insensitive search, then to the start of the text.
+    Ellipses mark the cut ends.
+    """
+    if len(text) <= max_chars:
+        return text
+    index = text.find(needle) if needle else -1
+    if index < 0 and needle:
+        index = text.lower().find(needle.lower())
+    if index < 0:
+        return text[:max_chars - 1] + ELLIPSIS
+
+    start = max(0, index + len(needle) // 2 - max_chars // 2)
+    end = min(len(text), start + max_chars)
+    start = max(0, end - max_chars)
+    snippet = text[start:end]
+    if start > 0:
+        snippet = ELLIPSIS + snippet[1:]
+    if end < len(text):
+        snippet = snippet[:-1] + ELLIPSIS
+    return snippet
+
+
+class OutputCompactor:
+    """
+    Compacts tool results to per-tool budgets and accounts for the savings.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, model: str = "gpt-4o"):
+        """
+        Args:
+            budgets: Per-tool byte budgets merged over DEFAULT_OUTPUT_BUDGETS
+            model: Model name used to pick the tiktoken encoding
+        """
+        self.budgets = {**DEFAULT_OUTPUT_BUDGETS, **(budgets or {})}
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        self.stats = {
+            "calls": 0,
+            "truncated_calls": 0,
+            "raw_bytes": 0,
+            "sent_bytes": 0,
+            "raw_tokens": 0,
+            "sent_tokens": 0,
+        }
+
+    def count_tokens(self, text: str) -> int:
+        """Count (or estimate) the tokens in a string."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text.encode("utf8")) + 3) // 4
+
+    def _compact_result(self, name: str, args: Dict[str, Any], result: Dict[str, Any], budget: int):
+        """Drop echoed arguments and excerpt long page text; returns (compact result, truncated)."""
+        # Drop values the model already has from its own call
+        compact = {key: value for key, value in result.items() if not (key in args and args[key] == value)}
+        truncated = False
+
+        if name == "check_element_contains_text" and isinstance(compact.get("actual_text"), str):
+            text = compact.pop("actual_text")
+            limit = MATCH_EXCERPT_CHARS if compact.get("contains_text") else budget // 2
+            snippet = excerpt_around(text, args.get("text", ""), limit)
+            compact["excerpt"] = snippet
+            if len(snippet) < len(text):
+                compact["text_length"] = len(text)
+                compact["truncated"] = truncated = True
+        return compact, truncated
+
+    def _truncate_strings(self, value: Any, limit: int):
+        """Cut every string longer than limit; returns (value, truncated)."""
+        if isinstance(value, str) and len(value) > limit:
+            return value[:limit - 1] + ELLIPSIS, True
+        if isinstance(value, dict):
+            truncated = False
+            out = {}
+            for key, item in value.items():
+                out[key], was_truncated = self._truncate_strings(item, limit)
+                truncated = truncated or was_truncated
+            return out, truncated
+        if isinstance(value, list):
+            truncated = False
+            out = []
+            for item in value:
+                item, was_truncated = self._truncate_strings(item, limit)
+                out.append(item)
+                truncated = truncated or was_truncated
+            return out, truncated
+        return value, False
+
+    def compact(self, name: str, args: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """
+        Serialize a tool result within the tool's budget.
+
+        Returns:
+            The JSON string to submit as the tool output
+        """
+        raw = json.dumps(result)
+        budget = self.budgets.get(name, self.budgets["default"])
+
+        compact, excerpted = self._compact_result(name, args, result, budget)
+        output = json.dumps(compact, separators=(",", ":"), ensure_ascii=False)
+
+        # Halve the per-string limit until the whole output fits
+        limit = budget
+        shortened_strings = False
+        while len(output.encode("utf8")) > budget and limit > 16:
+            limit //= 2
+            shortened, shortened_strings = self._truncate_strings(compact, limit)
+            if shortened_strings:
+                shortened["truncated"] = True
+            output = json.dumps(shortened, separators=(",", ":"), ensure_ascii=False)
+
+        self.stats["calls"] += 1
+        if excerpted or shortened_strings:
+            self.stats["truncated_calls"] += 1
+        self.stats["raw_bytes"] += len(raw.encode("utf8"))
+        self.stats["sent_bytes"] += len(output.encode("utf8"))
+        self.stats["raw_tokens"] += self.count_tokens(raw)
+        self.stats["sent_tokens"] += self.count_tokens(output)
+        return output
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize the savings for the run so far."""
+        stats = dict(self.stats)
+        stats["bytes_saved"] = stats["raw_bytes"] - stats["sent_bytes"]
+        stats["tokens_saved"] = stats["raw_tokens"] - stats["sent_tokens"]
+        stats["tokens_exact"] = self._encoding is not None
+        stats["percent_saved"] = (
+            round(100.0 * stats["bytes_saved"] / stats["raw_bytes"], 1) if stats["raw_bytes"] else 0.0
+        )
+        return stats
@@ -12,8 +12,7 @@ import pytest
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-from .assistant_test_agent import AssistantTestAgent
-from .sample_test_data import DETAILED_TEST_SCENARIOS
+from .scenario_catalog import load_catalog
 
 # Default test output directory
 DEFAULT_OUTPUT_DIR = Path(__file__).parent / "test_results"
@@ -26,8 +25,21 @@ async def ai_test_agent():
     if not api_key:
         pytest.skip("OPENAI_API_KEY environment variable not set")
         
+    # Imported here so collecting tests doesn't load openai and playwright
+    from .assistant_test_agent import AssistantTestAgent
+    
     base_url = os.environ.get("TEST_BASE_URL", "http://localhost:5001")
-    agent = AssistantTestAgent(api_key=api_key, base_url=base_url)
+    agent = AssistantTestAgent(
+        api_key=api_key,
+        base_url=base_url,
+        failure_capture=os.environ.get("AI_TEST_CAPTURE_FAILURES") == "1",
+        failure_trace=os.environ.get("AI_TEST_TRACE_FAILURES") == "1",
+        browser_daemon=os.environ.get("AI_TEST_BROWSER_DAEMON"),
+        emulation_profile=os.environ.get("AI_TEST_EMULATION_PROFILE"),
+        api_stub=os.environ.get("AI_TEST_API_STUB"),
+        api_recordings_path=os.environ.get("AI_TEST_API_RECORDINGS", str(DEFAULT_OUTPUT_DIR / "api_recordings.json")),
+        api_latency_ms=float(os.environ.get("AI_TEST_API_LATENCY_MS", "0"))
+    )
     
     # Set up the agent
     await agent.setup()
@@ -43,12 +55,13 @@ def ai_test_case(scenario_name: str, description: Optional[str] = None):
     Decorator for creating AI-powered test cases.
     
     Args:
-        scenario_name: Name of the test scenario or custom instructions
+        scenario_name: Name of a scenario in the catalog, or custom instructions
         description: Optional description for the test report
     """
     def decorator(func):
-        # Get the test instructions from predefined scenarios or use custom
-        test_instructions = DETAILED_TEST_SCENARIOS.get(scenario_name, scenario_name)
+        # Get the test instructions from the scenario catalog or use custom
+        scenario = load_catalog().get(scenario_name)
+        test_instructions = scenario.instruction if scenario else scenario_name
         
         # Mark as asyncio test
         @pytest.mark.asyncio
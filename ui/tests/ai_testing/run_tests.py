@@ -11,77 +11,187 @@ import sys
 import argparse
 import asyncio
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
-from .assistant_test_agent import AssistantTestAgent
-
-# Define the test scenarios
-TEST_SCENARIOS = {
-    "counter": "Test the counter functionality on the test page. "
-              "Navigate to /test, verify the initial counter is 0, "
-              "click the increment button, and verify the counter increases to 1.",
-              
-    "strategies-listing": "Test the strategies listing page. "
-                         "Navigate to /strategies, verify that strategy cards are displayed, "
-                         "and check that each card shows the strategy name, description, and performance metrics.",
-                         
-    "file-upload": "Test the file upload functionality on the analyze page. "
-                  "Navigate to /analyze, upload the test file 'tests/data/trades.csv' to the trade results upload area, "
-                  "and verify the file name is displayed.",
-                  
-    "analyze-code": "Test the strategy code input on the analyze page. "
-                   "Navigate to /analyze, enter 'strategy(\"Test Strategy\")' in the strategy code textarea, "
-                   "change the analysis type selection, and verify the entered code persists.",
-                   
-    "navigation": "Test the main navigation links. "
-                 "Starting from the home page, click each navigation link (Strategies, Templates, Analyze) "
-                 "and verify that the correct page loads for each."
-}
-
-async def run_single_test(test_name, base_url, api_key, output_dir):
+from .browser_daemon import DEFAULT_DAEMON_ADDRESS
+from .cross_browser import DEFAULT_ENGINES
+from .emulation import PROFILES, resolve_profile
+from .model_router import DEFAULT_LARGE_MODEL, DEFAULT_SMALL_MODEL, ModelRouter
+from .scenario_catalog import ScenarioCatalog, load_catalog
+from .sharding import (
+    find_shard_files,
+    load_durations,
+    merge_shard_files,
+    parse_shard,
+    plan_hash,
+    plan_shards,
+    shard_file_name,
+    update_durations,
+    write_junit_xml
+)
+
+# Scenarios run when no --test or --tag is given
+DEFAULT_TAGS = ["core"]
+
+# Scenarios tagged "profile:<name>" also run under that emulation profile
+PROFILE_TAG_PREFIX = "profile:"
+
+def _requested_profile_tags(tags):
+    """
+    Return the "profile:<name>" tags among the requested tags.
+    
+    Raises:
+        ValueError: If a tag names an unknown emulation profile
+    """
+    requested = {tag for tag in tags or [] if tag.startswith(PROFILE_TAG_PREFIX)}
+    for tag in requested:
+        resolve_profile(tag[len(PROFILE_TAG_PREFIX):])
+    return requested
+
+def _scenario_runs(scenarios, profiles=None, tags=None):
+    """
+    Expand scenarios into (run name, scenario, emulation profile) tuples.
+    
+    Each scenario runs at full speed. When a "profile:<name>" tag was requested
+    explicitly (e.g. --tag profile:mobile-3g), scenarios carrying it also run
+    under that profile, so slowdowns can be compared; explicit profiles replace
+    both for every scenario.
+    
+    Raises:
+        ValueError: If a requested profile tag names an unknown profile
+    """
+    requested = _requested_profile_tags(tags)
+    runs = []
+    for scenario in scenarios:
+        if profiles:
+            run_profiles = list(profiles)
+        else:
+            run_profiles = [None] + [
+                tag[len(PROFILE_TAG_PREFIX):] for tag in scenario.tags if tag in requested
+            ]
+        for profile in run_profiles:
+            runs.append((f"{scenario.name}@{profile}" if profile else scenario.name, scenario, profile))
+    return runs
+
+def _print_profile_slowdowns(results):
+    for run_name, result in results.items():
+        base_name, _, profile = run_name.partition("@")
+        baseline = results.get(base_name)
+        if profile and baseline and baseline.get("duration_s"):
+            print(f"{base_name} under {profile}: {result['duration_s']}s vs {baseline['duration_s']}s "
+                  f"(x{result['duration_s'] / baseline['duration_s']:.2f})")
+
+def _profile_name(value):
+    resolve_profile(value)
+    return value
+
+async def _run_scenario(agent, scenario, leak_iterations, router, engines=None, profile=None):
+    if profile or agent.emulation_profile:
+        await agent.set_emulation_profile(profile)
+    started = time.time()
+    if leak_iterations:
+        result = await agent.run_leak_test(scenario.instruction, iterations=leak_iterations)
+    elif engines:
+        result = await agent.run_cross_browser_test(scenario.instruction, engines=engines)
+    elif router:
+        result = await agent.run_routed_test(
+            scenario.instruction, router, scenario=scenario.name, tags=scenario.tags
+        )
+    else:
+        result = await agent.run_test(scenario.instruction)
+    result["duration_s"] = round(time.time() - started, 2)
+    return result
+
+async def run_single_test(test_name, base_url, api_key, output_dir, leak_iterations=0, router=None,
+                          catalog=None, engines=None, profiles=None, tags=None, **agent_options):
     """Run a single test by name."""
-    if test_name not in TEST_SCENARIOS:
-        print(f"Error: Unknown test '{test_name}'. Available tests: {', '.join(TEST_SCENARIOS.keys())}")
+    catalog = catalog or load_catalog()
+    scenario = catalog.get(test_name)
+    if not scenario:
+        print(f"Error: Unknown test '{test_name}'. Available tests: {', '.join(catalog.names())}")
         return False
-        
-    test_instruction = TEST_SCENARIOS[test_name]
-    agent = AssistantTestAgent(api_key=api_key, base_url=base_url)
+    
+    from .assistant_test_agent import AssistantTestAgent
+    agent = AssistantTestAgent(api_key=api_key, base_url=base_url, **agent_options)
     
     try:
         await agent.setup()
-        result = await agent.run_test(test_instruction)
-        
-        # Save test result to output directory
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            result_file = os.path.join(output_dir, f"{test_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            with open(result_file, 'w') as f:
-                json.dump(result, f, indent=2)
+        results = {}
+        for run_name, _, profile in _scenario_runs([scenario], profiles, tags):
+            result = await _run_scenario(agent, scenario, leak_iterations, router, engines, profile)
+            results[run_name] = result
+            
+            # Save test result to output directory
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                result_file = os.path.join(output_dir, f"{run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+                with open(result_file, 'w') as f:
+                    json.dump(result, f, indent=2)
+        _print_profile_slowdowns(results)
                 
-        return result["success"]
+        return all(result["success"] for result in results.values())
     finally:
         await agent.teardown()
 
-async def run_all_tests(base_url, api_key, output_dir):
-    """Run all defined tests."""
-    agent = AssistantTestAgent(api_key=api_key, base_url=base_url)
+def _write_shard_file(output_dir, shard, plan, results, duration):
+    index, total = shard
+    os.makedirs(output_dir, exist_ok=True)
+    result_file = os.path.join(output_dir, shard_file_name(index, total))
+    with open(result_file, 'w') as f:
+        json.dump({"shard": index, "total": total, **plan, "duration_s": round(duration, 2), "results": results},
+                  f, indent=2)
+    return result_file
+
+async def run_all_tests(base_url, api_key, output_dir, leak_iterations=0, router=None,
+                        shard=None, durations_path=None, scenarios=None, engines=None, profiles=None,
+                        tags=None, **agent_options):
+    """
+    Run the selected scenarios, or one shard of them.
+    
+    With shard=(i, N) only the i-th of N duration-balanced shards runs and its
+    results are written to shard_<i>_of_<N>.json for merge_results.
+    """
+    if scenarios is None:
+        scenarios = load_catalog().select(tags=DEFAULT_TAGS)
+    runs = {run_name: (scenario, profile) for run_name, scenario, profile in _scenario_runs(scenarios, profiles, tags)}
+    test_names = list(runs)
+    if shard:
+        index, total = shard
+        durations = load_durations(durations_path)
+        # Lets merge_results check that every shard planned the same split
+        plan = {"plan_hash": plan_hash(test_names, durations), "planned": test_names}
+        test_names = plan_shards(test_names, total, durations)[index - 1]
+        print(f"Shard {index}/{total} (plan {plan['plan_hash']}): {', '.join(test_names) or '(empty)'}")
+        if not test_names:
+            _write_shard_file(output_dir, shard, plan, {}, 0.0)
+            return True
+    
+    from .assistant_test_agent import AssistantTestAgent
+    agent = AssistantTestAgent(api_key=api_key, base_url=base_url, **agent_options)
     results = {}
+    started = time.time()
     
     try:
         await agent.setup()
         
-        for test_name, test_instruction in TEST_SCENARIOS.items():
+        for test_name in test_names:
             print(f"\n===== Running test: {test_name} =====")
-            result = await agent.run_test(test_instruction)
+            scenario, profile = runs[test_name]
+            result = await _run_scenario(agent, scenario, leak_iterations, router, engines, profile)
             results[test_name] = result
             
         # Save all results to output directory
-        if output_dir:
+        if shard:
+            _write_shard_file(output_dir, shard, plan, results, time.time() - started)
+        elif output_dir:
             os.makedirs(output_dir, exist_ok=True)
             result_file = os.path.join(output_dir, f"all_tests_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
             with open(result_file, 'w') as f:
                 json.dump(results, f, indent=2)
+            if durations_path:
+                update_durations(durations_path, results)
                 
         # Print summary
         passed = sum(1 for r in results.values() if r["success"])
@@ -89,21 +199,140 @@ async def run_all_tests(base_url, api_key, output_dir):
         print(f"\n===== Test Results: {passed} passed, {failed} failed =====")
         for test_name, result in results.items():
             status = "PASS" if result["success"] else "FAIL"
-            print(f"{status}: {test_name}")
+            print(f"{status}: {test_name} ({result.get('model', agent.model)}, {result['duration_s']}s)")
+        _print_profile_slowdowns(results)
+        if router:
+            for model, stats in router.summary().items():
+                print(f"{model}: {stats['attempts']} attempts, {stats['pass_rate']:.0%} passed, "
+                      f"median {stats['median_duration_s']}s")
             
         return failed == 0
     finally:
         await agent.teardown()
 
+def merge_results(argv):
+    """Merge shard result files into one summary and JUnit report; returns the exit code."""
+    parser = argparse.ArgumentParser(prog="run_tests merge", description="Merge sharded AI UI test results")
+    parser.add_argument("files", nargs="*", help="Shard result files (default: shard_*_of_*.json in --output-dir)")
+    parser.add_argument("--output-dir", default="test_results", help="Directory with shard results (default: test_results)")
+    parser.add_argument("--junit", help="JUnit XML report path (default: <output-dir>/junit.xml)")
+    parser.add_argument("--durations", help="Durations file to update (default: <output-dir>/test_durations.json)")
+    args = parser.parse_args(argv)
+    
+    files = args.files or find_shard_files(args.output_dir)
+    if not files:
+        print(f"Error: No shard results found in {args.output_dir}")
+        return 1
+    
+    try:
+        merged = merge_shard_files(files)
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Remove stale shard files from earlier runs or pass the files to merge explicitly")
+        return 1
+    results = merged["results"]
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, "merged_results.json"), 'w') as f:
+        json.dump(merged, f, indent=2)
+    junit_path = args.junit or os.path.join(args.output_dir, "junit.xml")
+    write_junit_xml(junit_path, results)
+    update_durations(args.durations or os.path.join(args.output_dir, "test_durations.json"), results)
+    
+    print(f"\n===== Merged {len(files)} of {merged['total']} shards: "
+          f"{merged['passed']} passed, {merged['failed']} failed in {merged['duration_s']}s =====")
+    for test_name, result in results.items():
+        status = "PASS" if result["success"] else "FAIL"
+        print(f"{status}: {test_name} ({result.get('duration_s', 0.0)}s)")
+    if merged["missing_shards"]:
+        print(f"Error: Missing results for shards {', '.join(map(str, merged['missing_shards']))}")
+    if merged["missing_scenarios"]:
+        print(f"Error: Planned scenarios without results: {', '.join(merged['missing_scenarios'])}")
+    if merged["duplicate_scenarios"]:
+        print(f"Error: Scenarios run by more than one shard: {', '.join(merged['duplicate_scenarios'])}")
+    print(f"JUnit report written to {junit_path}")
+    
+    complete = not (merged["missing_shards"] or merged["missing_scenarios"] or merged["duplicate_scenarios"])
+    return 0 if merged["failed"] == 0 and complete else 1
+
 def main():
     """Parse arguments and run tests."""
+    if sys.argv[1:2] == ["merge"]:
+        sys.exit(merge_results(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(description="Run AI-powered UI tests")
     parser.add_argument("--test", help="Specific test to run (omit to run all tests)")
+    parser.add_argument("--tag", action="append",
+                        help=f"Run scenarios with this tag; repeatable (default: {', '.join(DEFAULT_TAGS)})")
+    parser.add_argument("--list", action="store_true", help="List the selected scenarios and their tags, then exit")
+    parser.add_argument("--scenarios-dir", help="Directory of scenario files (default: the bundled scenarios/)")
     parser.add_argument("--url", default="http://localhost:5001", help="Base URL of the application (default: http://localhost:5001)")
     parser.add_argument("--api-key", help="OpenAI API key (defaults to OPENAI_API_KEY environment variable)")
     parser.add_argument("--output-dir", default="test_results", help="Directory to save test results (default: test_results)")
+    parser.add_argument("--capture-failures", action="store_true",
+                        help="Buffer recent actions, network and console output; write trace/HAR files only for failed tests")
+    parser.add_argument("--trace-failures", action="store_true",
+                        help="Also keep a Playwright trace per test and save it only for failed tests")
+    parser.add_argument("--budgets", help="JSON file with per-route performance budgets (default: built-in budgets)")
+    parser.add_argument("--no-web-vitals", action="store_true", help="Don't collect web vitals after navigations")
+    parser.add_argument("--leak-iterations", type=int, default=0,
+                        help="Repeat each scenario this many times in one page and check for memory leaks (Chromium only)")
+    parser.add_argument("--model",
+                        help="Run every scenario on this model, disabling routing")
+    parser.add_argument("--small-model", default=DEFAULT_SMALL_MODEL,
+                        help=f"Model tried first when routing (default: {DEFAULT_SMALL_MODEL})")
+    parser.add_argument("--large-model", default=DEFAULT_LARGE_MODEL,
+                        help=f"Model used for escalation and complex scenarios (default: {DEFAULT_LARGE_MODEL})")
+    parser.add_argument("--no-dom-deltas", action="store_true",
+                        help="Don't report DOM changes after clicks, fills, selects and uploads")
+    parser.add_argument("--full-outputs", action="store_true",
+                        help="Send full tool results to the assistant instead of budgeted, compact ones")
+    parser.add_argument("--profile", action="append", type=_profile_name,
+                        help="Run every selected scenario under this emulation profile instead of its tagged ones; "
+                             f"repeatable, combine with '+' ({', '.join(PROFILES)})")
+    parser.add_argument("--api-stub", choices=["record", "replay"],
+                        help="Record the app's API responses, or replay recorded ones instead of calling the backend")
+    parser.add_argument("--api-recordings", help="JSON store for recorded API responses (default: <output-dir>/api_recordings.json)")
+    parser.add_argument("--api-latency", type=float, default=0, metavar="MS",
+                        help="Delay added to each replayed API response, to exercise loading states")
+    parser.add_argument("--cross-browser", nargs="?", const=",".join(DEFAULT_ENGINES), metavar="ENGINES",
+                        help="Plan each scenario with the assistant on Chromium, then replay it in parallel on these "
+                             f"comma-separated engines (default: {','.join(DEFAULT_ENGINES)})")
+    parser.add_argument("--browser-daemon", nargs="?", const=DEFAULT_DAEMON_ADDRESS, metavar="HOST:PORT",
+                        help=f"Lease a warm browser from browser_daemon (default address: {DEFAULT_DAEMON_ADDRESS}); "
+                             "launches one if no daemon is running")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="Run only the i-th of N duration-balanced shards (1-based); combine with 'merge'")
+    parser.add_argument("--durations",
+                        help="Scenario durations used for sharding (default: <output-dir>/test_durations.json)")
     
     args = parser.parse_args()
+    if args.shard and args.test:
+        parser.error("--shard cannot be combined with --test")
+    try:
+        _requested_profile_tags(args.tag)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    catalog = ScenarioCatalog(args.scenarios_dir) if args.scenarios_dir else load_catalog()
+    if args.list:
+        selected = catalog.select(tags=args.tag) if args.tag else catalog.select()
+        for scenario in selected:
+            print(f"{scenario.name:<24} [{', '.join(scenario.tags)}] {scenario.description}")
+        print(f"\n{len(selected)} of {len(catalog)} scenarios; tags: "
+              f"{', '.join(f'{tag} ({count})' for tag, count in catalog.tags().items())}")
+        sys.exit(0)
+    tags = args.tag or DEFAULT_TAGS
+    scenarios = catalog.select(tags=tags)
+    if not args.test and not scenarios:
+        print(f"Error: No scenarios tagged {', '.join(tags)}. Available tags: {', '.join(catalog.tags())}")
+        sys.exit(1)
+    durations_path = args.durations or os.path.join(args.output_dir, "test_durations.json")
+    engines = [engine.strip() for engine in args.cross_browser.split(",") if engine.strip()] if args.cross_browser else None
+    api_recordings_path = args.api_recordings or os.path.join(args.output_dir, "api_recordings.json")
+    if args.api_stub == "replay" and not os.path.exists(api_recordings_path):
+        print(f"Error: No API recordings at {api_recordings_path}; run once with --api-stub record "
+              f"(and the same --output-dir or --api-recordings) first")
+        sys.exit(1)
     
     # Get API key from args or environment
     api_key = args.api_key or os.environ.get("OPENAI_API_KEY")
@@ -111,12 +340,42 @@ def main():
         print("Error: OpenAI API key must be provided via --api-key or OPENAI_API_KEY environment variable")
         sys.exit(1)
     
+    agent_options = {
+        "failure_capture": args.capture_failures,
+        "failure_trace": args.trace_failures,
+        "web_vitals": not args.no_web_vitals,
+        "performance_budgets": args.budgets,
+        "performance_history_path": os.path.join(args.output_dir, "performance_history.jsonl"),
+        "compact_outputs": not args.full_outputs,
+        "dom_deltas": not args.no_dom_deltas,
+        "model": args.model or args.large_model,
+        "browser_daemon": args.browser_daemon or os.environ.get("AI_TEST_BROWSER_DAEMON"),
+        "api_stub": args.api_stub,
+        "api_latency_ms": args.api_latency,
+        "api_recordings_path": api_recordings_path
+    }
+    
+    router = None
+    if not args.model:
+        router = ModelRouter(
+            small_model=args.small_model,
+            large_model=args.large_model,
+            history_path=os.path.join(args.output_dir, "model_routing.jsonl")
+        )
+    
     if args.test:
         # Run a specific test
-        success = asyncio.run(run_single_test(args.test, args.url, api_key, args.output_dir))
+        success = asyncio.run(run_single_test(args.test, args.url, api_key, args.output_dir,
+                                              leak_iterations=args.leak_iterations, router=router,
+                                              catalog=catalog, engines=engines, profiles=args.profile,
+                                              tags=args.tag, **agent_options))
     else:
         # Run all tests
-        success = asyncio.run(run_all_tests(args.url, api_key, args.output_dir))
+        success = asyncio.run(run_all_tests(args.url, api_key, args.output_dir,
+                                            leak_iterations=args.leak_iterations, router=router,
+                                            shard=args.shard, durations_path=durations_path,
+                                            scenarios=scenarios, engines=engines, profiles=args.profile,
+                                            tags=args.tag, **agent_options))
     
     sys.exit(0 if success else 1)
 
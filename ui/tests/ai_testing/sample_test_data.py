@@ -5,45 +5,10 @@ This file provides test data and examples that can be used for UI testing,
 including test scenarios, element selectors, and sample verification criteria.
 """
 
-# Test scenario descriptions with detailed instructions
-DETAILED_TEST_SCENARIOS = {
-    "login_workflow": """
-    Test the user login workflow:
-    1. Navigate to the login page
-    2. Enter 'testuser@example.com' in the email field
-    3. Enter 'password123' in the password field
-    4. Click the login button
-    5. Verify that the user is redirected to the dashboard page
-    6. Verify that the user's name appears in the header
-    """,
-    
-    "strategy_creation": """
-    Test the strategy creation workflow:
-    1. Navigate to the '/strategies/new' page
-    2. Enter 'Test Strategy' in the strategy name field
-    3. Enter 'This is a test strategy' in the description field
-    4. Enter the following code in the strategy code editor:
-       ```
-       strategy("Test Strategy")
-       longCondition = close > open
-       if (longCondition)
-           strategy.entry("Long", strategy.long)
-       ```
-    5. Click the 'Save Strategy' button
-    6. Verify that a success message is displayed
-    7. Verify that the strategy appears in the strategies list
-    """,
-    
-    "dark_mode_toggle": """
-    Test the dark mode toggle functionality:
-    1. Navigate to the home page
-    2. Verify the initial theme (check background color)
-    3. Click the theme toggle button in the header
-    4. Verify that the theme has changed (check the background color again)
-    5. Click the theme toggle button again
-    6. Verify that the theme has changed back to the original
-    """
-}
+from .scenario_catalog import load_catalog
+
+# Detailed multi-step scenarios, now kept as files in scenarios/ (tag "detailed")
+DETAILED_TEST_SCENARIOS = load_catalog().instructions(tags=["detailed"])
 
 # Common CSS selectors used in the UI
 COMMON_SELECTORS = {
@@ -0,0 +1,170 @@
+"""
+File-based catalog of AI test scenarios.
+
+Each scenario is a Markdown file in scenarios/ whose name (without .md) is
+the scenario name. An optional header between "---" lines holds metadata; the
+rest of the file is the natural-language instruction given to the assistant:
+
+    ---
+    tags: core, smoke
+    description: Counter increments on the test page
+    ---
+    Test the counter functionality on the test page. ...
+
+Parsed scenarios are cached in an on-disk index (.index.json next to the
+files) keyed by each file's size and modification time, so listing and tag
+selection read one JSON file instead of parsing every scenario. Files are only
+re-parsed when they change.
+
+This module only uses the standard library so that listing scenarios and
+pytest collection don't import openai or playwright.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+INDEX_FILE = ".index.json"
+INDEX_VERSION = 1
+SCENARIO_SUFFIX = ".md"
+
+
+@dataclass
+class Scenario:
+    """A test scenario loaded from the catalog."""
+    name: str
+    instruction: str
+    tags: List[str] = field(default_factory=list)
+    description: str = ""
+    file: str = ""
+
+
+def parse_scenario_file(path: str) -> Scenario:
+    """
+    Parse a scenario file.
+
+    Raises:
+        ValueError: If the header is not closed or the instruction is empty
+    """
+    name = os.path.basename(path)[:-len(SCENARIO_SUFFIX)]
+    with open(path, encoding="utf8") as f:
+        text = f.read()
+
+    meta = {}
+    body = text
+    if text.startswith("---"):
+        header, separator, body = text[3:].partition("\n---")
+        if not separator:
+            raise ValueError(f"{path}: header is missing its closing '---'")
+        for line in header.strip().splitlines():
+            key, _, value = line.partition(":")
+            meta[key.strip().lower()] = value.strip()
+
+    instruction = body.strip()
+    if not instruction:
+        raise ValueError(f"{path}: scenario has no instruction")
+    tags = [tag.strip() for tag in meta.get("tags", "").split(",") if tag.strip()]
+    return Scenario(name, instruction, tags, meta.get("description", ""), os.path.basename(path))
+
+
+class ScenarioCatalog:
+    """
+    Scenarios from a directory, with tag selection backed by an on-disk index.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SCENARIO_DIR, index_path: Optional[str] = None):
+        """
+        Args:
+            directory: Directory containing the scenario files
+            index_path: Index file (defaults to .index.json in the directory)
+        """
+        self.directory = directory
+        self.index_path = index_path or os.path.join(directory, INDEX_FILE)
+        self.scenarios = self._load()
+
+    def _read_index(self) -> Dict:
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if index.get("version") == INDEX_VERSION else {}
+
+    def _load(self) -> Dict[str, Scenario]:
+        cached = self._read_index().get("files", {})
+        files = {}
+        changed = False
+        with os.scandir(self.directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if not entry.name.endswith(SCENARIO_SUFFIX) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                key = [stat.st_size, stat.st_mtime_ns]
+                previous = cached.get(entry.name)
+                if previous and previous["key"] == key:
+                    files[entry.name] = previous
+                else:
+                    files[entry.name] = {"key": key, "scenario": asdict(parse_scenario_file(entry.path))}
+                    changed = True
+        if changed or set(files) != set(cached):
+            try:
+                with open(self.index_path, "w") as f:
+                    json.dump({"version": INDEX_VERSION, "files": files}, f, indent=1)
+            except OSError:
+                # Read-only checkouts still work, just without the cache
+                pass
+        return {item["scenario"]["name"]: Scenario(**item["scenario"]) for item in files.values()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.scenarios
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def get(self, name: str) -> Optional[Scenario]:
+        return self.scenarios.get(name)
+
+    def names(self) -> List[str]:
+        return list(self.scenarios)
+
+    def tags(self) -> Dict[str, int]:
+        """Return every tag with the number of scenarios carrying it."""
+        counts = {}
+        for scenario in self.scenarios.values():
+            for tag in scenario.tags:
+                counts[tag] = counts.get(tag, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def select(self, tags: Optional[Iterable[str]] = None, names: Optional[Iterable[str]] = None) -> List[Scenario]:
+        """
+        Return scenarios matching any of the tags and/or any of the names.
+
+        With neither filter, every scenario is returned.
+        """
+        tags = set(tags or [])
+        names = set(names or [])
+        if not tags and not names:
+            return list(self.scenarios.values())
+        return [
+            s for s in self.scenarios.values()
+            if s.name in names or tags.intersection(s.tags)
+        ]
+
+    def instructions(self, tags: Optional[Iterable[str]] = None, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Map selected scenario names to their instructions."""
+        return {s.name: s.instruction for s in self.select(tags, names)}
+
+
+_default_catalog = None
+
+
+def load_catalog(directory: Optional[str] = None) -> ScenarioCatalog:
+    """Return the catalog for a directory; the default one is loaded once per process."""
+    global _default_catalog
+    if directory:
+        return ScenarioCatalog(directory)
+    if _default_catalog is None:
+        _default_catalog = ScenarioCatalog()
+    return _default_catalog
@@ -0,0 +1,208 @@
+"""
+Deterministic, duration-aware sharding of AI test scenarios across processes.
+
+plan_shards splits scenarios into N shards with greedy longest-processing-time
+bin packing over the durations of previous runs, so every shard finishes at
+about the same time. The plan depends only on the scenario names and the
+durations file, so independent CI processes (or machines) given the same inputs
+agree on it without coordinating.
+
+Each shard writes shard_<i>_of_<N>.json with the full list of planned names
+and a plan_hash of the inputs; merge_shard_files combines them into one result
+set, checks that every shard planned the same split and that each planned
+scenario ran exactly once, and write_junit_xml renders the merged results for
+CI.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+import statistics
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+# Assumed duration for scenarios without history, in seconds
+DEFAULT_DURATION_S = 60.0
+
+SHARD_FILE_PATTERN = "shard_*_of_*.json"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse a 1-based "i/N" shard spec.
+
+    Raises:
+        ValueError: If the spec is malformed or i is outside 1..N
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 1/4")
+    index, total = int(match.group(1)), int(match.group(2))
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Invalid shard '{value}', i must be between 1 and N")
+    return index, total
+
+
+def shard_file_name(index: int, total: int) -> str:
+    return f"shard_{index}_of_{total}.json"
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    """Load scenario durations in seconds; empty when the file does not exist."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_durations(path: str, results: Dict[str, Dict[str, Any]], smoothing: float = 0.5) -> Dict[str, float]:
+    """
+    Blend the durations of new results into the durations file.
+
+    Args:
+        path: JSON file mapping scenario name to seconds
+        results: Results keyed by scenario name, with "duration_s"
+        smoothing: Weight of the new measurement (1.0 replaces the old value)
+
+    Returns:
+        The updated durations
+    """
+    durations = load_durations(path)
+    for name, result in results.items():
+        duration = result.get("duration_s")
+        if duration is None:
+            continue
+        previous = durations.get(name)
+        durations[name] = round(
+            duration if previous is None else smoothing * duration + (1 - smoothing) * previous, 2
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    return durations
+
+
+def plan_shards(names: List[str], total: int, durations: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """
+    Split scenarios into shards with balanced expected run time.
+
+    Scenarios are placed longest first onto the currently lightest shard; ties
+    are broken by name and shard index so the plan is deterministic. Scenarios
+    without history are assumed to take the median known duration.
+
+    Returns:
+        One list of scenario names per shard, each in the original order
+    """
+    durations = durations or {}
+    known = [durations[name] for name in names if name in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION_S
+
+    loads = [0.0] * total
+    assignment = {}
+    for name in sorted(names, key=lambda n: (-durations.get(n, fallback), n)):
+        shard = min(range(total), key=lambda i: (loads[i], i))
+        assignment[name] = shard
+        loads[shard] += durations.get(name, fallback)
+
+    shards = [[] for _ in range(total)]
+    for name in names:
+        shards[assignment[name]].append(name)
+    return shards
+
+
+def plan_hash(names: List[str], durations: Optional[Dict[str, float]] = None) -> str:
+    """
+    Fingerprint the inputs of plan_shards.
+
+    Shards planned from different scenario lists or durations files get
+    different hashes, so merge_shard_files can tell they may overlap or leave
+    scenarios out.
+    """
+    durations = durations or {}
+    names = sorted(names)
+    inputs = {"names": names, "durations": {name: durations[name] for name in names if name in durations}}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf8")).hexdigest()[:16]
+
+
+def merge_shard_files(paths: List[str]) -> Dict[str, Any]:
+    """
+    Combine shard result files.
+
+    Returns:
+        Dict with merged "results", shard "total", "missing_shards", planned
+        scenarios without a result ("missing_scenarios"), scenarios reported
+        by more than one shard ("duplicate_scenarios"), summed "duration_s"
+        and "passed"/"failed" counts
+
+    Raises:
+        ValueError: If the files come from runs with a different shard count
+            or a different scenario plan
+    """
+    results = {}
+    counts = {}
+    seen = set()
+    total = None
+    plan = None
+    planned = []
+    duration = 0.0
+    for path in sorted(paths):
+        with open(path) as f:
+            shard = json.load(f)
+        if total is not None and shard["total"] != total:
+            raise ValueError(f"{path} belongs to a {shard['total']}-shard run, expected {total}")
+        if total is not None and shard.get("plan_hash") != plan:
+            raise ValueError(
+                f"{path} was planned from different scenarios or durations than the other shards "
+                f"(plan {shard.get('plan_hash')}, expected {plan}); share test_durations.json between machines"
+            )
+        total = shard["total"]
+        plan = shard.get("plan_hash")
+        planned = shard.get("planned", [])
+        seen.add(shard["shard"])
+        duration = max(duration, shard.get("duration_s", 0.0))
+        results.update(shard["results"])
+        for name in shard["results"]:
+            counts[name] = counts.get(name, 0) + 1
+
+    passed = sum(1 for r in results.values() if r["success"])
+    return {
+        "total": total or 0,
+        "missing_shards": sorted(set(range(1, (total or 0) + 1)) - seen),
+        "missing_scenarios": [name for name in planned if name not in results],
+        "duplicate_scenarios": sorted(name for name, count in counts.items() if count > 1),
+        "results": results,
+        "passed": passed,
+        "failed": len(results) - passed,
+        # Shards run in parallel, so wall time is that of the slowest shard
+        "duration_s": duration,
+    }
+
+
+def find_shard_files(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, SHARD_FILE_PATTERN)))
+
+
+def write_junit_xml(path: str, results: Dict[str, Dict[str, Any]], suite_name: str = "ai-ui-tests"):
+    """Write results keyed by scenario name as a JUnit XML report."""
+    failures = sum(1 for r in results.values() if not r["success"])
+    total_time = sum(r.get("duration_s", 0.0) for r in results.values())
+    suites = ET.Element("testsuites", tests=str(len(results)), failures=str(failures), time=f"{total_time:.2f}")
+    suite = ET.SubElement(
+        suites, "testsuite", name=suite_name, tests=str(len(results)), failures=str(failures),
+        errors="0", skipped="0", time=f"{total_time:.2f}"
+    )
+    for name, result in results.items():
+        case = ET.SubElement(
+            suite, "testcase", name=name, classname=suite_name, time=f"{result.get('duration_s', 0.0):.2f}"
+        )
+        if not result["success"]:
+            message = result.get("message", "")
+            failure = ET.SubElement(case, "failure", message=message.splitlines()[0] if message else "failed")
+            failure.text = message
+        if result.get("model"):
+            ET.SubElement(case, "system-out").text = f"model: {result['model']}"
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    ET.ElementTree(suites).write(path, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+"""
+Rendering scenario for the strategies listing with large catalogs.
+
+For each catalog size (100, 1,000 and 10,000 strategies by default) a catalog
+is generated with strategy_generator and served to the desktop app's renderer
+(electron/index.html + renderer.js) through a stand-in for the preload
+`window.electron.getStrategies` bridge, which returns a JSON-decoded copy just
+like the IPC call. The scenario opens the Strategies view and records:
+
+    time_to_first_card_ms   click until the first card has been rendered
+    time_to_all_cards_ms    click until every card is in the DOM and rendered
+    scroll jank             frame intervals and long tasks while the page is
+                            scrolled top to bottom in a fixed number of frames
+    memory                  JS heap and DOM node counts after forced GC (CDP),
+                            before and after the listing was rendered
+
+Passing --baseline with an earlier results file flags metrics that got worse
+by more than --tolerance, and the run then exits non-zero. No OpenAI calls are
+made. CDP is only available on Chromium.
+
+Usage:
+    python -m ui.tests.ai_testing.strategies_benchmark
+    python -m ui.tests.ai_testing.strategies_benchmark --sizes 1000,10000 --baseline test_results/strategies_benchmark_20260101_120000.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .leak_detector import LeakSampler
+from .strategy_generator import build_catalog
+
+DEFAULT_SIZES = "100,1000,10000"
+
+ELECTRON_INDEX = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "electron", "index.html"
+))
+
+# renderer.js renders each strategy as a "shadow-md" card; the loading and
+# empty-state placeholders use "shadow"
+CARD_SELECTOR = "#strategies-list > .shadow-md"
+
+# Frame interval above which a scroll frame counts as janky (three 60 Hz frames)
+JANK_FRAME_MS = 50
+
+DEFAULT_SCROLL_FRAMES = 120
+
+# Metrics compared against a baseline, with the absolute slack allowed on top
+# of the relative tolerance so that tiny values don't flag on noise
+REGRESSION_SLACK = {
+    "time_to_first_card_ms": 20,
+    "time_to_all_cards_ms": 20,
+    "p95_frame_ms": 8,
+    "janky_frames": 2,
+    "long_task_ms": 50,
+    "js_heap_bytes": 1024 * 1024,
+    "dom_nodes": 100,
+}
+
+BRIDGE_SCRIPT = """
+(() => {
+    const payload = %s;
+    window.electron = {
+        // ipcRenderer.invoke hands the renderer a deserialized copy on every call
+        getStrategies: async () => JSON.parse(payload),
+        app: { getVersion: () => '0.1.0' },
+        fs: { readFile: async () => null, saveFile: async () => false },
+    };
+})();
+"""
+
+RENDER_JS = """
+async ([selector, expected, timeoutMs]) => {
+    const afterFrame = () => new Promise((resolve) =>
+        requestAnimationFrame(() => setTimeout(() => resolve(performance.now()), 0)));
+    const longTasks = [];
+    let observer = null;
+    try {
+        observer = new PerformanceObserver((list) => longTasks.push(...list.getEntries()));
+        observer.observe({ type: 'longtask' });
+    } catch (e) {}
+
+    const started = performance.now();
+    document.getElementById('nav-strategies').click();
+    let first = null;
+    let all = null;
+    let cards = 0;
+    while (performance.now() - started < timeoutMs) {
+        const now = await afterFrame();
+        cards = document.querySelectorAll(selector).length;
+        if (cards && first === null) first = now - started;
+        if (cards >= expected) { all = now - started; break; }
+    }
+    if (observer) { longTasks.push(...observer.takeRecords()); observer.disconnect(); }
+    return {
+        cards,
+        time_to_first_card_ms: first,
+        time_to_all_cards_ms: all,
+        render_long_task_ms: longTasks.reduce((sum, t) => sum + t.duration, 0),
+    };
+}
+"""
+
+SCROLL_JS = """
+async ([frames, jankMs]) => {
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+    const scroller = document.scrollingElement;
+    window.scrollTo(0, 0);
+    const distance = scroller.scrollHeight - window.innerHeight;
+    // Cover the whole page in the given number of frames, like a fling or a scrollbar drag
+    const step = Math.max(100, distance / frames);
+
+    const longTasks = [];
+    let observer = null;
+    try {
+        observer = new PerformanceObserver((list) => longTasks.push(...list.getEntries()));
+        observer.observe({ type: 'longtask' });
+    } catch (e) {}
+
+    const intervals = [];
+    let last = await nextFrame();
+    for (let i = 0; i < frames && scroller.scrollTop < distance; i++) {
+        window.scrollBy(0, step);
+        const now = await nextFrame();
+        intervals.push(now - last);
+        last = now;
+    }
+    if (observer) { longTasks.push(...observer.takeRecords()); observer.disconnect(); }
+
+    const sorted = [...intervals].sort((a, b) => a - b);
+    const total = intervals.reduce((sum, v) => sum + v, 0);
+    return {
+        scroll_height_px: scroller.scrollHeight,
+        frames: intervals.length,
+        avg_fps: total ? intervals.length * 1000 / total : null,
+        p95_frame_ms: sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * 0.95))] : null,
+        max_frame_ms: sorted.length ? sorted[sorted.length - 1] : null,
+        janky_frames: intervals.filter((v) => v > jankMs).length,
+        long_tasks: longTasks.length,
+        long_task_ms: longTasks.reduce((sum, t) => sum + t.duration, 0),
+    };
+}
+"""
+
+
+async def measure_listing(
+    context,
+    listing: List[Dict[str, Any]],
+    index_path: str,
+    scroll_frames: int,
+    timeout_ms: int
+) -> Dict[str, Any]:
+    """Render one catalog on a fresh page and measure it."""
+    await context.add_init_script(BRIDGE_SCRIPT % json.dumps(json.dumps(listing)))
+    page = await context.new_page()
+    sampler = LeakSampler()
+    await sampler.attach(context, page)
+    try:
+        await page.goto(Path(index_path).as_uri())
+        before = await sampler.sample()
+
+        result = await page.evaluate(RENDER_JS, [CARD_SELECTOR, len(listing), timeout_ms])
+        if result["time_to_all_cards_ms"] is None:
+            raise TimeoutError(f"Only {result['cards']} of {len(listing)} cards rendered within {timeout_ms} ms")
+        result.update(await page.evaluate(SCROLL_JS, [scroll_frames, JANK_FRAME_MS]))
+
+        after = await sampler.sample()
+        result.update(after)
+        result["js_heap_delta_bytes"] = after["js_heap_bytes"] - before["js_heap_bytes"]
+        result["dom_nodes_delta"] = after["dom_nodes"] - before["dom_nodes"]
+        return result
+    finally:
+        await sampler.detach()
+
+
+async def run_benchmark(
+    sizes: List[int],
+    seed: int = 42,
+    index_path: str = ELECTRON_INDEX,
+    headless: bool = True,
+    scroll_frames: int = DEFAULT_SCROLL_FRAMES,
+    timeout_ms: int = 120000
+) -> List[Dict[str, Any]]:
+    """
+    Run the listing scenario for each catalog size.
+
+    Args:
+        sizes: Numbers of strategies
+        seed: Catalog seed
+        index_path: Renderer page that lists the strategies
+        headless: Run the browser headless
+        scroll_frames: Frames used to scroll the whole listing
+        timeout_ms: Time allowed for all cards to render
+
+    Returns:
+        One result dict per size
+    """
+    # Playwright is only needed to measure, not to compare result files
+    from playwright.async_api import async_playwright
+
+    results = []
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            for size in sizes:
+                generate_started = time.perf_counter()
+                listing = build_catalog(size, seed=seed, output_format="electron")
+                generate_s = time.perf_counter() - generate_started
+
+                context = await browser.new_context(viewport={"width": 1280, "height": 800})
+                result = {"strategies": size, "seed": seed, "generate_s": generate_s}
+                try:
+                    result.update(await measure_listing(context, listing, index_path, scroll_frames, timeout_ms))
+                    result["success"] = True
+                except Exception as e:
+                    result["success"] = False
+                    result["error"] = str(e)
+                finally:
+                    await context.close()
+
+                if result["success"]:
+                    status = (
+                        f"first card {result['time_to_first_card_ms']:.0f} ms, "
+                        f"all cards {result['time_to_all_cards_ms']:.0f} ms, "
+                        f"scroll p95 {result['p95_frame_ms']:.1f} ms ({result['janky_frames']} janky frames), "
+                        f"heap {result['js_heap_bytes'] / 1024 ** 2:.1f} MB"
+                    )
+                else:
+                    status = f"FAILED ({result['error']})"
+                print(f"{size:,} strategies: {status}")
+                results.append(result)
+        finally:
+            await browser.close()
+
+    return results
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float = 0.25
+) -> List[Dict[str, Any]]:
+    """
+    Find metrics that regressed against an earlier run of the same sizes.
+
+    A metric regresses when it exceeds the baseline value by more than the
+    relative tolerance plus its REGRESSION_SLACK.
+
+    Returns:
+        List of {"strategies", "metric", "baseline", "current"} dicts
+    """
+    previous = {r["strategies"]: r for r in baseline if r.get("success")}
+    regressions = []
+    for result in results:
+        old = previous.get(result["strategies"])
+        if not result.get("success") or not old:
+            continue
+        for metric, slack in REGRESSION_SLACK.items():
+            current, before = result.get(metric), old.get(metric)
+            if current is None or before is None:
+                continue
+            if current > before * (1 + tolerance) + slack:
+                regressions.append({
+                    "strategies": result["strategies"],
+                    "metric": metric,
+                    "baseline": before,
+                    "current": current,
+                })
+    return regressions
+
+
+def main():
+    """Parse arguments and run the strategies listing benchmark."""
+    parser = argparse.ArgumentParser(description="Measure strategies listing rendering with large generated catalogs")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated catalog sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--seed", type=int, default=42, help="Catalog seed (default: 42)")
+    parser.add_argument("--index", default=ELECTRON_INDEX, help="Renderer page to load (default: electron/index.html)")
+    parser.add_argument("--scroll-frames", type=int, default=DEFAULT_SCROLL_FRAMES,
+                        help=f"Frames used to scroll the whole listing (default: {DEFAULT_SCROLL_FRAMES})")
+    parser.add_argument("--baseline", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown against the baseline (default: 0.25)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--output-dir", default="test_results", help="Directory to save results (default: test_results)")
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = asyncio.run(run_benchmark(
+        sizes, seed=args.seed, index_path=args.index, headless=not args.headed, scroll_frames=args.scroll_frames
+    ))
+
+    regressions: Optional[List[Dict[str, Any]]] = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['strategies']:,} strategies: {r['metric']} {r['baseline']:.1f} -> {r['current']:.1f}")
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    result_file = os.path.join(args.output_dir, f"strategies_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(result_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {result_file}")
+
+    sys.exit(0 if all(r["success"] for r in results) and not regressions else 1)
+
+
+if __name__ == "__main__":
+    main()
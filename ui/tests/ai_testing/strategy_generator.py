@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""
+Seeded generator for large saved-strategy catalogs.
+
+Each strategy gets a realistic name, description, tags, a PineScript v5 body
+built from one of the common indicator families (moving-average crossovers,
+RSI/MACD/Bollinger/Donchian/Supertrend rules, optional stop-loss and
+take-profit) and backtest metrics that are consistent with each other: the
+profit factor follows from the win rate and payoff ratio, and net profit from
+the profit factor and trade count. The same seed always produces the same
+catalog, and the first N strategies of a larger catalog equal a catalog of N.
+
+Two output formats are written:
+    full      id, name, description, code, tags, lastModified and performance
+              (winRate, profitFactor, drawdown, netProfit, totalTrades, sharpe)
+    electron  the listing shape of electron/electron-data/strategies.json
+              (id, name, description, winRate "68.5%", profit "+24.7%")
+
+Usage:
+    python -m ui.tests.ai_testing.strategy_generator 10000 strategies_10k.json
+    python -m ui.tests.ai_testing.strategy_generator 1000 ui/electron/electron-data/strategies.json --format electron
+"""
+
+import argparse
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+OUTPUT_FORMATS = ("full", "electron")
+
+MARKETS = [
+    ("XAUUSD", "gold"), ("BTCUSD", "bitcoin"), ("ETHUSD", "ether"), ("EURUSD", "EUR/USD"),
+    ("GBPJPY", "GBP/JPY"), ("SPY", "S&P 500"), ("QQQ", "Nasdaq 100"), ("AAPL", "Apple"),
+    ("TSLA", "Tesla"), ("NVDA", "Nvidia"), ("CL1!", "crude oil"), ("ES1!", "E-mini S&P"),
+]
+
+TIMEFRAMES = ["1m", "5m", "15m", "1h", "4h", "1D"]
+
+QUALIFIERS = ["Adaptive", "Improved", "Dynamic", "Smoothed", "Filtered", "Fast", "Conservative", "Aggressive", ""]
+
+STYLES = {
+    "1m": "scalping", "5m": "scalping", "15m": "intraday", "1h": "intraday", "4h": "swing", "1D": "position",
+}
+
+# Indicator family -> (name stem, description phrase, tags, code template, parameter ranges)
+FAMILIES = {
+    "sma_cross": (
+        "SMA Crossover",
+        "simple moving average crossover with a {fast}/{slow} period pair",
+        ["trend", "moving-average"],
+        """fastMA = ta.sma(close, {fast})
+slowMA = ta.sma(close, {slow})
+longSignal = ta.crossover(fastMA, slowMA)
+exitSignal = ta.crossunder(fastMA, slowMA)""",
+        {"fast": (5, 20), "slow": (21, 60)},
+    ),
+    "ema_cross": (
+        "EMA Crossover",
+        "exponential moving average crossover ({fast}/{slow}) with a trend filter",
+        ["trend", "moving-average"],
+        """fastMA = ta.ema(close, {fast})
+slowMA = ta.ema(close, {slow})
+trendMA = ta.ema(close, {trend})
+longSignal = ta.crossover(fastMA, slowMA) and close > trendMA
+exitSignal = ta.crossunder(fastMA, slowMA)""",
+        {"fast": (8, 21), "slow": (22, 55), "trend": (100, 200)},
+    ),
+    "rsi_reversal": (
+        "RSI Reversal",
+        "RSI({length}) mean reversion entering below {oversold} and exiting above {overbought}",
+        ["mean-reversion", "oscillator"],
+        """rsiValue = ta.rsi(close, {length})
+longSignal = ta.crossover(rsiValue, {oversold})
+exitSignal = ta.crossunder(rsiValue, {overbought})""",
+        {"length": (7, 21), "oversold": (20, 35), "overbought": (65, 80)},
+    ),
+    "macd": (
+        "MACD Momentum",
+        "MACD({fast}, {slow}, {signal}) signal-line crossover",
+        ["momentum", "oscillator"],
+        """[macdLine, signalLine, _] = ta.macd(close, {fast}, {slow}, {signal})
+longSignal = ta.crossover(macdLine, signalLine) and macdLine < 0
+exitSignal = ta.crossunder(macdLine, signalLine)""",
+        {"fast": (8, 15), "slow": (21, 30), "signal": (5, 12)},
+    ),
+    "bollinger": (
+        "Bollinger Breakout",
+        "breakout above the upper Bollinger Band ({length}, {mult_text}σ) with volume confirmation",
+        ["breakout", "volatility"],
+        """[middle, upper, lower] = ta.bb(close, {length}, {mult})
+volumeOk = volume > ta.sma(volume, 20) * 1.5
+longSignal = ta.crossover(close, upper) and volumeOk
+exitSignal = ta.crossunder(close, middle)""",
+        {"length": (14, 30), "mult": (15, 30)},
+    ),
+    "donchian": (
+        "Donchian Channel Breakout",
+        "{length}-bar Donchian channel breakout, exiting on the {exit_length}-bar low",
+        ["breakout", "trend"],
+        """upper = ta.highest(high, {length})[1]
+lower = ta.lowest(low, {exit_length})[1]
+longSignal = close > upper
+exitSignal = close < lower""",
+        {"length": (20, 55), "exit_length": (10, 20)},
+    ),
+    "supertrend": (
+        "Supertrend Follower",
+        "Supertrend (factor {factor_text}, ATR {atr_length}) trend following",
+        ["trend", "volatility"],
+        """[supertrend, direction] = ta.supertrend({factor}, {atr_length})
+longSignal = ta.change(direction) < 0
+exitSignal = ta.change(direction) > 0""",
+        {"factor": (20, 40), "atr_length": (7, 14)},
+    ),
+}
+
+RISK_TEMPLATE = """
+stopLossPct = input.float({stop}, "Stop loss %")
+takeProfitPct = input.float({target}, "Take profit %")
+if strategy.position_size > 0
+    entryPrice = strategy.position_avg_price
+    strategy.exit("Risk", "Long", stop=entryPrice * (1 - stopLossPct / 100), limit=entryPrice * (1 + takeProfitPct / 100))"""
+
+CODE_TEMPLATE = """//@version=5
+strategy("{title}", overlay=true, initial_capital=10000, default_qty_type=strategy.percent_of_equity, default_qty_value={qty})
+
+{signals}
+
+if longSignal
+    strategy.entry("Long", strategy.long)
+if exitSignal
+    strategy.close("Long")
+{risk}"""
+
+CATALOG_START = datetime(2023, 1, 1)
+
+
+def _parameters(rng: random.Random, ranges: Dict[str, tuple]) -> Dict[str, Any]:
+    params = {key: rng.randint(low, high) for key, (low, high) in ranges.items()}
+    # Multipliers are drawn as tenths
+    for key in ("mult", "factor"):
+        if key in params:
+            params[key] = params[key] / 10
+            params[f"{key}_text"] = f"{params[key]:g}"
+    return params
+
+
+def _metrics(rng: random.Random, family: str, timeframe: str) -> Dict[str, float]:
+    """Draw mutually consistent backtest metrics."""
+    mean_reverting = family == "rsi_reversal"
+    # Mean reversion wins often with small payoffs; trend following the opposite
+    win_rate = rng.gauss(0.60 if mean_reverting else 0.45, 0.06)
+    win_rate = min(max(win_rate, 0.30), 0.75)
+    payoff = math.exp(rng.gauss(-0.2 if mean_reverting else 0.35, 0.22))
+    profit_factor = win_rate * payoff / (1 - win_rate)
+
+    trades_scale = {"1m": 1500, "5m": 800, "15m": 400, "1h": 200, "4h": 80, "1D": 40}[timeframe]
+    total_trades = max(10, int(rng.lognormvariate(math.log(trades_scale), 0.4)))
+    avg_loss_pct = rng.uniform(0.3, 1.5) * (1 if timeframe in ("1m", "5m") else 2)
+    expectancy_pct = avg_loss_pct * (win_rate * payoff - (1 - win_rate))
+    net_profit = min(max(expectancy_pct * total_trades * rng.uniform(0.05, 0.15), -60.0), 250.0)
+    drawdown = min(60.0, avg_loss_pct * rng.uniform(3, 8) * (1.6 - min(profit_factor, 1.5)) + rng.uniform(1, 4))
+    sharpe = min(max((profit_factor - 1) * rng.uniform(1.2, 2.2), -1.5), 3.5)
+
+    return {
+        "winRate": round(win_rate * 100, 1),
+        "profitFactor": round(profit_factor, 2),
+        "drawdown": round(drawdown, 1),
+        "netProfit": round(net_profit, 1),
+        "totalTrades": total_trades,
+        "sharpe": round(sharpe, 2),
+    }
+
+
+def generate_strategies(count: int, seed: int = 42, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Yield synthetic saved strategies in the "full" format.
+
+    Args:
+        count: Number of strategies
+        seed: Random seed; each strategy is drawn from its own seeded stream, so
+            strategy i does not depend on how many are generated
+        start_id: Id of the first strategy
+
+    Returns:
+        Iterator of strategy dicts
+    """
+    family_names = sorted(FAMILIES)
+    for index in range(count):
+        strategy_id = start_id + index
+        rng = random.Random(f"{seed}:{strategy_id}")
+
+        family = rng.choice(family_names)
+        stem, description, tags, signals, ranges = FAMILIES[family]
+        symbol, market = rng.choice(MARKETS)
+        timeframe = rng.choice(TIMEFRAMES)
+        qualifier = rng.choice(QUALIFIERS)
+        params = _parameters(rng, ranges)
+
+        name = " ".join(part for part in (qualifier, market.title() if market.islower() else market, stem) if part)
+        if rng.random() < 0.3:
+            name += f" v{rng.randint(2, 9)}"
+
+        with_risk = rng.random() < 0.6
+        risk = ""
+        if with_risk:
+            stop = round(rng.uniform(0.5, 3.0), 1)
+            risk = RISK_TEMPLATE.format(stop=stop, target=round(stop * rng.uniform(1.2, 3.0), 1))
+
+        code = CODE_TEMPLATE.format(
+            title=name,
+            qty=rng.choice([2, 5, 10, 25]),
+            signals=signals.format(**params),
+            risk=risk,
+        )
+
+        summary = description.format(**params)
+        suffix = " and fixed stop-loss/take-profit" if with_risk else ""
+        modified = CATALOG_START + timedelta(minutes=rng.randint(0, 900 * 24 * 60))
+
+        yield {
+            "id": strategy_id,
+            "name": name,
+            "description": f"{STYLES[timeframe].capitalize()} strategy for {market} on the {timeframe} chart: {summary}{suffix}.",
+            "code": code,
+            "tags": [STYLES[timeframe], *tags, symbol.lower()],
+            "lastModified": modified.strftime("%Y-%m-%d"),
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "performance": _metrics(rng, family, timeframe),
+        }
+
+
+def to_listing_entry(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a "full" strategy to the Electron listing shape."""
+    performance = strategy["performance"]
+    return {
+        "id": strategy["id"],
+        "name": strategy["name"],
+        "description": strategy["description"],
+        "winRate": f"{performance['winRate']:.1f}%",
+        "profit": f"{performance['netProfit']:+.1f}%",
+    }
+
+
+def build_catalog(count: int, seed: int = 42, output_format: str = "full") -> List[Dict[str, Any]]:
+    """Generate a catalog as a list in the requested format."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format '{output_format}', expected one of {', '.join(OUTPUT_FORMATS)}")
+    strategies = generate_strategies(count, seed=seed)
+    if output_format == "electron":
+        return [to_listing_entry(strategy) for strategy in strategies]
+    return list(strategies)
+
+
+def write_catalog(path: str, count: int, seed: int = 42, output_format: str = "full") -> Dict[str, Any]:
+    """
+    Write a generated catalog as a JSON array.
+
+    Returns:
+        Dict with the path and number of strategies written
+    """
+    catalog = build_catalog(count, seed=seed, output_format=output_format)
+    with open(path, "w") as f:
+        json.dump(catalog, f, indent=2 if count <= 100 else None)
+        f.write("\n")
+    return {"path": path, "strategies": len(catalog)}
+
+
+def main():
+    """Parse arguments and write the catalog."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic saved-strategies catalog")
+    parser.add_argument("count", type=int, help="Number of strategies")
+    parser.add_argument("output", help="Output JSON path")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="full", help="Output shape (default: full)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+
+    args = parser.parse_args()
+    result = write_catalog(args.output, args.count, seed=args.seed, output_format=args.format)
+    print(f"Wrote {result['strategies']:,} strategies to {result['path']}")
+
+
+if __name__ == "__main__":
+    main()
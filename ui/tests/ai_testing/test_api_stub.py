@@ -0,0 +1,79 @@
+"""
+Unit tests for API stub request matching.
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from .api_stub import ApiStub, normalize_body, request_key
+
+
+@pytest.mark.parametrize("first, second", [
+    # Key order and whitespace do not matter for JSON bodies
+    (b'{"a": 1, "b": [1, 2]}', b'{"b":[1,2],"a":1}'),
+    # Volatile fields are dropped, also in nested objects and lists
+    (b'{"a": 1, "timestamp": 1}', b'{"a": 1, "timestamp": 2}'),
+    (b'{"rows": [{"id": 1, "created_at": "x"}]}', b'{"rows": [{"id": 1, "created_at": "y"}]}'),
+    (b'{"meta": {"nonce": "a", "requestId": "b"}}', b'{"meta": {}}'),
+])
+def test_normalize_body_matches(first, second):
+    assert normalize_body(first) == normalize_body(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    (b'{"a": 1}', b'{"a": 2}'),
+    (b'[1, 2]', b'[2, 1]'),
+    (b'{"a": 1, "timestamp": 1}', b'{"a": 1, "extra": 0}'),
+    (b'plain text', b'other text'),
+])
+def test_normalize_body_differs(first, second):
+    assert normalize_body(first) != normalize_body(second)
+
+
+@pytest.mark.parametrize("body, expected", [
+    (None, ""),
+    (b"", ""),
+    # Bodies that are not JSON are hashed as they are
+    (b"\xff\xfe not json", hashlib.sha256(b"\xff\xfe not json").hexdigest()[:16]),
+])
+def test_normalize_body_edge_cases(body, expected):
+    assert normalize_body(body) == expected
+
+
+@pytest.mark.parametrize("method, url, body, expected", [
+    ("get", "http://localhost:3000/api/strategies", None, "GET /api/strategies"),
+    # Query parameters are sorted; blank values are kept
+    ("GET", "http://localhost:3000/api/strategies?sort=name&page=2&q=", None, "GET /api/strategies?page=2&q=&sort=name"),
+    # Host and fragment are not part of the key
+    ("GET", "https://project.supabase.co/rest/v1/strategies?select=*#x", None, "GET /rest/v1/strategies?select=%2A"),
+    ("POST", "http://localhost:3000/api/analyze", b'{"b": 1, "a": 2}',
+     "POST /api/analyze " + normalize_body(b'{"a":2,"b":1}')),
+])
+def test_request_key(method, url, body, expected):
+    assert request_key(method, url, body) == expected
+
+
+def test_request_key_ignores_query_order():
+    assert request_key("GET", "http://h/api/x?b=2&a=1", None) == request_key("GET", "http://h/api/x?a=1&b=2", None)
+
+
+def test_replay_without_recordings_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ApiStub(mode="replay", path=str(tmp_path / "missing.json"))
+    with pytest.raises(ValueError):
+        ApiStub(mode="proxy", path=str(tmp_path / "missing.json"))
+
+
+def test_fork_keeps_its_own_replay_state(tmp_path):
+    path = tmp_path / "api_recordings.json"
+    path.write_text(json.dumps({"version": 1, "entries": {"GET /api/x": [{"status": 200}]}}))
+    stub = ApiStub(mode="replay", path=str(path))
+    stub._replay_positions["GET /api/x"] = 1
+    stub.stats["hits"] = 1
+
+    fork = stub.fork()
+    fork.reset_stats()
+    assert fork.entries == stub.entries
+    assert (stub._replay_positions, stub.stats["hits"]) == ({"GET /api/x": 1}, 1)
@@ -0,0 +1,93 @@
+"""
+Unit tests for the warm browser pool bookkeeping.
+"""
+
+import asyncio
+
+import pytest
+
+from .browser_daemon import WarmBrowserPool, parse_address
+
+
+class _FakeBrowser:
+    def __init__(self, connected=True):
+        self.connected = connected
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakePool(WarmBrowserPool):
+    """Pool whose launches take a little time and never start Chromium."""
+
+    def __init__(self, pool_size):
+        super().__init__(playwright=None, pool_size=pool_size)
+        self.launched = []
+
+    @property
+    def launches(self):
+        return len(self.launched)
+
+    async def _launch(self):
+        entry = {"id": self.next_id, "browser": _FakeBrowser(), "endpoint": "http://127.0.0.1:0"}
+        self.next_id += 1
+        self.launched.append(entry)
+        await asyncio.sleep(0.01)
+        return entry
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("127.0.0.1:9323", ("127.0.0.1", 9323)),
+    ("9400", ("127.0.0.1", 9400)),
+    (":9400", ("127.0.0.1", 9400)),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+@pytest.mark.parametrize("pool_size, fillers", [(1, 5), (2, 2), (3, 10)])
+def test_concurrent_fills_do_not_over_launch(pool_size, fillers):
+    async def scenario():
+        pool = _FakePool(pool_size)
+        await asyncio.gather(*(pool.fill() for _ in range(fillers)))
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert pool.launches == pool_size
+    assert pool.status() == {"ready": pool_size, "leased": 0, "launching": 0, "pool_size": pool_size}
+
+
+def test_concurrent_releases_replace_each_browser_once():
+    async def scenario():
+        pool = _FakePool(2)
+        await pool.fill()
+        leases = [await pool.acquire(), await pool.acquire()]
+        # Releases refill while an acquire-triggered fill is also running
+        await asyncio.gather(*(pool.release(entry) for entry in leases), pool.fill())
+        return pool, leases
+
+    pool, leases = asyncio.run(scenario())
+    assert all(entry["browser"].closed for entry in leases)
+    assert pool.launches == 4
+    assert pool.status() == {"ready": 2, "leased": 0, "launching": 0, "pool_size": 2}
+
+
+def test_acquire_skips_dead_browsers():
+    async def scenario():
+        pool = _FakePool(2)
+        await pool.fill()
+        dead = pool.launched[0]
+        dead["browser"].connected = False
+        entry = await pool.acquire()
+        # Let the background refill finish
+        await asyncio.sleep(0.05)
+        return pool, dead, entry
+
+    pool, dead, entry = asyncio.run(scenario())
+    assert entry is not dead
+    assert pool.launches == 3
+    assert pool.status() == {"ready": 1, "leased": 1, "launching": 0, "pool_size": 2}
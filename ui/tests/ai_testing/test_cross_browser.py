@@ -0,0 +1,47 @@
+"""
+Unit tests for cross-browser replay divergence checks.
+"""
+
+import json
+
+import pytest
+
+from .cross_browser import divergence_prompt, find_divergence
+
+
+def _step(result, name="check_element_visible"):
+    return {"name": name, "args": {"selector": "#result"}, "result": result}
+
+
+@pytest.mark.parametrize("recorded, actual, expected", [
+    ({"success": True, "visible": True}, {"success": True, "visible": True}, None),
+    # Fields other than the verification outcome may differ
+    ({"success": True, "visible": True, "title": "A"}, {"success": True, "visible": True, "title": "B"}, None),
+    ({"success": True}, {"success": False, "error": "Timeout"}, {"reason": "step failed", "error": "Timeout"}),
+    ({"success": True}, {}, {"reason": "step failed", "error": None}),
+    # A step that already failed on Chromium may fail again
+    ({"success": False, "error": "x"}, {"success": False, "error": "y"}, None),
+    ({"success": True, "visible": True}, {"success": True, "visible": False},
+     {"reason": "visible differs", "expected": True, "actual": False}),
+    ({"success": True, "contains_text": True}, {"success": True},
+     {"reason": "contains_text differs", "expected": True, "actual": None}),
+    ({"success": True, "matches": False}, {"success": True, "matches": True},
+     {"reason": "matches differs", "expected": False, "actual": True}),
+    (None, {"success": True}, None),
+])
+def test_find_divergence(recorded, actual, expected):
+    assert find_divergence(_step(recorded), actual) == expected
+
+
+def test_divergence_prompt_lists_remaining_steps():
+    plan = [
+        {"name": "navigate_to_url", "args": {"url": "/"}, "result": {"success": True}},
+        _step({"success": True, "visible": True}),
+        {"name": "click_element", "args": {"selector": "#go"}, "result": {"success": True}},
+    ]
+    divergence = {"reason": "visible differs", "expected": True, "actual": False}
+    prompt = divergence_prompt("webkit", "Check the result", plan, 1, divergence)
+
+    assert "step 2 of 3 diverged" in prompt
+    assert "visible differs" in prompt
+    assert prompt.endswith(json.dumps([{"name": "click_element", "args": {"selector": "#go"}}]))
@@ -0,0 +1,81 @@
+"""
+Unit tests for the streaming CSV data generator.
+"""
+
+import itertools
+import os
+
+import pytest
+
+from .data_generator import (
+    HISTORY_HEADER,
+    generate_history_rows,
+    parse_size,
+    summarize_trades_csv,
+    write_csv,
+    write_trades_csv
+)
+
+ROWS = [f"row{i:02d}\n" for i in range(10)]
+
+
+@pytest.mark.parametrize("max_rows, max_bytes, rows, size", [
+    (3, None, 3, 7 + 3 * 6),
+    (0, None, 0, 7),
+    # Stops before the row that would cross the byte limit
+    (None, 7 + 2 * 6, 2, 7 + 2 * 6),
+    (None, 7 + 2 * 6 + 5, 2, 7 + 2 * 6),
+    # Whichever limit is hit first wins
+    (5, 7 + 2 * 6, 2, 7 + 2 * 6),
+    (2, 10 ** 6, 2, 7 + 2 * 6),
+    # A short iterator ends the file early
+    (100, None, 10, 7 + 10 * 6),
+])
+def test_write_csv_limits(tmp_path, max_rows, max_bytes, rows, size):
+    path = str(tmp_path / "out.csv")
+    result = write_csv(path, "header", iter(ROWS), max_rows, max_bytes)
+    assert (result["rows"], result["bytes"]) == (rows, size)
+    assert os.path.getsize(path) == size
+    with open(path) as f:
+        assert f.read() == "header\n" + "".join(ROWS[:rows])
+
+
+def test_write_csv_requires_a_limit(tmp_path):
+    with pytest.raises(ValueError):
+        write_csv(str(tmp_path / "out.csv"), "header", iter(ROWS))
+
+
+@pytest.mark.parametrize("block_bytes", [1, 7, 1 << 20])
+def test_write_csv_block_size_does_not_change_output(tmp_path, block_bytes):
+    path = tmp_path / "out.csv"
+    write_csv(str(path), HISTORY_HEADER, generate_history_rows(seed=3), max_rows=500, block_bytes=block_bytes)
+    expected = HISTORY_HEADER + "\n" + "".join(itertools.islice(generate_history_rows(seed=3), 500))
+    assert path.read_text() == expected
+
+
+def test_write_csv_byte_limit_on_generated_rows(tmp_path):
+    path = str(tmp_path / "history.csv")
+    result = write_csv(path, HISTORY_HEADER, generate_history_rows(), max_bytes=parse_size("64KB"))
+    assert result["bytes"] == os.path.getsize(path) <= 64 * 1024
+    # The next row would not have fit
+    next_row = next(itertools.islice(generate_history_rows(), result["rows"], None))
+    assert result["bytes"] + len(next_row) > 64 * 1024
+
+
+@pytest.mark.parametrize("size, expected", [
+    ("123", 123),
+    ("10KB", 10 * 1024),
+    ("1.5 mb", int(1.5 * 1024 ** 2)),
+    ("2GB", 2 * 1024 ** 3),
+    ("7B", 7),
+])
+def test_parse_size(size, expected):
+    assert parse_size(size) == expected
+
+
+def test_trades_summary_matches_rows(tmp_path):
+    path = str(tmp_path / "trades.csv")
+    write_trades_csv(path, max_rows=200, seed=7)
+    summary = summarize_trades_csv(path)
+    assert summary["totalTrades"] == 100
+    assert summary["winningTrades"] + summary["losingTrades"] <= 100
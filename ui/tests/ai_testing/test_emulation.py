@@ -0,0 +1,25 @@
+"""
+Unit tests for emulation profile resolution.
+"""
+
+import pytest
+
+from .emulation import resolve_profile
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("3g", {"network": "3g"}),
+    ("mobile-3g", {"device": "mobile", "network": "3g", "cpu_rate": 4}),
+    # Parts combine left to right, later parts win
+    ("3g+slow-cpu-6x", {"network": "3g", "cpu_rate": 6}),
+    ("mobile-3g+slow-3g", {"device": "mobile", "network": "slow-3g", "cpu_rate": 4}),
+    (" Mobile + 4G ", {"device": "mobile", "network": "4g"}),
+])
+def test_resolve_profile(name, expected):
+    assert resolve_profile(name) == expected
+
+
+@pytest.mark.parametrize("name", ["5g", "3g+", "", "mobile+unknown"])
+def test_resolve_profile_rejects_unknown(name):
+    with pytest.raises(ValueError, match="Unknown emulation profile"):
+        resolve_profile(name)
@@ -9,8 +9,8 @@ import os
 import asyncio
 import pytest
 
-from .assistant_test_agent import AssistantTestAgent
 from .pytest_integration import ai_test_case, parameterized_ai_tests
+from .scenario_catalog import load_catalog
 
 # Basic counter test using the AI testing framework with pytest
 @ai_test_case("counter")
@@ -21,10 +21,7 @@ async def test_counter_functionality(agent, result):
     return True
 
 # Test navigation using parameterized tests
-@parameterized_ai_tests({
-    "navigation_home": "Test navigation to the home page. Verify the page title contains 'PineScript MCP'.",
-    "navigation_strategies": "Test navigation to the strategies page. Verify strategy cards are displayed."
-})
+@parameterized_ai_tests(load_catalog().instructions(names=["navigation_home", "navigation_strategies"]))
 async def test_navigation(agent, result, scenario_name):
     """Test navigation between different pages."""
     # Custom verification based on the scenario
@@ -34,8 +31,8 @@ async def test_navigation(agent, result, scenario_name):
         assert "strategy cards" in result["message"].lower()
     return True
 
-# File upload test using custom instructions
-@ai_test_case("Test the file upload functionality on the analyze page. Navigate to /analyze, upload the test file 'tests/data/trades.csv', and verify the file name appears.")
+# File upload test using the catalog scenario
+@ai_test_case("file-upload")
 async def test_file_upload(agent, result):
     """Test the file upload functionality on the analyze page."""
     assert "file" in result["message"].lower() and "upload" in result["message"].lower()
@@ -45,13 +42,7 @@ async def test_file_upload(agent, result):
 @pytest.mark.asyncio
 async def test_custom_workflow(ai_test_agent):
     """Test a custom workflow with specific verification steps."""
-    instructions = """
-    Test the analyze page functionality:
-    1. Navigate to /analyze
-    2. Enter 'strategy(\"My Test Strategy\")' in the code editor
-    3. Click the 'Analyze' button
-    4. Verify that results are displayed
-    """
+    instructions = load_catalog().get("analyze_workflow").instruction
     
     result = await ai_test_agent.run_test(instructions)
     
@@ -75,26 +66,22 @@ async def run_standalone_tests():
         print("Error: OPENAI_API_KEY environment variable not set")
         return False
         
+    from .assistant_test_agent import AssistantTestAgent
+    
     base_url = os.environ.get("TEST_BASE_URL", "http://localhost:5001")
     agent = AssistantTestAgent(api_key=api_key, base_url=base_url)
+    catalog = load_catalog()
     
     try:
         await agent.setup()
         
         # Test counter functionality
-        counter_result = await agent.run_test(
-            "Test the counter functionality on the test page. "
-            "Navigate to /test, verify the initial counter is 0, "
-            "click the increment button, and verify the counter increases to 1."
-        )
+        counter_result = await agent.run_test(catalog.get("counter").instruction)
         print(f"Counter test result: {'SUCCESS' if counter_result['success'] else 'FAILURE'}")
         print(f"Message: {counter_result['message']}")
         
         # Test strategies page
-        strategies_result = await agent.run_test(
-            "Test the strategies listing page. Navigate to /strategies and "
-            "verify that strategy cards are displayed with names and descriptions."
-        )
+        strategies_result = await agent.run_test(catalog.get("strategies-listing").instruction)
         print(f"\nStrategies test result: {'SUCCESS' if strategies_result['success'] else 'FAILURE'}")
         print(f"Message: {strategies_result['message']}")
         
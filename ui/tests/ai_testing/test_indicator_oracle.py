@@ -0,0 +1,111 @@
+"""
+Unit tests for the indicator oracle and the fixture-strategy evaluator.
+"""
+
+import numpy as np
+import pytest
+
+from .indicator_oracle import StrategyEvaluator, crossover, crossunder, rma, rsi, simulate_long_positions, sma
+
+CLOSES = np.array([1.0, 2.0, 3.0, 2.0, 1.0, 2.0, 3.0])
+
+
+def _history(closes):
+    closes = np.asarray(closes, dtype="f8")
+    return {"open": closes, "high": closes, "low": closes, "close": closes, "volume": np.ones(closes.size)}
+
+
+def _rma_loop(values, length):
+    out = [np.nan] * len(values)
+    out[length - 1] = float(np.mean(values[:length]))
+    for i in range(length, len(values)):
+        out[i] = (values[i] + (length - 1) * out[i - 1]) / length
+    return np.array(out)
+
+
+@pytest.mark.parametrize("length, expected", [
+    (1, [1, 2, 3, 2, 1, 2, 3]),
+    (3, [np.nan, np.nan, 2, 7 / 3, 2, 5 / 3, 2]),
+    (8, [np.nan] * 7),
+])
+def test_sma(length, expected):
+    np.testing.assert_allclose(sma(CLOSES, length), expected)
+
+
+@pytest.mark.parametrize("length", [2, 5, 14])
+def test_rma_matches_recursion(length):
+    values = np.random.default_rng(length).normal(100, 5, 10000)
+    np.testing.assert_allclose(rma(values, length), _rma_loop(values, length), rtol=1e-9)
+
+
+@pytest.mark.parametrize("closes, expected_last", [
+    ([1, 2, 3, 4, 5], 100.0),
+    ([5, 4, 3, 2, 1], 0.0),
+    # Seed up = down = 0.5, then up 0.75/0.375 and down 0.25/0.625
+    ([1, 2, 1, 2, 1], 37.5),
+])
+def test_rsi(closes, expected_last):
+    assert rsi(np.array(closes, dtype="f8"), 2)[-1] == pytest.approx(expected_last)
+
+
+@pytest.mark.parametrize("a, b, over, under", [
+    ([1, 3, 1, 3], 2, [1, 3], [2]),
+    ([2, 2, 3, 1], 2, [2], [3]),
+    ([np.nan, 3, 1, 3], 2, [3], [2]),
+])
+def test_crosses(a, b, over, under):
+    a = np.array(a, dtype="f8")
+    assert np.flatnonzero(crossover(a, b)).tolist() == over
+    assert np.flatnonzero(crossunder(a, b)).tolist() == under
+
+
+@pytest.mark.parametrize("desired, trades", [
+    ([np.nan, 1, np.nan, 0, np.nan], [[2, 4]]),
+    ([1, np.nan, np.nan, np.nan], [[1, -1]]),
+    ([1, 0, 1, 0], [[1, 2], [3, -1]]),
+    ([0, 0, np.nan], []),
+])
+def test_simulate_long_positions(desired, trades):
+    assert simulate_long_positions(np.array(desired, dtype="f8")).tolist() == trades
+
+
+@pytest.mark.parametrize("code, entries, closes", [
+    # Every order in a block gets its condition, not only the first
+    ("""
+up = close > 1.5
+if (up)
+    strategy.entry("L", strategy.long)
+    strategy.close("L")
+""", [1, 2, 3, 5, 6], [1, 2, 3, 5, 6]),
+    # Orders after the block are unconditional again
+    ("""
+if close > 2.5
+    strategy.entry("L", strategy.long)
+strategy.close("L")
+""", [2, 6], [0, 1, 2, 3, 4, 5, 6]),
+    # Nested conditions combine
+    ("""
+if close > 1.5
+    if close < 2.5
+        strategy.entry("L", direction=strategy.long)
+""", [1, 3, 5], []),
+])
+def test_if_blocks(code, entries, closes):
+    result = StrategyEvaluator(_history(CLOSES)).run(code)
+    assert result["entry_signals"].tolist() == entries
+    assert result["close_signals"].tolist() == closes
+
+
+@pytest.mark.parametrize("code", [
+    'if close > 1\n    strategy.entry("S", strategy.short)',
+    'strategy.entry("L")',
+    'strategy.entry("L", strategy.long, limit=2)',
+    'strategy.exit("X", "L", stop=1)',
+    'strategy.close_all()',
+    'if close > 1\n    x = 1',
+    'if close > 1\n    strategy.entry("L", strategy.long)\nelse\n    strategy.close("L")',
+    'x = ta.ema(close, 3)',
+])
+def test_unsupported_code_raises(code):
+    with pytest.raises(ValueError):
+        StrategyEvaluator(_history(CLOSES)).run(code)
@@ -0,0 +1,65 @@
+"""
+Unit tests for leak detection from repeated memory samples.
+"""
+
+import pytest
+
+from .leak_detector import DEFAULT_THRESHOLDS, analyze_samples, fit_slope
+
+
+def _samples(key, values):
+    return [{key: value} for value in values]
+
+
+@pytest.mark.parametrize("values, slope, r_squared", [
+    ([], 0.0, 0.0),
+    ([5], 0.0, 0.0),
+    ([3, 3, 3, 3], 0.0, 0.0),
+    ([0, 2, 4, 6], 2.0, 1.0),
+    ([10, 7, 4, 1], -3.0, 1.0),
+    ([0, 1, 0, 1], 0.2, 0.2),
+])
+def test_fit_slope(values, slope, r_squared):
+    assert fit_slope(values) == (pytest.approx(slope), pytest.approx(r_squared))
+
+
+@pytest.mark.parametrize("values, leak", [
+    # Flat series
+    ([1000] * 8, False),
+    # Steady growth above the threshold of 10 nodes per iteration
+    ([1000 + 50 * i for i in range(8)], True),
+    # Growth below the threshold
+    ([1000 + 5 * i for i in range(8)], False),
+    # Noise around a flat line fits poorly
+    ([1000, 1100, 1000, 1100, 1000, 1100, 1000, 1100], False),
+    # Too few samples after warm-up to judge
+    ([1000 + 50 * i for i in range(4)], False),
+    # A one-off jump in the warm-up sample is ignored
+    ([500] + [1000] * 7, False),
+])
+def test_analyze_samples(values, leak):
+    analysis = analyze_samples(_samples("dom_nodes", values))
+    assert analysis["metrics"]["dom_nodes"]["leak"] is leak
+    assert analysis["leak_suspected"] is leak
+
+
+@pytest.mark.parametrize("warmup, leak", [(0, True), (1, False), (2, False)])
+def test_warmup_excluded_from_fit(warmup, leak):
+    # Lazy chunks load during the first replays, then the page is stable
+    values = [100, 400, 700, 1000, 1000, 1000]
+    analysis = analyze_samples(_samples("dom_nodes", values), warmup=warmup)
+    metric = analysis["metrics"]["dom_nodes"]
+    assert metric["leak"] is leak
+    assert metric["first"] == values[warmup]
+    # Warm-up samples are still reported
+    assert analysis["warmup"] == warmup and analysis["samples"][0] == {"dom_nodes": 100}
+
+
+def test_analyze_samples_thresholds_and_missing_metrics():
+    samples = [{"js_heap_bytes": 1_000_000 + 200_000 * i, "documents": None} for i in range(6)]
+    analysis = analyze_samples(samples)
+    assert set(analysis["metrics"]) == {"js_heap_bytes"}
+    assert analysis["metrics"]["js_heap_bytes"]["threshold"] == DEFAULT_THRESHOLDS["js_heap_bytes"]
+    assert analysis["metrics"]["js_heap_bytes"]["total_growth"] == 800_000
+    assert analysis["leak_suspected"] is True
+    assert analyze_samples(samples, {"js_heap_bytes": 300_000})["leak_suspected"] is False
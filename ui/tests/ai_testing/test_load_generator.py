@@ -0,0 +1,74 @@
+"""
+Unit tests for the load generator's latency histogram and request mix.
+"""
+
+import random
+
+import pytest
+
+from .load_generator import LatencyHistogram, parse_mix
+
+
+def _exact_percentile(values, percentile):
+    ordered = sorted(values)
+    rank = max(1, int(round(percentile / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+@pytest.mark.parametrize("values, percentile, expected", [
+    ([5], 50, 5),
+    ([1, 2, 3, 4], 50, 2),
+    ([1, 2, 3, 4], 100, 4),
+    # Below 2**sub_bucket_bits values are stored exactly
+    (list(range(1, 1001)), 99, 990),
+    ([], 50, 0),
+])
+def test_percentile_exact_range(values, percentile, expected):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    assert histogram.percentile(percentile) == expected
+
+
+@pytest.mark.parametrize("sub_bucket_bits", [7, 11])
+@pytest.mark.parametrize("percentile", [50, 90, 99, 99.9])
+def test_percentile_relative_error(sub_bucket_bits, percentile):
+    rng = random.Random(sub_bucket_bits)
+    values = [int(rng.lognormvariate(9, 1.5)) for _ in range(20000)]
+    histogram = LatencyHistogram(sub_bucket_bits)
+    for value in values:
+        histogram.record(value)
+
+    exact = _exact_percentile(values, percentile)
+    # Reported values are the top of their bucket and never below the exact value
+    assert exact <= histogram.percentile(percentile) <= exact * (1 + 2.0 / 2 ** sub_bucket_bits) + 1
+
+
+def test_merge_and_summary():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in (1000, 2000):
+        first.record(value)
+    for value in (3000, 50_000_000):
+        second.record(value)
+    first.merge(second)
+
+    summary = first.summary()
+    assert summary["count"] == 4
+    assert (summary["min_ms"], summary["max_ms"]) == (1.0, 50000.0)
+    assert summary["mean_ms"] == pytest.approx((6000 + 50_000_000) / 4 / 1000)
+    assert summary["p99.9_ms"] == 50000.0
+
+
+@pytest.mark.parametrize("mix, expected", [
+    ("analyze", [("analyze", "GET", "/analyze", 1.0)]),
+    ("analyze=1,upload-log=3", [("analyze", "GET", "/analyze", 1.0), ("upload-log", "POST", "/api/uploads/log", 3.0)]),
+    (" health=0.5 , /custom=2 ,", [("health", "GET", "/health", 0.5), ("/custom", "GET", "/custom", 2.0)]),
+])
+def test_parse_mix(mix, expected):
+    assert [(s.name, s.method, s.path, s.weight) for s in parse_mix(mix)] == expected
+
+
+@pytest.mark.parametrize("mix", ["", " , ", "unknown=1"])
+def test_parse_mix_rejects(mix):
+    with pytest.raises(ValueError):
+        parse_mix(mix)
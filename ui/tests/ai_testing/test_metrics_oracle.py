@@ -0,0 +1,75 @@
+"""
+Unit tests for the backtest metrics oracle.
+"""
+
+import pytest
+
+from .metrics_oracle import compare_metrics, compute_trade_metrics, load_trades, parse_displayed_number
+
+TRADES_CSV = """date,symbol,side,quantity,price,profit_loss
+2023-01-01,AAPL,BUY,100,140.00,0
+2023-01-02,AAPL,SELL,100,142.00,200.00
+2023-01-03,MSFT,BUY,50,240.00,0
+2023-01-04,MSFT,SELL,50,238.00,-100.00
+2023-01-05,TSLA,BUY,10,700.00,0
+2023-01-06,TSLA,SELL,10,730.00,300.00
+"""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$3,876.24", 3876.24),
+    ("-$100", -100.0),
+    ("$-100", -100.0),
+    ("−$1.50", -1.5),
+    ("-7.43%", -7.43),
+    ("+24.7%", 24.7),
+    ("40 (67.8%)", 40.0),
+    ("1.85", 1.85),
+    ("N/A", None),
+    ("", None),
+])
+def test_parse_displayed_number(text, expected):
+    assert parse_displayed_number(text) == expected
+
+
+@pytest.mark.parametrize("expected, displayed, matches", [
+    ({"netProfit": 100.0}, {"netProfit": 100.0}, True),
+    # A sign error must not pass
+    ({"netProfit": -100.0}, {"netProfit": 100.0}, False),
+    ({"averageTrade": -12.5}, {"averageTrade": 12.5}, False),
+    ({"sharpeRatio": -0.42}, {"sharpeRatio": 0.42}, False),
+    ({"sharpeRatio": -0.42}, {"sharpeRatio": -0.42}, True),
+    # Drawdown is a magnitude shown as a negative percentage
+    ({"maxDrawdown": 7.43}, {"maxDrawdown": -7.43}, True),
+    ({"maxDrawdown": 7.43}, {"maxDrawdown": 7.43}, True),
+    # Within and beyond the display precision
+    ({"netProfit": 100.004}, {"netProfit": 100.0}, True),
+    ({"netProfit": 100.02}, {"netProfit": 100.0}, False),
+    ({"winRate": 66.66}, {"winRate": 66.7}, True),
+    ({"totalTrades": 3}, {"totalTrades": 4}, False),
+])
+def test_compare_metrics(expected, displayed, matches):
+    assert compare_metrics(expected, displayed)["matches"] is matches
+
+
+def test_compare_metrics_needs_a_common_metric():
+    result = compare_metrics({"netProfit": 1.0, "sharpeRatio": None}, {"winRate": 50.0, "sharpeRatio": 1.0})
+    assert result == {"matches": False, "compared": {}, "mismatches": []}
+
+
+def test_compute_trade_metrics(tmp_path):
+    path = tmp_path / "trades.csv"
+    path.write_text(TRADES_CSV)
+    metrics = compute_trade_metrics(load_trades(str(path)), initial_capital=10000.0)
+
+    assert metrics["totalTrades"] == 3
+    assert metrics["winningTrades"] == 2
+    assert metrics["losingTrades"] == 1
+    assert metrics["netProfit"] == pytest.approx(400.0)
+    assert metrics["profitFactor"] == pytest.approx(5.0)
+    assert metrics["winRate"] == pytest.approx(200.0 / 3)
+    assert metrics["averageTrade"] == pytest.approx(400.0 / 3)
+    # Peak 10200 falls to 10100
+    assert metrics["maxDrawdown"] == pytest.approx(100.0 / 10200 * 100)
+    assert metrics["recoveryFactor"] == pytest.approx(4.0)
+    assert metrics["finalEquity"] == pytest.approx(10400.0)
@@ -0,0 +1,87 @@
+"""
+Unit tests for model routing.
+"""
+
+import pytest
+
+from .model_router import ModelRouter
+
+SMALL = "small"
+LARGE = "large"
+
+
+def _router(history=(), **kwargs):
+    """In-memory router with (model, success) attempts recorded for scenario "s"."""
+    router = ModelRouter(small_model=SMALL, large_model=LARGE, history_path=None, **kwargs)
+    for model, success in history:
+        router.record("s", model, success, 1.0)
+    return router
+
+
+@pytest.mark.parametrize("history, tags, models, reason", [
+    ([], None, [SMALL, LARGE], "default"),
+    ([], ["complex"], [LARGE], "tagged complex"),
+    ([], ["smoke", "critical"], [LARGE], "tagged critical"),
+    # Too few runs to trust the pass rate
+    ([(SMALL, False)] * 2, None, [SMALL, LARGE], "default"),
+    ([(SMALL, False)] * 3, None, [LARGE], "small pass rate 0% below 80%"),
+    ([(SMALL, True)] * 4 + [(SMALL, False)], None, [SMALL, LARGE], "default"),
+    ([(SMALL, True)] * 3 + [(SMALL, False)], None, [LARGE], "small pass rate 75% below 80%"),
+    # Large-model runs after a low small-model pass rate lead to a probe
+    ([(SMALL, False)] * 3 + [(LARGE, True)] * 9, None, [LARGE], "small pass rate 0% below 80%"),
+    ([(SMALL, False)] * 3 + [(LARGE, True)] * 10, None, [SMALL, LARGE], "probing small"),
+])
+def test_route(history, tags, models, reason):
+    assert _router(history).route("s", tags) == {"models": models, "reason": reason}
+
+
+def test_route_single_model():
+    router = ModelRouter(small_model=LARGE, large_model=LARGE, history_path=None)
+    assert router.route("s") == {"models": [LARGE], "reason": "single model"}
+
+
+@pytest.mark.parametrize("history, window, expected", [
+    ([(SMALL, True)] * 2, 20, None),
+    ([(SMALL, True), (SMALL, False), (SMALL, True), (LARGE, False)], 20, pytest.approx(2 / 3)),
+    # Only the most recent attempts count
+    ([(SMALL, False)] * 5 + [(SMALL, True)] * 3, 3, 1.0),
+])
+def test_pass_rate(history, window, expected):
+    assert _router(history, window=window).pass_rate("s", SMALL) == expected
+
+
+def test_history_round_trip(tmp_path):
+    path = tmp_path / "routing" / "history.jsonl"
+    router = ModelRouter(small_model=SMALL, large_model=LARGE, history_path=str(path))
+    router.record("s", SMALL, False, 2.0)
+    router.record("s", LARGE, True, 4.0, timed_out=False)
+    router.record("t", LARGE, True, 6.0)
+
+    reloaded = ModelRouter(small_model=SMALL, large_model=LARGE, history_path=str(path))
+    assert reloaded.summary() == {
+        LARGE: {"attempts": 2, "pass_rate": 1.0, "median_duration_s": 5.0},
+        SMALL: {"attempts": 1, "pass_rate": 0.0, "median_duration_s": 2.0},
+    }
+
+
+@pytest.mark.parametrize("result, escalate, recorded", [
+    ({"success": True, "failure_kind": None}, False, (True, False)),
+    ({"success": False, "failure_kind": "assistant"}, True, (False, False)),
+    ({"success": False, "failure_kind": "timeout"}, True, (False, True)),
+    # A slow page is not the model's fault
+    ({"success": False, "failure_kind": "budget"}, False, (True, False)),
+    ({"success": False}, True, (False, False)),
+])
+def test_record_result(result, escalate, recorded):
+    router = _router()
+    assert router.record_result("s", SMALL, result, 1.0) is escalate
+    attempt = router._history[-1]
+    assert (attempt["success"], attempt["timed_out"]) == recorded
+
+
+def test_budget_failures_keep_small_model():
+    router = _router()
+    for _ in range(5):
+        router.record_result("s", SMALL, {"success": False, "failure_kind": "budget"}, 1.0)
+    assert router.route("s") == {"models": [SMALL, LARGE], "reason": "default"}
+    assert router.pass_rate("s", SMALL) == 1.0
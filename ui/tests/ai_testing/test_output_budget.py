@@ -0,0 +1,81 @@
+"""
+Unit tests for tool-output compaction.
+"""
+
+import json
+
+import pytest
+
+from .output_budget import DEFAULT_OUTPUT_BUDGETS, ELLIPSIS, MATCH_EXCERPT_CHARS, OutputCompactor, excerpt_around
+
+TEXT = "a" * 100 + "NEEDLE" + "b" * 100
+
+
+@pytest.mark.parametrize("text, needle, max_chars, expected", [
+    ("short", "x", 10, "short"),
+    ("0123456789", "", 5, "0123" + ELLIPSIS),
+    ("0123456789", "missing", 5, "0123" + ELLIPSIS),
+    ("NEEDLE" + "x" * 20, "NEEDLE", 10, "NEEDLExxx" + ELLIPSIS),
+    ("x" * 20 + "NEEDLE", "NEEDLE", 10, ELLIPSIS + "xxxNEEDLE"),
+    ("x" * 20 + "NEEDLE" + "y" * 20, "NEEDLE", 10, ELLIPSIS + "xNEEDLEy" + ELLIPSIS),
+    ("x" * 20 + "Needle" + "y" * 20, "NEEDLE", 10, ELLIPSIS + "xNeedley" + ELLIPSIS),
+])
+def test_excerpt_around(text, needle, max_chars, expected):
+    assert excerpt_around(text, needle, max_chars) == expected
+
+
+@pytest.mark.parametrize("max_chars", [8, 20, 51, 150])
+def test_excerpt_around_keeps_needle_within_limit(max_chars):
+    snippet = excerpt_around(TEXT, "NEEDLE", max_chars)
+    assert len(snippet) == max_chars
+    assert "NEEDLE" in snippet
+
+
+@pytest.mark.parametrize("name, result", [
+    ("check_element_contains_text", {"success": True, "contains_text": True, "actual_text": TEXT * 50}),
+    ("check_element_contains_text", {"success": True, "contains_text": False, "actual_text": TEXT * 50}),
+    ("click_element", {"success": True, "dom_delta": {"appeared": ["div: " + "z" * 300] * 20}}),
+    ("navigate_to_url", {"success": True, "title": "t" * 5000, "url": "http://localhost/" + "p" * 5000}),
+    ("get_page_title", {"success": True, "title": "é" * 3000}),
+])
+def test_compact_fits_budget(name, result):
+    compactor = OutputCompactor()
+    output = compactor.compact(name, {"selector": "#x", "text": "NEEDLE"}, result)
+    budget = DEFAULT_OUTPUT_BUDGETS.get(name, DEFAULT_OUTPUT_BUDGETS["default"])
+    assert len(output.encode("utf8")) <= budget
+    assert json.loads(output)["success"] is True
+
+
+def test_compact_drops_echoed_args_and_marks_excerpts():
+    compactor = OutputCompactor()
+    args = {"selector": "#out", "text": "NEEDLE"}
+    result = {"success": True, "selector": "#out", "text": "NEEDLE", "contains_text": True, "actual_text": TEXT}
+    output = json.loads(compactor.compact("check_element_contains_text", args, result))
+
+    assert "selector" not in output and "text" not in output and "actual_text" not in output
+    assert len(output["excerpt"]) == MATCH_EXCERPT_CHARS
+    assert output["text_length"] == len(TEXT)
+    assert output["truncated"] is True
+
+
+def test_small_results_pass_through_and_stats_add_up():
+    compactor = OutputCompactor()
+    result = {"success": True, "visible": True}
+    assert json.loads(compactor.compact("check_element_visible", {"selector": "#a"}, result)) == result
+    compactor.compact("get_page_title", {}, {"success": True, "title": "x" * 5000})
+
+    report = compactor.report()
+    assert report["calls"] == 2
+    assert report["truncated_calls"] == 1
+    assert report["bytes_saved"] == report["raw_bytes"] - report["sent_bytes"] > 0
+
+
+@pytest.mark.parametrize("result, truncated", [
+    # Data that merely contains the marker is not a truncation
+    ({"success": True, "title": "Results", "meta": {"truncated": True}}, 0),
+    ({"success": True, "title": "x" * 5000}, 1),
+])
+def test_truncated_calls_counts_actual_truncation(result, truncated):
+    compactor = OutputCompactor()
+    compactor.compact("get_page_title", {}, result)
+    assert compactor.report()["truncated_calls"] == truncated
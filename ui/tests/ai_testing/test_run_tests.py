@@ -0,0 +1,38 @@
+"""
+Unit tests for expanding scenarios into runs.
+"""
+
+import pytest
+
+from .run_tests import _scenario_runs
+from .scenario_catalog import Scenario
+
+SCENARIOS = [
+    Scenario("counter", "Click the counter.", ["core"]),
+    Scenario("file-upload", "Upload a file.", ["core", "profile:mobile-3g", "profile:3g+slow-cpu-4x"]),
+]
+
+
+@pytest.mark.parametrize("profiles, tags, expected", [
+    # Profile tags alone do not add runs
+    (None, None, [("counter", None), ("file-upload", None)]),
+    (None, ["core"], [("counter", None), ("file-upload", None)]),
+    # A requested profile tag adds a profiled run next to the full-speed one
+    (None, ["profile:mobile-3g"],
+     [("counter", None), ("file-upload", None), ("file-upload@mobile-3g", "mobile-3g")]),
+    (None, ["core", "profile:mobile-3g", "profile:3g+slow-cpu-4x"],
+     [("counter", None), ("file-upload", None), ("file-upload@mobile-3g", "mobile-3g"),
+      ("file-upload@3g+slow-cpu-4x", "3g+slow-cpu-4x")]),
+    # Explicit profiles replace both for every scenario
+    (["3g", "4g"], ["profile:mobile-3g"],
+     [("counter@3g", "3g"), ("counter@4g", "4g"), ("file-upload@3g", "3g"), ("file-upload@4g", "4g")]),
+])
+def test_scenario_runs(profiles, tags, expected):
+    runs = _scenario_runs(SCENARIOS, profiles, tags)
+    assert [(name, profile) for name, _, profile in runs] == expected
+    assert all(scenario.name == name.partition("@")[0] for name, scenario, _ in runs)
+
+
+def test_scenario_runs_rejects_unknown_profile_tag():
+    with pytest.raises(ValueError, match="Unknown emulation profile 'bogus'"):
+        _scenario_runs(SCENARIOS, tags=["profile:bogus"])
@@ -0,0 +1,101 @@
+"""
+Unit tests for the scenario catalog and its on-disk index.
+"""
+
+import json
+import os
+
+import pytest
+
+from .scenario_catalog import DEFAULT_SCENARIO_DIR, INDEX_FILE, ScenarioCatalog, parse_scenario_file
+
+SCENARIOS = {
+    "counter.md": "---\ntags: core, smoke\ndescription: Counter increments\n---\nClick the counter.\n",
+    "login.md": "---\nTags: core\n---\n\nLog in.\n",
+    "upload.md": "---\ntags: profile:file-upload\n---\nUpload a file.\n",
+    "plain.md": "Just an instruction.\n",
+    "notes.txt": "Not a scenario.\n",
+}
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    for name, text in SCENARIOS.items():
+        (tmp_path / name).write_text(text, encoding="utf8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("text, tags, description, instruction", [
+    ("---\ntags: a, b ,, c\ndescription: Desc: with colon\n---\nDo it.\n", ["a", "b", "c"], "Desc: with colon", "Do it."),
+    ("---\n---\nDo it.", [], "", "Do it."),
+    ("Do it.\n\n", [], "", "Do it."),
+])
+def test_parse_scenario_file(tmp_path, text, tags, description, instruction):
+    path = tmp_path / "case.md"
+    path.write_text(text, encoding="utf8")
+    scenario = parse_scenario_file(str(path))
+    assert (scenario.name, scenario.tags, scenario.description, scenario.instruction) == \
+        ("case", tags, description, instruction)
+
+
+@pytest.mark.parametrize("text", ["---\ntags: a\nDo it.", "---\ntags: a\n---\n  \n", ""])
+def test_parse_scenario_file_rejects(tmp_path, text):
+    path = tmp_path / "case.md"
+    path.write_text(text, encoding="utf8")
+    with pytest.raises(ValueError):
+        parse_scenario_file(str(path))
+
+
+@pytest.mark.parametrize("tags, names, expected", [
+    (None, None, ["counter", "login", "plain", "upload"]),
+    (["smoke"], None, ["counter"]),
+    # Any matching tag or name selects a scenario
+    (["smoke", "core"], None, ["counter", "login"]),
+    (["core"], ["plain"], ["counter", "login", "plain"]),
+    (None, ["upload", "missing"], ["upload"]),
+    (["unknown"], None, []),
+])
+def test_select(catalog_dir, tags, names, expected):
+    catalog = ScenarioCatalog(str(catalog_dir))
+    assert sorted(s.name for s in catalog.select(tags, names)) == expected
+
+
+def test_catalog_lookups(catalog_dir):
+    catalog = ScenarioCatalog(str(catalog_dir))
+    assert len(catalog) == 4 and "counter" in catalog and "notes" not in catalog
+    assert catalog.get("counter").description == "Counter increments"
+    assert catalog.get("missing") is None
+    assert catalog.tags() == {"core": 2, "profile:file-upload": 1, "smoke": 1}
+    assert catalog.instructions(["smoke"]) == {"counter": "Click the counter."}
+
+
+def test_index_is_reused_and_refreshed(catalog_dir):
+    ScenarioCatalog(str(catalog_dir))
+    index_path = catalog_dir / INDEX_FILE
+    index = json.loads(index_path.read_text())
+    assert sorted(index["files"]) == ["counter.md", "login.md", "plain.md", "upload.md"]
+
+    # An unchanged file is served from the index rather than re-parsed
+    index["files"]["plain.md"]["scenario"]["instruction"] = "From the index."
+    index_path.write_text(json.dumps(index))
+    assert ScenarioCatalog(str(catalog_dir)).get("plain").instruction == "From the index."
+
+    # Changed, added and removed files are picked up
+    (catalog_dir / "plain.md").write_text("---\ntags: new\n---\nEdited instruction.\n", encoding="utf8")
+    (catalog_dir / "extra.md").write_text("Extra.", encoding="utf8")
+    os.remove(catalog_dir / "login.md")
+    catalog = ScenarioCatalog(str(catalog_dir))
+    assert catalog.get("plain").tags == ["new"]
+    assert sorted(catalog.names()) == ["counter", "extra", "plain", "upload"]
+    assert sorted(json.loads(index_path.read_text())["files"]) == ["counter.md", "extra.md", "plain.md", "upload.md"]
+
+
+def test_corrupt_index_is_ignored(catalog_dir):
+    (catalog_dir / INDEX_FILE).write_text("{not json")
+    assert len(ScenarioCatalog(str(catalog_dir))) == 4
+
+
+def test_bundled_scenarios_parse(tmp_path):
+    catalog = ScenarioCatalog(DEFAULT_SCENARIO_DIR, index_path=str(tmp_path / INDEX_FILE))
+    assert len(catalog) == len([n for n in os.listdir(DEFAULT_SCENARIO_DIR) if n.endswith(".md")])
+    assert all(s.instruction for s in catalog.select())
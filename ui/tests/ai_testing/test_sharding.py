@@ -0,0 +1,137 @@
+"""
+Unit tests for shard planning, duration history and shard merging.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from .sharding import (
+    merge_shard_files,
+    parse_shard,
+    plan_hash,
+    plan_shards,
+    shard_file_name,
+    update_durations,
+    write_junit_xml
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1/4", (1, 4)),
+    (" 3 / 3 ", (3, 3)),
+    ("1/1", (1, 1)),
+])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/4", "5/4", "1/0", "2", "a/b", "-1/2", "1/2/3"])
+def test_parse_shard_rejects(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+@pytest.mark.parametrize("names, total, durations, expected", [
+    # Longest first onto the lightest shard: a=9 | b=5, c=3, d=1
+    (["a", "b", "c", "d"], 2, {"a": 9, "b": 5, "c": 3, "d": 1}, [["a"], ["b", "c", "d"]]),
+    # LPT: 7 | 6 | 5 then 4 -> shard 3, 3 -> shard 2
+    (["t3", "t4", "t5", "t6", "t7"], 3, {"t3": 3, "t4": 4, "t5": 5, "t6": 6, "t7": 7},
+     [["t7"], ["t3", "t6"], ["t4", "t5"]]),
+    # Without history every scenario weighs the same; ties go by name
+    (["c", "a", "b", "d"], 2, None, [["c", "a"], ["b", "d"]]),
+    # Unknown scenarios take the median known duration: y=6 | new=4, x=2
+    (["new", "x", "y"], 2, {"x": 2, "y": 6}, [["y"], ["new", "x"]]),
+    # More shards than scenarios leaves some empty
+    (["a"], 3, None, [["a"], [], []]),
+])
+def test_plan_shards(names, total, durations, expected):
+    assert plan_shards(names, total, durations) == expected
+
+
+@pytest.mark.parametrize("total", [1, 2, 3, 5])
+def test_plan_shards_covers_every_scenario_once(total):
+    names = [f"s{i}" for i in range(17)]
+    durations = {name: (i * 7) % 11 + 1 for i, name in enumerate(names)}
+    shards = plan_shards(names, total, durations)
+    assert sorted(n for shard in shards for n in shard) == sorted(names)
+    loads = [sum(durations[n] for n in shard) for shard in shards]
+    # LPT keeps the spread within the longest single scenario
+    assert max(loads) - min(loads) <= max(durations.values())
+
+
+def test_update_durations_smooths(tmp_path):
+    path = str(tmp_path / "durations.json")
+    assert update_durations(path, {"a": {"duration_s": 10.0}, "b": {}}) == {"a": 10.0}
+    assert update_durations(path, {"a": {"duration_s": 20.0}}) == {"a": 15.0}
+    assert update_durations(path, {"a": {"duration_s": 5.0}}, smoothing=1.0) == {"a": 5.0}
+
+
+def _write_shard(directory, index, total, results, planned, durations=None, duration=0.0):
+    path = directory / shard_file_name(index, total)
+    path.write_text(json.dumps({
+        "shard": index, "total": total, "plan_hash": plan_hash(planned, durations), "planned": planned,
+        "duration_s": duration, "results": results,
+    }))
+    return str(path)
+
+
+@pytest.mark.parametrize("names, durations, other_names, other_durations, same", [
+    (["a", "b"], {"a": 1}, ["b", "a"], {"a": 1, "unrelated": 5}, True),
+    (["a", "b"], {"a": 1}, ["a", "b"], {"a": 2}, False),
+    (["a", "b"], None, ["a", "b", "c"], None, False),
+])
+def test_plan_hash(names, durations, other_names, other_durations, same):
+    assert (plan_hash(names, durations) == plan_hash(other_names, other_durations)) is same
+
+
+def test_merge_shard_files(tmp_path):
+    planned = ["a", "b", "c"]
+    paths = [
+        _write_shard(tmp_path, 1, 3, {"a": {"success": True}}, planned, duration=12.0),
+        _write_shard(tmp_path, 3, 3, {"b": {"success": False}}, planned, duration=30.0),
+    ]
+
+    merged = merge_shard_files(paths)
+    assert merged["missing_shards"] == [2]
+    assert merged["missing_scenarios"] == ["c"]
+    assert merged["duplicate_scenarios"] == []
+    assert (merged["passed"], merged["failed"], merged["duration_s"]) == (1, 1, 30.0)
+
+
+def test_merge_shard_files_reports_duplicates(tmp_path):
+    planned = ["a", "b"]
+    merged = merge_shard_files([
+        _write_shard(tmp_path, 1, 2, {"a": {"success": True}, "b": {"success": True}}, planned),
+        _write_shard(tmp_path, 2, 2, {"b": {"success": True}}, planned),
+    ])
+    assert (merged["missing_scenarios"], merged["duplicate_scenarios"]) == ([], ["b"])
+
+
+@pytest.mark.parametrize("other_total, other_durations", [
+    # Stale file from a run with a different shard count
+    (2, {"a": 1.0}),
+    # Planned from a different durations file
+    (3, {"a": 9.0}),
+])
+def test_merge_shard_files_rejects_mismatched_plans(tmp_path, other_total, other_durations):
+    planned = ["a", "b"]
+    first = _write_shard(tmp_path, 1, 3, {"a": {"success": True}}, planned, {"a": 1.0})
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    other = _write_shard(other_dir, 2, other_total, {"b": {"success": True}}, planned, other_durations)
+    with pytest.raises(ValueError):
+        merge_shard_files([first, other])
+
+
+def test_write_junit_xml(tmp_path):
+    path = tmp_path / "junit.xml"
+    write_junit_xml(str(path), {
+        "ok": {"success": True, "duration_s": 1.5, "model": "small"},
+        "bad": {"success": False, "message": "Timed out\ndetails"},
+    })
+    suite = ET.parse(path).getroot().find("testsuite")
+    assert (suite.get("tests"), suite.get("failures")) == ("2", "1")
+    failure = suite.find("testcase[@name='bad']/failure")
+    assert failure.get("message") == "Timed out"
@@ -0,0 +1,44 @@
+"""
+Unit tests for strategies benchmark regression checks.
+"""
+
+import pytest
+
+from .strategies_benchmark import REGRESSION_SLACK, compare_to_baseline
+
+BASELINE = [
+    {"strategies": 1000, "success": True, "time_to_all_cards_ms": 400, "dom_nodes": 8000, "janky_frames": 0},
+    {"strategies": 10000, "success": False, "time_to_all_cards_ms": 100},
+]
+
+
+def _result(strategies=1000, success=True, **metrics):
+    return [{"strategies": strategies, "success": success, **metrics}]
+
+
+@pytest.mark.parametrize("results, tolerance, expected", [
+    # 400 * 1.25 + 20 ms slack = 520 ms allowed
+    (_result(time_to_all_cards_ms=520), 0.25, []),
+    (_result(time_to_all_cards_ms=521), 0.25,
+     [{"strategies": 1000, "metric": "time_to_all_cards_ms", "baseline": 400, "current": 521}]),
+    (_result(time_to_all_cards_ms=521), 0.5, []),
+    # Improvements never flag
+    (_result(time_to_all_cards_ms=10, dom_nodes=100), 0.25, []),
+    # The absolute slack keeps near-zero baselines from flagging on noise
+    (_result(janky_frames=REGRESSION_SLACK["janky_frames"]), 0.25, []),
+    (_result(janky_frames=REGRESSION_SLACK["janky_frames"] + 1), 0.25,
+     [{"strategies": 1000, "metric": "janky_frames", "baseline": 0, "current": 3}]),
+    # Metrics missing on either side are skipped
+    (_result(p95_frame_ms=1000), 0.25, []),
+    # Failed runs and sizes without a successful baseline are not compared
+    (_result(success=False, time_to_all_cards_ms=5000), 0.25, []),
+    (_result(strategies=10000, time_to_all_cards_ms=5000), 0.25, []),
+    (_result(strategies=100, time_to_all_cards_ms=5000), 0.25, []),
+])
+def test_compare_to_baseline(results, tolerance, expected):
+    assert compare_to_baseline(results, BASELINE, tolerance) == expected
+
+
+def test_compare_to_baseline_reports_every_metric():
+    results = _result(time_to_all_cards_ms=1000, dom_nodes=20000)
+    assert [r["metric"] for r in compare_to_baseline(results, BASELINE)] == ["time_to_all_cards_ms", "dom_nodes"]
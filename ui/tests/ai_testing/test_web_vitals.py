@@ -0,0 +1,77 @@
+"""
+Unit tests for per-route performance budgets and trends.
+"""
+
+import json
+
+import pytest
+
+from .web_vitals import PerformanceBudgets, PerformanceHistory, route_of, summarize_navigations
+
+BUDGETS = {
+    "/analyze": {"lcp_ms": 1500, "ttfb_ms": 200},
+    "*": {"cls": 0.1, "lcp_ms": 3000},
+    "/analyze@mobile-3g": {"lcp_ms": 6000},
+    "*@mobile-3g": {"cls": 0.25},
+}
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://localhost:3000/analyze/", "/analyze"),
+    ("http://localhost:3000/analyze?tab=1#top", "/analyze"),
+    ("http://localhost:3000", "/"),
+    ("http://localhost:3000/", "/"),
+])
+def test_route_of(url, expected):
+    assert route_of(url) == expected
+
+
+@pytest.mark.parametrize("route, profile, expected", [
+    # The route's own entry overrides "*" metric by metric
+    ("/analyze", None, {"cls": 0.1, "lcp_ms": 1500, "ttfb_ms": 200}),
+    ("/strategies", None, {"cls": 0.1, "lcp_ms": 3000}),
+    # Profiled runs use only the "@profile" keys, never the full-speed budgets
+    ("/analyze", "mobile-3g", {"cls": 0.25, "lcp_ms": 6000}),
+    ("/strategies", "mobile-3g", {"cls": 0.25}),
+    ("/analyze", "3g", {}),
+])
+def test_for_route(route, profile, expected):
+    assert PerformanceBudgets(BUDGETS).for_route(route, profile) == expected
+
+
+def test_default_budgets():
+    budgets = PerformanceBudgets()
+    assert budgets.for_route("/analyze") == {"cls": 0.25, "lcp_ms": 1500}
+    assert budgets.for_route("/analyze", "3g") == {}
+
+
+def test_budgets_from_file(tmp_path):
+    path = tmp_path / "budgets.json"
+    path.write_text(json.dumps(BUDGETS))
+    assert PerformanceBudgets(str(path)).for_route("/analyze") == {"cls": 0.1, "lcp_ms": 1500, "ttfb_ms": 200}
+
+
+@pytest.mark.parametrize("route, metrics, profile, expected", [
+    ("/analyze", {"lcp_ms": 1500, "cls": 0.1, "ttfb_ms": 150}, None, []),
+    ("/analyze", {"lcp_ms": 1501, "cls": None}, None,
+     [{"route": "/analyze", "metric": "lcp_ms", "value": 1501, "budget": 1500}]),
+    ("/strategies", {"lcp_ms": 2000, "cls": 0.3}, None,
+     [{"route": "/strategies", "metric": "cls", "value": 0.3, "budget": 0.1}]),
+    ("/analyze", {"lcp_ms": 5000, "cls": 0.3}, "mobile-3g",
+     [{"route": "/analyze", "metric": "cls", "value": 0.3, "budget": 0.25, "profile": "mobile-3g"}]),
+])
+def test_check(route, metrics, profile, expected):
+    assert PerformanceBudgets(BUDGETS).check(route, metrics, profile) == expected
+
+
+def test_summarize_navigations_records_trends(tmp_path):
+    history = PerformanceHistory(str(tmp_path / "history.jsonl"))
+    budgets = PerformanceBudgets(BUDGETS)
+    for lcp in (1000, 1200):
+        summarize_navigations([{"route": "/analyze", "metrics": {"lcp_ms": lcp}}], budgets, history, "t")
+    # Profiled runs keep a separate baseline
+    summarize_navigations([{"route": "/analyze", "profile": "3g", "metrics": {"lcp_ms": 9000}}], budgets, history)
+
+    summary = summarize_navigations([{"route": "/analyze", "metrics": {"lcp_ms": 1650}}], budgets, history)
+    assert summary["navigations"][0]["trend"] == {"lcp_ms": {"baseline_median": 1100.0, "delta_pct": 50.0}}
+    assert summary["budget_violations"] == [{"route": "/analyze", "metric": "lcp_ms", "value": 1650, "budget": 1500}]
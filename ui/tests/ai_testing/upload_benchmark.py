@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Upload timing scenario for the Analyze page.
+
+Generates synthetic trades/history files of increasing size (10 MB, 100 MB
+and 1 GB by default) with data_generator, then drives the same Playwright
+call the agent's `upload_file` tool uses (`page.set_input_files`) against the
+/analyze upload areas. For each size it records how long the input takes to
+accept the file, how long until the page shows "Uploaded: <name>", and the
+page's JS heap afterwards. No OpenAI calls are made.
+
+Usage:
+    python -m ui.tests.ai_testing.upload_benchmark --url http://localhost:3001
+    python -m ui.tests.ai_testing.upload_benchmark --sizes 10MB,100MB --kind history
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from playwright.async_api import async_playwright
+
+from .data_generator import parse_size, write_history_csv, write_trades_csv
+
+DEFAULT_SIZES = "10MB,100MB,1GB"
+
+# The Analyze page renders the trade results input first and the historical
+# data input second, both as hidden <input type="file">
+UPLOAD_INPUTS = {
+    "trades": "input[type='file'] >> nth=0",
+    "history": "input[type='file'] >> nth=1",
+}
+
+
+def ensure_file(kind: str, size_bytes: int, directory: str, seed: int = 42) -> str:
+    """Generate the input file once and reuse it on later runs."""
+    path = os.path.join(directory, f"{kind}_{size_bytes}_{seed}.csv")
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        writer = write_trades_csv if kind == "trades" else write_history_csv
+        print(f"Generating {path}...")
+        writer(path, max_bytes=size_bytes, seed=seed)
+    return path
+
+
+async def time_upload(page, base_url: str, kind: str, file_path: str, timeout_ms: int) -> Dict[str, Any]:
+    """Upload one file on a fresh /analyze page and time each stage."""
+    await page.goto(f"{base_url}/analyze")
+    await page.wait_for_selector(UPLOAD_INPUTS[kind], state="attached")
+
+    started = time.perf_counter()
+    await page.set_input_files(UPLOAD_INPUTS[kind], file_path, timeout=timeout_ms)
+    accepted = time.perf_counter()
+
+    file_name = os.path.basename(file_path)
+    await page.wait_for_selector(f"text=Uploaded: {file_name}", timeout=timeout_ms)
+    confirmed = time.perf_counter()
+
+    heap = await page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : null")
+    return {
+        "set_input_files_s": accepted - started,
+        "ui_confirmed_s": confirmed - accepted,
+        "total_s": confirmed - started,
+        "js_heap_bytes": heap,
+    }
+
+
+async def run_benchmark(
+    base_url: str,
+    sizes: List[int],
+    kind: str,
+    data_dir: str,
+    headless: bool = True,
+    timeout_ms: int = 600000
+) -> List[Dict[str, Any]]:
+    """
+    Run the upload timing scenario for each size.
+
+    Args:
+        base_url: Base URL of the application
+        sizes: File sizes in bytes
+        kind: "trades" or "history"
+        data_dir: Where generated files are cached
+        headless: Run the browser headless
+        timeout_ms: Per-stage timeout in milliseconds
+
+    Returns:
+        One result dict per size
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            for size in sizes:
+                generate_started = time.perf_counter()
+                file_path = ensure_file(kind, size, data_dir)
+                generate_s = time.perf_counter() - generate_started
+
+                context = await browser.new_context()
+                page = await context.new_page()
+                result = {
+                    "kind": kind,
+                    "size_bytes": os.path.getsize(file_path),
+                    "file_path": file_path,
+                    "generate_s": generate_s,
+                }
+                try:
+                    result.update(await time_upload(page, base_url, kind, file_path, timeout_ms))
+                    result["success"] = True
+                except Exception as e:
+                    result["success"] = False
+                    result["error"] = str(e)
+                finally:
+                    await context.close()
+
+                status = f"{result['total_s']:.2f}s" if result["success"] else f"FAILED ({result['error']})"
+                print(f"{kind} {result['size_bytes'] / 1024 ** 2:,.0f} MB: {status}")
+                results.append(result)
+        finally:
+            await browser.close()
+
+    return results
+
+
+def main():
+    """Parse arguments and run the upload benchmark."""
+    parser = argparse.ArgumentParser(description="Time Analyze page uploads of large generated files")
+    parser.add_argument("--url", default="http://localhost:3001", help="Base URL (default: http://localhost:3001)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated file sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--kind", choices=list(UPLOAD_INPUTS), default="trades", help="File type to upload (default: trades)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "pinescript-upload-bench"),
+                        help="Cache directory for generated files")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--output-dir", default="test_results", help="Directory to save results (default: test_results)")
+
+    args = parser.parse_args()
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = asyncio.run(run_benchmark(
+        args.url.rstrip("/"), sizes, args.kind, args.data_dir, headless=not args.headed
+    ))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    result_file = os.path.join(args.output_dir, f"upload_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(result_file, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {result_file}")
+
+    sys.exit(0 if all(r["success"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
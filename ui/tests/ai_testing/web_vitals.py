@@ -0,0 +1,211 @@
+"""
+Web-vitals and navigation-timing capture with per-route performance budgets.
+
+An init script registers PerformanceObservers for LCP and layout shifts on
+every page, and COLLECT_JS reads them together with the Navigation Timing and
+Resource Timing entries after each navigation. Budgets are checked per route
+and every measurement is appended to a JSONL history so trends can be compared
+across runs.
+
+Collected metrics (milliseconds unless noted):
+    ttfb_ms, fcp_ms, lcp_ms, dom_content_loaded_ms, load_ms,
+    cls (unitless), transfer_bytes, resource_count
+"""
+
+import json
+import os
+import statistics
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+INIT_SCRIPT = """
+(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = { lcp: null, cls: 0 };
+    try {
+        new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            const last = entries[entries.length - 1];
+            if (last) vitals.lcp = last.renderTime || last.loadTime || last.startTime;
+        }).observe({ type: 'largest-contentful-paint', buffered: true });
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) {
+                if (!entry.hadRecentInput) vitals.cls += entry.value;
+            }
+        }).observe({ type: 'layout-shift', buffered: true });
+    } catch (e) {
+        // Engines without these entry types report null/0
+    }
+})();
+"""
+
+COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const resources = performance.getEntriesByType('resource');
+    const vitals = window.__webVitals || { lcp: null, cls: 0 };
+    let transfer = nav ? nav.transferSize : 0;
+    for (const r of resources) transfer += r.transferSize || 0;
+    return {
+        ttfb_ms: nav ? nav.responseStart - nav.startTime : null,
+        fcp_ms: fcp ? fcp.startTime : null,
+        lcp_ms: vitals.lcp,
+        cls: vitals.cls,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+        load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+        transfer_bytes: transfer,
+        resource_count: resources.length
+    };
+}
+"""
+
+# Budgets keyed by route path; "*" applies to every route without its own entry.
+# Values are upper bounds on the metric of the same name. Under an emulation
+# profile only "<route>@<profile>" and "*@<profile>" entries apply.
+DEFAULT_BUDGETS = {
+    "/analyze": {"lcp_ms": 1500},
+    "*": {"cls": 0.25},
+}
+
+
+async def collect_web_vitals(page) -> Dict[str, Any]:
+    """Read navigation timing and web vitals for the current document."""
+    metrics = await page.evaluate(COLLECT_JS)
+    return {key: (round(value, 4) if isinstance(value, float) else value) for key, value in metrics.items()}
+
+
+def route_of(url: str) -> str:
+    """Return the path part of a URL, normalised without a trailing slash."""
+    path = urlsplit(url).path or "/"
+    return path.rstrip("/") or "/"
+
+
+class PerformanceBudgets:
+    """
+    Per-route upper bounds on collected metrics.
+    """
+
+    def __init__(self, budgets: Optional[Union[Dict[str, Dict[str, float]], str]] = None):
+        """
+        Args:
+            budgets: Budget dict, or path to a JSON file with the same shape
+                (defaults to DEFAULT_BUDGETS)
+        """
+        if isinstance(budgets, str):
+            with open(budgets) as f:
+                budgets = json.load(f)
+        self.budgets = budgets if budgets is not None else DEFAULT_BUDGETS
+
+    def for_route(self, route: str, profile: Optional[str] = None) -> Dict[str, float]:
+        """Return the budget for a route, falling back to the "*" entry."""
+        suffix = f"@{profile}" if profile else ""
+        return {**self.budgets.get(f"*{suffix}", {}), **self.budgets.get(f"{route}{suffix}", {})}
+
+    def check(self, route: str, metrics: Dict[str, Any], profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Compare metrics with the route's budget.
+
+        Returns:
+            One dict per exceeded budget; empty when within budget
+        """
+        violations = []
+        for metric, limit in self.for_route(route, profile).items():
+            value = metrics.get(metric)
+            if value is not None and value > limit:
+                violation = {"route": route, "metric": metric, "value": value, "budget": limit}
+                if profile:
+                    violation["profile"] = profile
+                violations.append(violation)
+        return violations
+
+
+class PerformanceHistory:
+    """
+    Append-only JSONL store of navigation measurements, used for trends.
+    """
+
+    def __init__(self, path: str = "test_results/performance_history.jsonl", window: int = 20):
+        """
+        Args:
+            path: JSONL file that accumulates measurements across runs
+            window: Number of most recent measurements per route used as the baseline
+        """
+        self.path = path
+        self.window = window
+
+    def _load(self, route: str, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("route") == route and record.get("profile") == profile:
+                    records.append(record)
+        return records[-self.window:]
+
+    def trend(self, route: str, metrics: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Compare metrics with the median of the route's recent history under the same profile."""
+        history = self._load(route, profile)
+        trend = {}
+        for metric, value in metrics.items():
+            previous = [r["metrics"][metric] for r in history if r["metrics"].get(metric) is not None]
+            if value is None or not previous:
+                continue
+            baseline = statistics.median(previous)
+            trend[metric] = {
+                "baseline_median": baseline,
+                "delta_pct": round((value - baseline) / baseline * 100.0, 1) if baseline else None,
+            }
+        return trend
+
+    def append(self, records: List[Dict[str, Any]]):
+        """Persist measurements for later runs."""
+        if not records:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+
+def summarize_navigations(
+    navigations: List[Dict[str, Any]],
+    budgets: PerformanceBudgets,
+    history: Optional[PerformanceHistory] = None,
+    test_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Check a test's navigations against budgets, attach trends and record them.
+
+    Args:
+        navigations: Dicts with "url", "route", "metrics" and optional emulation
+            "profile" from navigate_to_url
+        budgets: Budgets to enforce
+        history: Optional history store for trends
+        test_name: Label stored with each history record
+
+    Returns:
+        Dict with the navigations (plus trends) and all budget violations
+    """
+    violations = []
+    timestamp = datetime.now().isoformat()
+    for navigation in navigations:
+        profile = navigation.get("profile")
+        violations.extend(budgets.check(navigation["route"], navigation["metrics"], profile))
+        if history:
+            navigation["trend"] = history.trend(navigation["route"], navigation["metrics"], profile)
+    if history:
+        history.append([
+            {
+                "timestamp": timestamp,
+                "test": test_name,
+                "route": n["route"],
+                "profile": n.get("profile"),
+                "metrics": n["metrics"],
+            }
+            for n in navigations
+        ])
+    return {"navigations": navigations, "budget_violations": violations}
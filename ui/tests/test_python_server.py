@@ -0,0 +1,118 @@
+"""
+Unit tests for the static-file helpers of test-python-server.py.
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "test-python-server.py")
+
+# The file name has a hyphen, so it is loaded by path
+_spec = importlib.util.spec_from_file_location("python_test_server", SERVER_PATH)
+server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server)
+
+
+@pytest.mark.parametrize("header, size, expected", [
+    ("bytes=0-99", 1000, (0, 99)),
+    ("bytes=500-", 1000, (500, 999)),
+    # The end is clamped to the file
+    ("bytes=900-5000", 1000, (900, 999)),
+    # Suffix ranges: the last N bytes, the whole file when N exceeds it
+    ("bytes=-100", 1000, (900, 999)),
+    ("bytes=-5000", 1000, (0, 999)),
+    # Unsatisfiable
+    ("bytes=1000-", 1000, False),
+    ("bytes=5-2", 1000, False),
+    ("bytes=-0", 1000, False),
+    ("bytes=-5", 0, False),
+    ("bytes=0-", 0, False),
+    # Ignored: the full file is sent
+    (None, 1000, None),
+    ("", 1000, None),
+    ("items=0-1", 1000, None),
+    ("bytes=0-1,5-6", 1000, None),
+    ("bytes=-", 1000, None),
+    ("bytes=--5", 1000, None),
+    ("bytes=a-b", 1000, None),
+    ("bytes=+5-10", 1000, None),
+])
+def test_parse_byte_range(header, size, expected):
+    assert server.parse_byte_range(header, size) == expected
+
+
+def _asset(*encodings):
+    asset = server.StaticAsset("/tmp/app.js", 10, 0, "application/javascript")
+    for encoding in encodings:
+        asset.encoded[encoding] = (f'"{encoding}"', b"")
+    return asset
+
+
+@pytest.mark.parametrize("accept_encoding, encodings, expected", [
+    ("gzip, deflate, br", ("gzip", "br"), "br"),
+    ("gzip, deflate", ("gzip", "br"), "gzip"),
+    ("GZIP", ("gzip",), "gzip"),
+    (None, ("gzip",), None),
+    ("br", (), None),
+    ("br", ("gzip",), None),
+    # q=0 refuses an encoding
+    ("gzip;q=0, br", ("gzip",), None),
+    ("br;q=0, gzip", ("gzip", "br"), "gzip"),
+    ("gzip; q=0.0", ("gzip",), None),
+    # Higher weight wins over the brotli preference
+    ("br;q=0.5, gzip;q=0.8", ("gzip", "br"), "gzip"),
+    # "*" covers encodings that are not listed
+    ("*", ("gzip", "br"), "br"),
+    ("*;q=0, gzip", ("gzip", "br"), "gzip"),
+    ("identity", ("gzip",), None),
+    ("gzip;q=bogus", ("gzip",), None),
+])
+def test_choose_encoding(accept_encoding, encodings, expected):
+    assert server.choose_encoding(accept_encoding, _asset(*encodings)) == expected
+
+
+@pytest.fixture
+def site(tmp_path):
+    root = tmp_path / "out"
+    (root / "about").mkdir(parents=True)
+    (root / "index.html").write_text("<html>home</html>")
+    (root / "about" / "index.html").write_text("<html>about</html>")
+    (root / "strategies.html").write_text("<html>strategies</html>")
+    (root / "a b.txt").write_text("spaces")
+    (tmp_path / "secret.txt").write_text("outside the root")
+    return server.StaticSite(str(root))
+
+
+@pytest.mark.parametrize("url_path, expected", [
+    ("/", "index.html"),
+    ("/index.html", "index.html"),
+    ("/about", os.path.join("about", "index.html")),
+    ("/about/", os.path.join("about", "index.html")),
+    ("/strategies", "strategies.html"),
+    ("/strategies?sort=name#top", "strategies.html"),
+    ("/a%20b.txt", "a b.txt"),
+    ("/missing", None),
+    # Nothing outside the static root is reachable
+    ("/../secret.txt", None),
+    ("/%2e%2e/secret.txt", None),
+    ("/about/../../secret.txt", None),
+    ("/about/../index.html", None),
+    ("/..%2fsecret.txt", None),
+    ("/..%5csecret.txt", None),
+])
+def test_lookup(site, url_path, expected):
+    asset = site.lookup(url_path)
+    if expected is None:
+        assert asset is None
+    else:
+        assert os.path.relpath(asset.path, site.root) == expected
+
+
+def test_precompression_keeps_only_smaller_representations(tmp_path):
+    (tmp_path / "big.js").write_text("console.log('x');\n" * 200)
+    (tmp_path / "tiny.js").write_text("x")
+    site = server.StaticSite(str(tmp_path))
+    assert "gzip" in site.lookup("/big.js").encoded
+    assert site.lookup("/tiny.js").encoded == {}